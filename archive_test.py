@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from local_translator.src.utils import archive
+from local_translator.src.utils.archive import DB_NAME, ArchiveReader, ArchiveWriter
+
+SAMPLE_RATE = 16_000
+
+# segments table as written before segment statuses existed
+OLD_SCHEMA = """
+CREATE TABLE sessions (id TEXT PRIMARY KEY, started REAL NOT NULL, info TEXT NOT NULL DEFAULT '{}');
+CREATE TABLE segments (
+    session TEXT NOT NULL, segment INTEGER NOT NULL, started REAL NOT NULL, duration REAL NOT NULL,
+    source TEXT NOT NULL, target TEXT NOT NULL, transcript TEXT NOT NULL, translation TEXT NOT NULL,
+    audio TEXT, PRIMARY KEY (session, segment)
+);
+INSERT INTO sessions VALUES ('old', 0, '{}');
+INSERT INTO segments VALUES ('old', 0, 0, 1.0, 'es', 'en', 'hola', 'hello', NULL);
+"""
+
+
+def writer(root: Path, session: str, **kwargs) -> ArchiveWriter:
+    options = dict(audio_format="wav", fsync="batch", batch_size=1, flush_interval=0.01, sample_rate=SAMPLE_RATE)
+    options.update(kwargs)
+    return ArchiveWriter(root, session=session, **options)
+
+
+def record_phrases(archive_writer: ArchiveWriter) -> None:
+    now = time.time()
+    phrases = (("el tren sale a las ocho", "the train leaves at eight"), ("llueve en Madrid", "it rains in Madrid"))
+    for i, (transcript, translation) in enumerate(phrases):
+        archive_writer.record(i, None, transcript, translation, started=now + i, duration=1.0)
+
+
+def main() -> None:
+    checks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        # An archive from before the status column is migrated in place.
+        old = root / "old"
+        old.mkdir()
+        with sqlite3.connect(str(old / DB_NAME)) as conn:
+            conn.executescript(OLD_SCHEMA)
+        archive_writer = writer(old, "new")
+        archive_writer.record(0, None, "", "", started=time.time(), duration=2.0, status="dropped")
+        archive_writer.close()
+        reader = ArchiveReader(old)
+        statuses = [s.status for s in reader.segments("old")] + [s.status for s in reader.segments("new")]
+        checks.append(("status migration", statuses == ["ok", "dropped"], f"statuses {statuses}"))
+
+        # Search: FTS5 when SQLite has it, LIKE when it does not; same results either way.
+        results = {}
+        for name, schema in (("fts5", archive._FTS_SCHEMA), ("like", "CREATE VIRTUAL TABLE x USING no_such_module;")):
+            archive._FTS_SCHEMA, saved = schema, archive._FTS_SCHEMA
+            try:
+                archive_writer = writer(root / name, name)
+                record_phrases(archive_writer)
+                archive_writer.close()
+            finally:
+                archive._FTS_SCHEMA = saved
+            reader = ArchiveReader(root / name)
+            with sqlite3.connect(str(root / name / DB_NAME)) as conn:
+                fts = archive._has_fts(conn)
+            found = [s.segment for s in reader.search("Madrid llueve")] + [s.segment for s in reader.search("train")]
+            results[name] = found
+            checks.append((f"search ({name})", fts == (name == "fts5") and found == [1, 0], f"fts={fts}, found {found}"))
+        checks.append(("same results", results["fts5"] == results["like"], f"{results}"))
+
+        # Audio that would take the queue past max_pending_bytes is dropped; the text is kept.
+        archive_writer = writer(root / "bounded", "bounded", max_pending_bytes=4_096)
+        short = np.zeros(SAMPLE_RATE // 100, dtype=np.float32)  # 640 bytes
+        long = np.zeros(SAMPLE_RATE, dtype=np.float32)  # 64 kB
+        archive_writer.record(0, short, "hola", "hello", started=time.time(), duration=0.01)
+        archive_writer.record(1, long, "adiós", "goodbye", started=time.time(), duration=1.0)
+        archive_writer.close()
+        segments = list(ArchiveReader(root / "bounded").segments("bounded"))
+        audio = [s.audio for s in segments]
+        ok = archive_writer.audio_dropped == 1 and audio[0] is not None and audio[1] is None
+        checks.append(("audio bounded", ok, f"audio {audio}, {archive_writer.audio_dropped} dropped"))
+        checks.append(("text kept", [s.transcript for s in segments] == ["hola", "adiós"], f"{len(segments)} segments"))
+        checks.append(("pending drained", archive_writer.pending_bytes == 0, f"{archive_writer.pending_bytes} bytes"))
+
+        # A failing fsync fails that batch only: it is counted and the writer keeps going.
+        fsync_path, calls = archive._fsync_path, []
+
+        def flaky_fsync(path: Path) -> None:
+            calls.append(path)
+            if len(calls) == 1:
+                raise OSError(5, "Input/output error")
+            fsync_path(path)
+
+        archive._fsync_path = flaky_fsync
+        try:
+            archive_writer = writer(root / "fsync", "fsync")
+            archive_writer.record(0, short, "uno", "one", started=time.time(), duration=0.01)
+            archive_writer.record(1, short, "dos", "two", started=time.time(), duration=0.01)
+            archive_writer.close()
+        finally:
+            archive._fsync_path = fsync_path
+        kept = [s.segment for s in ArchiveReader(root / "fsync").segments("fsync")]
+        counts = (archive_writer.failed, archive_writer.records)
+        checks.append(("fsync error counted", counts == (1, 1), f"failed/records {counts}"))
+        ok = kept == [1] and not archive_writer._thread.is_alive()
+        checks.append(("writer survives", ok, f"archived {kept} after the error, writer stopped by close()"))
+
+    failures = 0
+    for name, ok, detail in checks:
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    if failures:
+        print(f"❌ {failures} archive check(s) failed")
+        sys.exit(1)
+    print("✅ Archive test passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from typing import AsyncIterator, Iterator
+
+import numpy as np
+
+from local_translator.src.pipeline.async_translator import (
+    AsyncTranslator,
+    AudioChunk,
+    FinalTranscript,
+    FinalTranslation,
+    PartialTranscript,
+    PartialTranslation,
+    SpeechEnded,
+    SpeechStarted,
+)
+from local_translator.src.utils.types import TranscriptionResult
+
+SAMPLE_RATE = 16_000
+BLOCK = 512
+
+
+class FakeVAD:
+    """
+    Speech when the frame's RMS is above threshold; no model needed.
+    """
+
+    threshold = 0.5
+
+    def speech_probability(self, frame: np.ndarray) -> float:
+        return float(np.sqrt(np.mean(frame**2)) > 0.05)
+
+
+class FakeSTT:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.threads: set[str] = set()
+
+    def transcribe(self, audio: np.ndarray) -> TranscriptionResult:
+        self.calls += 1
+        self.threads.add(threading.current_thread().name)
+        duration = len(audio) / SAMPLE_RATE
+        time.sleep(0.05)
+        return TranscriptionResult(text=f"hola mundo, {duration:.1f} segundos.", language="es", duration=duration)
+
+
+class FakeTranslator:
+    repetition_aborts = 0
+
+    def translate_stream(self, text: str) -> Iterator[str]:
+        for word in "hello world, this is a streamed translation.".split(" "):
+            time.sleep(0.01)
+            yield word + " "
+
+    def translate(self, text: str) -> str:
+        return "".join(self.translate_stream(text)).strip()
+
+
+class FakeTTS:
+    sample_rate = 22_050
+
+    def synthesize_stream(self, text: str) -> Iterator[np.ndarray]:
+        for _ in range(2):
+            yield np.zeros(1024, dtype=np.int16)
+
+
+def utterances(pattern: list[tuple[float, bool]]) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    parts = []
+    for seconds, speech in pattern:
+        n = int(seconds * SAMPLE_RATE)
+        parts.append((rng.standard_normal(n) * (0.3 if speech else 0.001)).astype(np.float32))
+    return np.concatenate(parts)
+
+
+async def chunks(audio: np.ndarray, size: int = 1600, realtime: float = 0.0) -> AsyncIterator[np.ndarray]:
+    for start in range(0, len(audio), size):
+        if realtime:
+            await asyncio.sleep(size / SAMPLE_RATE / realtime)
+        yield audio[start : start + size]
+
+
+def make_translator(**kwargs) -> AsyncTranslator:
+    return AsyncTranslator(
+        FakeSTT(),
+        FakeTranslator(),
+        FakeTTS(),
+        sample_rate=SAMPLE_RATE,
+        block_size=BLOCK,
+        max_silence=0.4,
+        vad_factory=FakeVAD,
+        energy_gate=False,
+        **kwargs,
+    )
+
+
+async def check_events() -> None:
+    translator = make_translator(partial_interval=0.5)
+    audio = utterances([(0.5, False), (2.0, True), (1.0, False), (1.5, True), (1.0, False)])
+    events = [event async for event in translator.stream(chunks(audio, realtime=8.0))]
+    kinds = [type(event).__name__ for event in events]
+    print("Events:", kinds)
+
+    for segment_id in (0, 1):
+        own = [type(e) for e in events if e.segment_id == segment_id and not isinstance(e, PartialTranscript)]
+        assert own[0] is SpeechStarted and own[1] is SpeechEnded, own
+        assert own[2] is FinalTranscript, own
+        assert PartialTranslation in own and AudioChunk in own, own
+        assert own[-1] in (FinalTranslation, AudioChunk), own
+        assert own.index(FinalTranslation) > own.index(PartialTranslation), own
+    assert any(isinstance(e, PartialTranscript) for e in events), "no partial transcript"
+    ended = [e for e in events if isinstance(e, SpeechEnded)]
+    assert [round(e.duration) for e in ended] == [2, 2], ended
+    finals = [e.text for e in events if isinstance(e, FinalTranslation)]
+    assert finals[0] == "hello world, this is a streamed translation.", finals
+    assert translator.stt.threads == {"async-stt_0"}, translator.stt.threads
+    translator.close()
+
+
+async def check_sessions_and_cancel() -> None:
+    translator = make_translator()
+    audio = utterances([(1.0, True), (1.0, False)] * 3)
+
+    async def collect() -> int:
+        return sum([isinstance(e, FinalTranslation) async for e in translator.stream(chunks(audio))])
+
+    counts = await asyncio.gather(collect(), collect(), collect())
+    print("Concurrent sessions, finals per session:", counts)
+    assert counts == [3, 3, 3], counts
+
+    # Leaving the loop early closes the generator and cancels its tasks.
+    before = len(asyncio.all_tasks())
+    async for event in translator.stream(chunks(audio)):
+        if isinstance(event, FinalTranscript):
+            break
+    await asyncio.sleep(0.1)
+    assert len(asyncio.all_tasks()) == before, asyncio.all_tasks()
+
+    # Cancelling the consuming task propagates into the session.
+    async def consume() -> None:
+        async for _ in translator.stream(chunks(audio, realtime=1.0)):
+            pass
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.5)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    await asyncio.sleep(0.1)
+    assert len(asyncio.all_tasks()) == before, asyncio.all_tasks()
+    print("Early exit and cancellation left no tasks behind")
+    translator.close()
+
+
+def main() -> None:
+    try:
+        asyncio.run(check_events())
+        asyncio.run(check_sessions_and_cancel())
+    except AssertionError as exc:
+        print(f"❌ Async API test failed: {exc}")
+        sys.exit(1)
+    print("✅ Async API test passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+from local_translator.src.audio.denoise import SpectralGate, noise_clip
+from local_translator.src.vad.segmenter import SpeechSegmenter
+
+SAMPLE_RATE = 16_000
+BLOCK = 480
+SPEECH_START = 2 * SAMPLE_RATE
+MAX_LOSS_DB = 1.5
+
+
+def voiced(seconds: float) -> np.ndarray:
+    """
+    Sustained vowel-like speech: gliding f0 harmonics under three formants,
+    syllable-rate envelope, -20 dBFS RMS.
+    """
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    f0 = 140.0 + 20.0 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    audio = np.zeros_like(t)
+    for k in range(1, 30):
+        amplitude = sum(a * np.exp(-(((k * 140.0 - f) / 250.0) ** 2)) for f, a in ((700, 1.0), (1200, 0.6), (2600, 0.3)))
+        audio += (amplitude + 0.02) * np.sin(k * phase)
+    audio *= 0.55 + 0.45 * np.sin(2 * np.pi * 4.0 * t)
+    return (audio * 10 ** (-20 / 20) / np.sqrt(np.mean(audio**2))).astype(np.float32)
+
+
+class EnergyVAD:
+    """
+    Stand-in for SileroVAD: speech when the frame is 10 dB above the noise floor.
+    """
+
+    threshold = 0.5
+
+    def __init__(self, floor: float) -> None:
+        self.floor = floor
+
+    def speech_probability(self, frame: np.ndarray) -> float:
+        return float(np.mean(frame**2) > 10.0 * self.floor)
+
+
+def denoise(mix: np.ndarray, speech: slice, hold: bool) -> np.ndarray:
+    gate = SpectralGate(sample_rate=SAMPLE_RATE)
+    out = np.empty_like(mix)
+    for i in range(0, len(mix) - BLOCK + 1, BLOCK):
+        if hold:
+            gate.adapt = not speech.start <= i < speech.stop
+        gate.process(mix[i : i + BLOCK], out=out[i : i + BLOCK])
+    return out[gate.latency :]
+
+
+def main() -> None:
+    checks = []
+    noise = noise_clip("fan", 6.0, seed=3) * np.float32(10 ** (-5 / 20))  # -35 dBFS under -20 dBFS speech
+    speech = voiced(3.0)
+    mix = noise.copy()
+    span = slice(SPEECH_START, SPEECH_START + len(speech))
+    mix[span] += speech
+
+    # Level of the output against the input over each second of speech.
+    losses = {}
+    for hold in (False, True):
+        out = denoise(mix, span, hold)
+        losses[hold] = []
+        for second in range(3):
+            s = slice(SPEECH_START + second * SAMPLE_RATE, SPEECH_START + (second + 1) * SAMPLE_RATE)
+            losses[hold].append(10 * np.log10(np.mean(mix[s] ** 2) / np.mean(out[s] ** 2)))
+    held, adapting = max(losses[True]), max(losses[False])
+    checks.append(("speech kept", held <= MAX_LOSS_DB, f"worst loss {held:.2f} dB (limit {MAX_LOSS_DB} dB)"))
+    checks.append(
+        ("profile held", adapting - held >= 1.0, f"{adapting:.2f} dB lost when the profile keeps adapting")
+    )
+
+    # Through the segmenter: the profile is held inside the segment and STT gets the raw audio.
+    floor = float(np.mean(noise**2))
+    denoiser = SpectralGate(sample_rate=SAMPLE_RATE)
+    segmenter = SpeechSegmenter(
+        EnergyVAD(floor), BLOCK / SAMPLE_RATE, max_silence=0.5, denoiser=denoiser, lookback_frames=0
+    )
+    frames = [frame.copy() for frame in mix[: len(mix) - len(mix) % BLOCK].reshape(-1, BLOCK)]
+    segments = []
+    held_inside = []
+    for frame in frames:
+        segments += segmenter.push([frame])
+        held_inside.append(segmenter.active and not denoiser.adapt)
+    checks.append(("one segment", len(segments) == 1, f"{len(segments)} segments"))
+    if segments:
+        segment = segments[0]
+        # Segments are the speech frames of the input itself, delayed by the denoiser's latency.
+        delayed = np.concatenate([np.zeros(denoiser.latency, dtype=np.float32), mix])
+        raw_frames = {delayed[i : i + BLOCK].tobytes(): i for i in range(0, len(mix) - BLOCK + 1, BLOCK)}
+        found = [raw_frames.get(frame.tobytes(), -1) for frame in segment.reshape(-1, BLOCK)]
+        raw = min(found) >= 0 and found == sorted(found)
+        checks.append(("raw audio to STT", raw, f"{len(found)} segment frames taken from the input"))
+        onset = (found[0] - denoiser.latency) / SAMPLE_RATE
+        checks.append(("aligned", abs(onset - SPEECH_START / SAMPLE_RATE) <= 0.1, f"starts at {onset:.2f}s"))
+    checks.append(("held in segment", sum(held_inside) > 2.5 * SAMPLE_RATE / BLOCK, f"{sum(held_inside)} frames held"))
+    checks.append(("adapting outside", denoiser.adapt, "profile tracks again after the segment"))
+
+    failures = 0
+    for name, ok, detail in checks:
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    if failures:
+        print(f"❌ {failures} denoiser speech check(s) failed")
+        sys.exit(1)
+    print("✅ Denoiser speech preservation test passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import sys
+
+from local_translator.src.utils.disfluency import DisfluencyFilter
+
+# (language, transcript, expected clean text)
+CASES = (
+    # Disfluencies that are removed.
+    ("es", "Yo yo quiero, eh, ir a la casa, la casa de mi madre.", "Yo quiero ir a la casa de mi madre."),
+    ("es", "Pues, no sé... no sé si venir.", "No sé si venir."),
+    ("en", "I I want to to go, um, home.", "I want to go home."),
+    ("en", "So, the the problem is here.", "The problem is here."),
+    # Capitals survive a removed opening filler, after opening marks too.
+    ("es", "Em... ¿qué dices?", "¿Qué dices?"),
+    ("es", "¡Eh, vamos ya!", "¡Vamos ya!"),
+    ("en", "Um, \"fine\", she said.", "\"Fine\", she said."),
+    # Repetitions that are meant and kept.
+    ("en", "She had had enough.", "She had had enough."),
+    ("en", "I think that that is right.", "I think that that is right."),
+    ("en", "It was twenty twenty-one.", "It was twenty twenty-one."),
+    ("en", "Call five five five, one two.", "Call five five five, one two."),
+    ("es", "Nací en el veinte veinte.", "Nací en el veinte veinte."),
+    ("es", "Mi número es dos dos tres, cuarenta cuarenta.", "Mi número es dos dos tres, cuarenta cuarenta."),
+    ("es", "El código es 44 44.", "El código es 44 44."),
+)
+
+
+def main() -> None:
+    cleaner = DisfluencyFilter()
+    failures = 0
+    for language, text, expected in CASES:
+        cleaned = cleaner.clean(text, language)
+        ok = cleaned == expected
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} [{language}] {text!r} -> {cleaned!r}" + ("" if ok else f" (expected {expected!r})"))
+
+    # Keep lists are per language: "had had" is only protected in English.
+    cleaned = cleaner.clean("had had", "es")
+    ok = cleaned == "had"
+    failures += not ok
+    print(f"{'✅' if ok else '❌'} keep list per language: 'had had' in es -> {cleaned!r}")
+
+    if failures:
+        print(f"❌ {failures} disfluency check(s) failed")
+        sys.exit(1)
+    print("✅ Disfluency test passed")
+
+
+if __name__ == "__main__":
+    main()
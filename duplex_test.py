@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import sys
+from typing import Optional
+
+import numpy as np
+
+from local_translator.src.audio import duplex as duplex_module
+from local_translator.src.audio import output_stream as output_module
+from local_translator.src.audio.duplex import DuplexCoordinator, NLMSEchoCanceller
+from local_translator.src.audio.output_stream import AudioOutputStream, NullSink, RenderCallback
+from local_translator.src.audio.resampler import PolyphaseResampler
+
+MIC_RATE = 16_000
+TTS_RATE = 22_050
+STEP = 0.02  # one mic frame and one output block per step
+FRAME = int(STEP * MIC_RATE)
+BLOCK = int(STEP * TTS_RATE)
+ECHO_DELAY = 0.04  # acoustic path, longer than the NLMS filter
+ECHO_GAIN = 0.5
+MIN_ERLE_DB = 20.0
+
+
+class FakeClock:
+    """
+    Stands in for the time module of the output and duplex modules.
+    """
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+class StepSink(NullSink):
+    """
+    Sink that renders one block whenever the test asks for it.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(realtime=False)
+
+    def start(self, render: RenderCallback, sample_rate: int, block_size: int, channels: int) -> None:
+        self._render = render
+        self._block = np.zeros((block_size, channels), dtype=np.float32)
+
+    def stop(self) -> None:
+        pass
+
+    def pull(self) -> None:
+        self._render(self._block)
+
+
+class SteppedSource:
+    """
+    Capture clock of a mic whose index-th frame starts at start + index * STEP.
+    """
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+
+    def frame_time(self, index: int) -> Optional[float]:
+        return self.start + index * STEP
+
+
+def erle_db(mic: np.ndarray, cleaned: np.ndarray) -> float:
+    return float(10 * np.log10(np.mean(mic**2) / np.mean(cleaned**2)))
+
+
+def nlms_checks() -> list[tuple[str, bool, str]]:
+    # The canceller alone: a delayed, attenuated copy of the reference is removed.
+    rng = np.random.default_rng(0)
+    canceller = NLMSEchoCanceller(filter_len=256)
+    reference = (0.1 * rng.standard_normal(3 * MIC_RATE)).astype(np.float32)
+    delay = 37
+    echo = np.zeros_like(reference)
+    echo[delay:] = ECHO_GAIN * reference[:-delay]
+    mic = echo + (1e-4 * rng.standard_normal(len(echo))).astype(np.float32)
+    history = np.concatenate([np.zeros(canceller.filter_len - 1, dtype=np.float32), reference])
+    cleaned = np.concatenate(
+        [
+            canceller.process(mic[i : i + FRAME], history[i : i + FRAME + canceller.filter_len - 1])
+            for i in range(0, len(mic), FRAME)
+        ]
+    )
+    last = slice(-MIC_RATE, None)
+    erle = erle_db(mic[last], cleaned[last])
+    return [("nlms", erle >= MIN_ERLE_DB, f"{erle:.1f} dB echo reduction ({delay}-sample delay, gain {ECHO_GAIN})")]
+
+
+def run_duplex(echo_delay: float) -> tuple[float, list[float], list[bool], DuplexCoordinator]:
+    """
+    Play 3 s of TTS through an output stream, capture a mic that hears it
+    ECHO_DELAY later, and pass the mic frames through the coordinator the way
+    the segmenter does. Returns the echo reduction over the last second of
+    playback, the weighed VAD probabilities and whether playback was active.
+    """
+    rng = np.random.default_rng(1)
+    clock = FakeClock(100.0)
+    duplex_module.time = clock
+    output_module.time = clock
+    sink = StepSink()
+    output = AudioOutputStream(sample_rate=TTS_RATE, block_size=BLOCK, sink=sink)
+    coordinator = DuplexCoordinator(
+        output,
+        MIC_RATE,
+        echo_canceller=NLMSEchoCanceller(filter_len=256),
+        echo_delay=echo_delay,
+        source=SteppedSource(clock.now),
+    )
+    output.start()
+    tts = (0.1 * rng.standard_normal(3 * TTS_RATE)).astype(np.float32)
+    output.enqueue(tts)
+
+    # What the mic hears: the played signal at the mic rate, ECHO_DELAY late and attenuated.
+    played = PolyphaseResampler(TTS_RATE, MIC_RATE).process(tts)
+    steps = int(4.0 / STEP)
+    mic = (1e-4 * rng.standard_normal(steps * FRAME)).astype(np.float32)
+    start = int(ECHO_DELAY * MIC_RATE)
+    mic[start : start + len(played)] += ECHO_GAIN * played
+
+    cleaned, weighed, active = [], [], []
+    for step in range(steps):
+        sink.pull()
+        frame = mic[step * FRAME : (step + 1) * FRAME]
+        cleaned.append(coordinator.process(frame))
+        speech = 0.7 if np.mean(frame**2) > 1e-4 else 0.0  # energy VAD on the raw mic
+        active.append(coordinator.playback_active)
+        weighed.append(coordinator.weigh(speech))
+        clock.now += STEP
+    output.stop()
+
+    end = start + len(played)
+    last = slice(end - MIC_RATE, end)
+    return erle_db(mic[last], np.concatenate(cleaned)[last]), weighed, active, coordinator
+
+
+def duplex_checks() -> list[tuple[str, bool, str]]:
+    checks = []
+    erle, weighed, active, coordinator = run_duplex(ECHO_DELAY)
+    checks.append(("aligned echo reduction", erle >= MIN_ERLE_DB, f"{erle:.1f} dB with echo_delay={ECHO_DELAY}s"))
+    misaligned, _, _, _ = run_duplex(0.0)
+    checks.append(
+        ("alignment matters", erle - misaligned >= 10.0, f"{misaligned:.1f} dB when the 40 ms path is not compensated")
+    )
+
+    playing = [w for w, a in zip(weighed, active) if a]
+    checks.append(("vad gated", len(playing) > 0 and not any(playing), f"{len(playing)} frames gated while playing"))
+    checks.append(("gated frames", coordinator.gated_frames == len(playing), f"{coordinator.gated_frames} counted"))
+    # Playback ends at 3 s; the hangover keeps the gate for 0.3 s more, then frames pass.
+    released = active.index(False, int(3.0 / STEP)) if False in active else -1
+    checks.append(("hangover", abs(released * STEP - 3.3) <= 2 * STEP, f"gate released at {released * STEP:.2f}s"))
+    checks.append(("no barge-in", coordinator.barge_ins == 0, f"{coordinator.barge_ins} barge-ins"))
+    return checks
+
+
+def main() -> None:
+    checks = nlms_checks() + duplex_checks()
+    failures = 0
+    for name, ok, detail in checks:
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    if failures:
+        print(f"❌ {failures} duplex check(s) failed")
+        sys.exit(1)
+    print("✅ Duplex test passed")
+
+
+if __name__ == "__main__":
+    main()
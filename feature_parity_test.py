@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor
+
+from local_translator.src.stt.features import StreamingLogMel, log_mel_spectrogram
+
+# Block sizes a capture loop might hand over, including sizes that are not multiples of the hop.
+BLOCKS = (512, 160, 1000, 37)
+
+
+def synthetic_speech(seconds: float, rng: np.random.Generator, sample_rate: int = 16_000) -> np.ndarray:
+    """
+    Harmonic tone with a wandering pitch, amplitude envelope and a little noise.
+    """
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 2.5 * t) ** 2
+    audio = 0.1 * voice * envelope + 0.003 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+
+def stream(audio: np.ndarray, extractor: StreamingLogMel, block: int) -> tuple[np.ndarray, float]:
+    for start in range(0, len(audio), block):
+        extractor.push(audio[start : start + block])
+    started = time.perf_counter()
+    features = extractor.finish()
+    return features, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare streaming log-mel features with faster-whisper's extractor.")
+    parser.add_argument("--tolerance", type=float, default=2e-3, help="Max abs difference on normalised log-mel")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    failures = 0
+    for n_mels in (80, 128):
+        reference_extractor = FeatureExtractor(feature_size=n_mels)
+        for seconds in (0.3, 1.0, 4.37, 12.0, 29.5):
+            audio = synthetic_speech(seconds, rng)
+            started = time.perf_counter()
+            reference = np.asarray(reference_extractor(audio))
+            batch_seconds = time.perf_counter() - started
+            ours = log_mel_spectrogram(audio, n_mels)
+            worst = 0.0
+            finish_seconds = 0.0
+            for block in BLOCKS:
+                streamed, finish_seconds = stream(audio, StreamingLogMel(n_mels), block)
+                if streamed.shape != reference.shape:
+                    print(f"❌ n_mels={n_mels} {seconds}s block={block}: shape {streamed.shape} != {reference.shape}")
+                    failures += 1
+                    continue
+                worst = max(worst, float(np.abs(streamed - reference).max()))
+            worst = max(worst, float(np.abs(ours - reference).max()))
+            ok = worst <= args.tolerance
+            failures += not ok
+            print(
+                f"{'✅' if ok else '❌'} n_mels={n_mels} {seconds:5.2f}s frames={reference.shape[1]:4d} "
+                f"max|diff|={worst:.2e}  at segment end: {finish_seconds * 1e3:.2f} ms streamed "
+                f"vs {batch_seconds * 1e3:.2f} ms faster-whisper"
+            )
+
+    if failures:
+        print(f"❌ {failures} feature parity check(s) failed")
+        sys.exit(1)
+    print("✅ Feature parity test passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import sys
+
+from local_translator.src.pipeline.language import LanguageTracker
+from local_translator.src.utils.types import TranscriptionResult
+
+
+def decoded(text: str, language: str, avg_logprob: float = -0.3, no_speech_prob: float = 0.05) -> TranscriptionResult:
+    return TranscriptionResult(
+        text=text, language=language, duration=1.0, avg_logprob=avg_logprob, no_speech_prob=no_speech_prob
+    )
+
+
+def main() -> None:
+    tracker = LanguageTracker(("es", "en"), threshold=0.7, turn_gap=1.0, recheck_logprob=-1.0, recheck_no_speech=0.6)
+    checks = []
+
+    checks.append(("first segment detects", tracker.language_for(0.0) is None, f"{tracker.detections} detections"))
+    tracker.observe("es", 0.5, end=2.0)
+    checks.append(("unsure not cached", tracker.language_for(2.5) is None, "p=0.50 below 0.70"))
+    tracker.observe("es", 0.95, end=4.0)
+    checks.append(("confident cached", tracker.language_for(4.5) == "es", f"language {tracker.language}"))
+    tracker.observe("es", 1.0, end=6.0)
+    checks.append(("turn extends", tracker.language_for(6.8) == "es", f"{tracker.cache_hits} cache hits"))
+    tracker.observe("es", 1.0, end=8.0)
+    checks.append(("new turn detects", tracker.language_for(10.0) is None, "2.0s gap > 1.0s"))
+    tracker.observe("fr", 0.99, end=12.0)
+    checks.append(("outside languages", tracker.language is None, "fr is not a conversation language"))
+    tracker.observe("en", 0.9, end=13.0)
+    checks.append(("other", tracker.other("en") == "es" and tracker.other("es") == "en", "es <-> en"))
+
+    # Decodes with the cached language: good ones keep it, poor ones drop it for re-detection.
+    good = tracker.confirm(decoded("how are you", "en"))
+    checks.append(("good decode kept", good and tracker.language == "en", f"language {tracker.language}"))
+    silent = tracker.confirm(decoded("", "en", avg_logprob=-2.0, no_speech_prob=0.9))
+    checks.append(("empty decode kept", silent and tracker.language == "en", "nothing to judge"))
+    switched = tracker.confirm(decoded("que tal estas", "en", avg_logprob=-1.6))
+    checks.append(("low logprob rechecks", not switched and tracker.language is None, "logprob -1.60 < -1.00"))
+    checks.append(("recheck then caches", tracker.language_for(13.5) is None, "cache dropped"))
+    tracker.observe("es", 0.92, end=14.0)
+    checks.append(("re-detected", tracker.language_for(14.5) == "es", f"language {tracker.language}"))
+    noisy = tracker.confirm(decoded("mmm", "es", avg_logprob=-0.5, no_speech_prob=0.8))
+    checks.append(("no-speech rechecks", not noisy and tracker.language is None, "no-speech 0.80 > 0.60"))
+    checks.append(("recheck count", tracker.rechecks == 2, f"{tracker.rechecks} rechecks"))
+
+    tracker.reset()
+    checks.append(("reset", tracker.language is None and tracker.language_for(14.6) is None, "cache cleared"))
+
+    failures = 0
+    for name, ok, detail in checks:
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    if failures:
+        print(f"❌ {failures} language tracker check(s) failed")
+        sys.exit(1)
+    print("✅ Language tracker test passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -47,16 +47,33 @@ setup_gpu_environment()
 # 🚀 TU CÓDIGO ORIGINAL OPTIMIZADO
 # ==========================================
 
-import tempfile
+import copy
+import queue
 import time
-import speech_recognition as sr
-import torch
 import numpy as np
 
 # Importamos tus módulos
+from local_translator.src.audio.denoise import denoiser_from_settings
+from local_translator.src.audio.duplex import DuplexCoordinator
+from local_translator.src.audio.microphone_stream import MicrophoneStream
+from local_translator.src.audio.output_stream import AudioOutputStream
+from local_translator.src.pipeline.calibration import Profile, select_profile
+from local_translator.src.pipeline.model_manager import ModelManager, ModelSet, build_ladder
 from local_translator.src.stt import WhisperSTT
 from local_translator.src.translation.helsinki_translator import HelsinkiTranslator
+from local_translator.src.translation.streaming import iter_clauses
 from local_translator.src.tts import PiperTTS
+from local_translator.src.tts.cache import cache_from_settings
+from local_translator.src.utils.config import settings
+from local_translator.src.vad.energy_gate import EnergyGate
+from local_translator.src.vad.segmenter import SpeechSegmenter
+from local_translator.src.vad.silero_vad import SileroVAD
+
+# LISTA NEGRA
+FORBIDDEN_PHRASES = [
+    "subscribe", "suscríbete", "subtítulos", "copyright", 
+    "moo", "you", "thank you", "gracias por ver", "mbc"
+]
 
 # --- FUNCIÓN: MATA-BUCLES ---
 def is_looping(text: str) -> bool:
@@ -81,112 +98,188 @@ def is_looping(text: str) -> bool:
          
     return False
 
-# --- FUNCIÓN: PORTERO IA (VAD) ---
-def check_human_voice(wav_path: str, model, utils) -> bool:
-    (get_speech_timestamps, _, read_audio, _, _) = utils
-    wav = read_audio(wav_path, sampling_rate=16000)
-    
-    # Umbral 0.6 para ser estricto con el ruido de fondo
-    speech_timestamps = get_speech_timestamps(wav, model, sampling_rate=16000, threshold=0.6)
-    return len(speech_timestamps) > 0
+def load_models(profile: Profile, current: ModelSet | None) -> ModelSet:
+    """
+    Carga los motores de un perfil reutilizando lo que ya esté cargado igual.
+    """
+    old = current.profile if current is not None else None
+    if old is not None and (old.whisper_model_size, old.whisper_compute_type) == (
+        profile.whisper_model_size,
+        profile.whisper_compute_type,
+    ):
+        stt = current.stt
+    else:
+        stt = WhisperSTT(
+            model_size=profile.whisper_model_size,
+            device=profile.whisper_device,
+            compute_type=profile.whisper_compute_type,
+        )
+    if old is not None and old.translation_model_name == profile.translation_model_name:
+        # Mismos pesos, otra decodificación (beam -> greedy): copia superficial sin recargar
+        translator = copy.copy(current.translator)
+        translator.num_beams = profile.translation_num_beams
+    else:
+        translator = HelsinkiTranslator(
+            model_name=profile.translation_model_name,
+            device="cuda",
+            num_beams=profile.translation_num_beams,
+        )
+    return ModelSet(profile, stt, translator)
+
+def process_phrase(samples: np.ndarray, models: ModelManager, tts: PiperTTS) -> float:
+    """
+    Transcribe, traduce y locuta una frase. Devuelve los segundos de STT+MT
+    (sin la síntesis de Piper), que es lo que mide el RTF del gestor de modelos.
+    """
+    started = time.perf_counter()
+    # Un juego de modelos por frase; los cambios en segundo plano entran entre frases
+    active = models.current()
+    stt, translator = active.stt, active.translator
+
+    # 1. TRANSCRIPCIÓN
+    t0 = time.time()
+    text_es = stt.transcribe(samples)
+
+    if not text_es or len(text_es.strip()) < 2:
+        return time.perf_counter() - started
+
+    # 2. DETECCIÓN DE BUCLES (el decodificador ya corta los bucles; esto es la red de seguridad)
+    if is_looping(text_es):
+        print(f"   🔄 BUCLE DETECTADO Y ELIMINADO: '{text_es[:30]}...'")
+        return time.perf_counter() - started
+
+    # 3. LIMPIEZA DE ALUCINACIONES
+    clean = text_es.strip().lower()
+    if any(p in clean for p in FORBIDDEN_PHRASES):
+        print(f"   ⚠️ Alucinación bloqueada: '{text_es}'")
+        return time.perf_counter() - started
+
+    dt = time.time() - t0
+    print(f"📝 ES: {text_es}  (⏱️ {dt:.2f}s)")
+
+    # 4. TRADUCCIÓN Y VOZ EN STREAMING
+    # El inglés se imprime según se genera y cada cláusula se locuta en cuanto está completa.
+    print("🇺🇸 EN: ", end="", flush=True)
+
+    def show(pieces):
+        for piece in pieces:
+            print(piece, end="", flush=True)
+            yield piece
+
+    first = True
+    spoken = 0.0
+    for clause in iter_clauses(show(translator.translate_stream(text_es))):
+        # La primera cláusula de una frase nueva corta la anterior si aún suena
+        tts_started = time.perf_counter()
+        tts.speak(clause, interrupt=first)
+        spoken += time.perf_counter() - tts_started
+        first = False
+    print()
+    return time.perf_counter() - started - spoken
 
 def main() -> None:
     print("🛡️  INICIANDO SISTEMA PRO V2 (GPU Auto-Config + Anti-Bucles)...")
 
-    print("   -> Cargando Silero VAD...")
-    vad_model, vad_utils = torch.hub.load(repo_or_dir='snakers4/silero-vad', model='silero_vad', force_reload=False, trust_repo=True)
+    print("   -> Cargando Silero VAD (ONNX local)...")
+    # PORTERO IA: umbral 0.6 para ser estricto con el ruido de fondo
+    vad = SileroVAD(sample_rate=16000, threshold=0.6)
     
-    print("   -> Cargando Motores IA...")
-    # TU CONFIGURACIÓN FAVORITA: Base + Int8 (La más rápida) mas inteligente small
-    stt = WhisperSTT(model_size="base", device="cuda", compute_type="int8")
-    translator = HelsinkiTranslator(device="cuda")
-    tts = PiperTTS()
+    print("   -> Eligiendo perfil de modelos para este equipo...")
+    # Mide Whisper/MarianMT en este equipo la primera vez (luego usa la caché) y se queda
+    # con lo más preciso que cabe en settings.latency_budget. settings.auto_profile=False
+    # usa whisper_model_size/whisper_compute_type tal cual.
+    profile = select_profile()
 
-    recognizer = sr.Recognizer()
-    
-    # CONFIGURACIÓN FINA (Tus valores)
-    recognizer.energy_threshold = 300  
-    recognizer.dynamic_energy_threshold = False 
-    
-    # TIEMPOS (Tus valores para baja latencia)
-    recognizer.pause_threshold = 0.7       
-    recognizer.non_speaking_duration = 0.2
-    
-    # LISTA NEGRA
-    forbidden_phrases = [
-        "subscribe", "suscríbete", "subtítulos", "copyright", 
-        "moo", "you", "thank you", "gracias por ver", "mbc"
-    ]
+    print(f"   -> Cargando Motores IA (Whisper {profile.whisper_model_size}/{profile.whisper_compute_type})...")
+    # Si el equipo no da abasto (RTF > 1 sostenido) baja a un perfil más barato en segundo
+    # plano (beam -> greedy, small -> base -> tiny) y vuelve a subir cuando sobra margen.
+    models = ModelManager(
+        build_ladder(profile),
+        load_models,
+        window_seconds=settings.rtf_window_seconds,
+        downgrade_rtf=settings.downgrade_rtf,
+        upgrade_rtf=settings.upgrade_rtf,
+        cooldown=settings.model_switch_cooldown,
+        auto=settings.auto_downgrade,
+    )
+    models.listeners.append(
+        lambda m: print(
+            f"\n🔁 Modelos cambiados: Whisper {m.profile.whisper_model_size}/{m.profile.whisper_compute_type}, "
+            f"beams={m.profile.translation_num_beams}"
+        )
+    )
+
+    # Salida persistente: hablar no bloquea la escucha
+    output = AudioOutputStream(
+        sample_rate=settings.tts_sample_rate,
+        block_size=settings.output_block_size,
+    )
+    output.start()
+    # Las frases cortas frecuentes ("Okay.", "Thank you.") salen de la caché sin pasar por Piper
+    tts = PiperTTS(output=output, cache=cache_from_settings())
+    tts.preload(settings.tts_preload)
+
+    # Micrófono a su frecuencia nativa (M-Audio: 44.1/48 kHz) remuestreado a 16 kHz.
+    # Cola grande: mientras traducimos una frase la captura sigue acumulando.
+    mic = MicrophoneStream(
+        sample_rate=16000,
+        block_size=settings.block_size,
+        audio_queue=queue.Queue(maxsize=500),
+        native_rate=settings.capture_native_rate,
+    )
+    # Sabe cuándo suena nuestro TTS: no lo retraduce y corta la voz si hablas encima
+    duplex = DuplexCoordinator(output, sample_rate=16000, mode=settings.duplex_mode, source=mic)
+
+    # Puerta de energía con suelo de ruido adaptativo: sustituye al energy_threshold
+    # fijo (300) y a la calibración bloqueante de 1 s; se ajusta de forma continua.
+    gate = EnergyGate(margin_db=settings.energy_gate_margin_db)
+    segmenter = SpeechSegmenter(
+        vad,
+        frame_duration=settings.block_size / 16000,
+        max_silence=0.7,  # PACIENCIA: silencio que cierra una frase
+        energy_gate=gate,
+        duplex=duplex,
+        lookback_frames=settings.gate_lookback_frames,
+        denoiser=denoiser_from_settings(),
+    )
 
     try:
-        with sr.Microphone() as source:
-            print("\n🎧 Calibrando silencio (1s)...")
-            recognizer.adjust_for_ambient_noise(source, duration=1.0)
-            
-            # Forzamos mínimo 300 para tu micro M-Audio
-            if recognizer.energy_threshold < 300:
-                recognizer.energy_threshold = 300
-            
-            print(f"   -> Sensibilidad: {recognizer.energy_threshold}")
-            print("\n✅ LISTO. Habla.")
-            
+        mic.start()
+        print("\n✅ LISTO. Habla.")
+        print("\n🎤 Escuchando...")
+
+        while True:
+            try:
+                frames = [mic.audio_queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
             while True:
                 try:
-                    print("\n🎤 Escuchando...")
-                    audio = recognizer.listen(source, timeout=None, phrase_time_limit=None)
-
-                    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                        tmp.write(audio.get_wav_data())
-                        tmp_path = tmp.name
-
-                    try:
-                        # 1. CHECK VAD (¿Es humano?)
-                        is_human = check_human_voice(tmp_path, vad_model, vad_utils)
-                        if not is_human:
-                            print("   🗑️ Ruido detectado.")
-                            continue 
-                        
-                        # 2. TRANSCRIPCIÓN
-                        t0 = time.time()
-                        text_es = stt.transcribe(tmp_path)
-                        
-                        if not text_es or len(text_es.strip()) < 2:
-                            continue
-
-                        # 3. DETECCIÓN DE BUCLES
-                        if is_looping(text_es):
-                            print(f"   🔄 BUCLE DETECTADO Y ELIMINADO: '{text_es[:30]}...'")
-                            continue
-
-                        # 4. LIMPIEZA DE ALUCINACIONES
-                        clean = text_es.strip().lower()
-                        if any(p in clean for p in forbidden_phrases):
-                            print(f"   ⚠️ Alucinación bloqueada: '{text_es}'")
-                            continue
-
-                        dt = time.time() - t0
-                        print(f"📝 ES: {text_es}  (⏱️ {dt:.2f}s)")
-
-                        # 5. TRADUCCIÓN Y VOZ
-                        text_en = translator.translate(text_es)
-                        print(f"🇺🇸 EN: {text_en}")
-
-                        if text_en:
-                            tts.speak(text_en)
-
-                    finally:
-                        try:
-                            os.remove(tmp_path)
-                        except OSError:
-                            pass
-
-                except sr.UnknownValueError:
-                    pass
+                    frames.append(mic.audio_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for samples in segmenter.push(frames):
+                started = time.perf_counter()
+                model_seconds = None
+                try:
+                    model_seconds = process_phrase(samples, models, tts)
                 except Exception as e:
                     print(f"⚠️ {e}")
+                if model_seconds is None:
+                    model_seconds = time.perf_counter() - started
+                models.observe(len(samples) / 16000, model_seconds)
+                print("\n🎤 Escuchando...")
 
     except KeyboardInterrupt:
         print("\n👋 Fin.")
+    finally:
+        mic.stop()
+        output.stop()
+        print(f"   -> Frames sin pasar por el VAD: {100.0 * gate.skipped_fraction:.1f}%")
+        active = models.current()
+        print(f"   -> Decodificación cortada: STT {active.stt.truncated}, MT {active.translator.repetition_aborts}")
+        models.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.logger import EventCounter, get_logger
+
+
+class SpectralGate:
+    """
+    Streaming spectral-gating noise suppressor for 16 kHz mono blocks.
+
+    Short-time spectra (sqrt-Hann, 50% overlap) are compared bin by bin with a
+    running noise profile: each bin is kept when it stands threshold_db above
+    the noise and attenuated by up to reduction_db otherwise, with a soft ramp
+    in between. Gains are smoothed across neighbouring bins and released
+    slowly over time so speech tails are not chopped. The noise profile tracks
+    the background like EnergyGate does: it follows drops quickly and creeps up
+    slowly, so it adapts to a fan switching on. Sustained speech would still
+    creep into it, so whoever knows where speech is (the segmenter) clears
+    `adapt` for its duration and the profile is held.
+
+    Blocks of any size go in and the same number of samples comes out, delayed
+    by `latency` samples (n_fft, 32 ms at the defaults). All working buffers
+    are preallocated; process(block, out=block) runs in place. Blocks slower
+    than budget_ms are counted and reported by the log listener.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = settings.sample_rate,
+        n_fft: int = 512,
+        threshold_db: float = 6.0,
+        reduction_db: float = 18.0,
+        ramp_db: float = 6.0,
+        smoothing: float = 0.6,
+        release: float = 0.7,
+        rise: float = 0.01,
+        fall: float = 0.3,
+        budget_ms: float = 3.0,
+        max_block: int = 4096,
+    ) -> None:
+        if n_fft % 2:
+            raise ValueError("n_fft must be even")
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop = n_fft // 2
+        self.threshold_db = threshold_db
+        self.floor_gain = float(10.0 ** (-reduction_db / 20.0))
+        self.ramp_db = ramp_db
+        self.smoothing = smoothing
+        self.release = release
+        self.rise = rise
+        self.fall = fall
+        self.budget = budget_ms / 1000.0
+        self.adapt = True  # False holds the noise profile (e.g. inside a speech segment)
+        self.blocks = 0
+        self.seconds = 0.0  # time spent in process()
+        self.worst = 0.0  # slowest block, seconds
+        self._log = get_logger(__name__)
+        self._overruns = EventCounter(
+            self._log,
+            f"Denoiser over its {budget_ms:.1f} ms budget on %(count)d blocks in last %(seconds).1f s "
+            "(worst %(detail).2f ms)",
+        )
+        # Periodic Hann split over analysis and synthesis: the squared windows sum to 1 at hop n_fft/2.
+        self._window = np.sqrt(0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n_fft) / n_fft)).astype(np.float32)
+        bins = n_fft // 2 + 1
+        self._noise = np.zeros(bins, dtype=np.float32)
+        self._smoothed = np.zeros(bins, dtype=np.float32)
+        self._gain = np.ones(bins, dtype=np.float32)
+        self._scratch = np.empty(bins, dtype=np.float32)
+        self._rate = np.empty(bins, dtype=np.float32)
+        self._below = np.empty(bins, dtype=bool)
+        self._frames_seen = 0
+        self._capacity = 0
+        self._reserve(max_block)
+        self.reset()
+
+    @property
+    def latency(self) -> int:
+        return self.n_fft
+
+    def reset(self) -> None:
+        self._noise.fill(0.0)
+        self._smoothed.fill(0.0)
+        self._gain.fill(1.0)
+        self._frames_seen = 0
+        self._x.fill(0.0)
+        self._ola.fill(0.0)
+        self._fifo.fill(0.0)
+        # Prime the input so the first frame fires after one hop, and the output
+        # with one hop of silence so every call can return as many samples as it got.
+        self._x_len = self.n_fft - self.hop
+        self._fifo_len = self.hop
+
+    def process(self, block: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Denoise one block; out may be the block itself (float32) to work in place.
+        """
+        started = time.perf_counter()
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        n = len(block)
+        if out is None:
+            out = np.empty(n, dtype=np.float32)
+        self._reserve(n)
+
+        self._x[self._x_len : self._x_len + n] = block
+        self._x_len += n
+        frames = (self._x_len - self.n_fft) // self.hop + 1 if self._x_len >= self.n_fft else 0
+        if frames:
+            windows = np.lib.stride_tricks.sliding_window_view(self._x[: self._x_len], self.n_fft)[:: self.hop][:frames]
+            spectra = np.fft.rfft(windows * self._window, axis=1)
+            power = np.square(np.abs(spectra)).astype(np.float32, copy=False)
+            for f in range(frames):
+                spectra[f] *= self._frame_gain(power[f])
+            frames_out = np.fft.irfft(spectra, n=self.n_fft, axis=1).astype(np.float32, copy=False)
+            frames_out *= self._window
+            for f in range(frames):
+                self._ola[f * self.hop : f * self.hop + self.n_fft] += frames_out[f]
+            emitted = frames * self.hop
+            self._fifo[self._fifo_len : self._fifo_len + emitted] = self._ola[:emitted]
+            self._fifo_len += emitted
+            tail = self.n_fft - self.hop
+            self._ola[:tail] = self._ola[emitted : emitted + tail]
+            self._ola[tail : emitted + tail] = 0.0
+            self._x[: self._x_len - emitted] = self._x[emitted : self._x_len]
+            self._x_len -= emitted
+
+        out[:n] = self._fifo[:n]
+        self._fifo[: self._fifo_len - n] = self._fifo[n : self._fifo_len]
+        self._fifo_len -= n
+
+        elapsed = time.perf_counter() - started
+        self.blocks += 1
+        self.seconds += elapsed
+        self.worst = max(self.worst, elapsed)
+        if elapsed > self.budget:
+            self._overruns.add(detail=elapsed * 1000.0)
+        return out
+
+    def _frame_gain(self, power: np.ndarray) -> np.ndarray:
+        # Power smoothed over time, so the noise profile follows the mean rather than its dips.
+        smoothed, noise, gain, scratch = self._smoothed, self._noise, self._gain, self._scratch
+        self._frames_seen += 1
+        if self._frames_seen == 1:
+            smoothed[:] = power
+            noise[:] = power
+        else:
+            smoothed *= self.smoothing
+            smoothed += (1.0 - self.smoothing) * power
+        if self._frames_seen > 1 and self.adapt:
+            # Asymmetric tracking; a plain running mean while the profile warms up.
+            rise = max(self.rise, 1.0 / self._frames_seen)
+            np.less(smoothed, noise, out=self._below)
+            self._rate.fill(rise)
+            self._rate[self._below] = self.fall
+            np.subtract(smoothed, noise, out=scratch)
+            scratch *= self._rate
+            noise += scratch
+
+        # Soft gate on the per-bin SNR: floor_gain below threshold, 1 above threshold + ramp.
+        np.maximum(noise, 1e-12, out=scratch)
+        np.divide(power, scratch, out=scratch)
+        np.maximum(scratch, 1e-12, out=scratch)
+        np.log10(scratch, out=scratch)
+        scratch *= 10.0
+        scratch -= self.threshold_db
+        scratch /= self.ramp_db
+        np.clip(scratch, 0.0, 1.0, out=scratch)
+        scratch *= 1.0 - self.floor_gain
+        scratch += self.floor_gain
+        # Smooth across neighbouring bins, then release slowly from the previous frame's gain.
+        centre = scratch[1:-1] * 0.5
+        centre += 0.25 * scratch[:-2]
+        centre += 0.25 * scratch[2:]
+        scratch[1:-1] = centre
+        gain *= self.release
+        np.maximum(gain, scratch, out=gain)
+        return gain
+
+    def _reserve(self, n: int) -> None:
+        if n <= self._capacity:
+            return
+        capacity = max(n, 2 * self._capacity)
+        previous = (self._x, self._ola, self._fifo) if self._capacity else ()
+        self._x = np.zeros(self.n_fft + capacity, dtype=np.float32)
+        self._ola = np.zeros(self.n_fft + self.hop + capacity, dtype=np.float32)
+        self._fifo = np.zeros(2 * self.hop + capacity, dtype=np.float32)
+        # Grown mid-stream: carry the pending samples over.
+        for new, old in zip((self._x, self._ola, self._fifo), previous):
+            new[: len(old)] = old
+        self._capacity = capacity
+
+
+def denoiser_from_settings() -> Optional[SpectralGate]:
+    """
+    The configured denoiser for one audio stream, or None when settings.denoise is off.
+    """
+    if not settings.denoise:
+        return None
+    return SpectralGate(
+        sample_rate=settings.sample_rate,
+        threshold_db=settings.denoise_threshold_db,
+        reduction_db=settings.denoise_reduction_db,
+        budget_ms=settings.denoise_budget_ms,
+    )
+
+
+def noise_clip(kind: str, seconds: float, sample_rate: int = 16_000, seed: int = 0) -> np.ndarray:
+    """
+    Synthetic speech-free background: "fan" (hum + broadband whoosh), "hvac"
+    (low rumble), "crowd" (syllable-rate modulated band noise, babble-like).
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sample_rate)
+    t = np.arange(n) / sample_rate
+    white = rng.standard_normal(n)
+    spectrum = np.fft.rfft(white)
+    freqs = np.fft.rfftfreq(n, 1.0 / sample_rate)
+    if kind == "fan":
+        shaped = np.fft.irfft(spectrum / np.sqrt(np.maximum(freqs, 50.0) / 50.0), n)
+        hum = sum(np.sin(2 * np.pi * f * t + rng.uniform(0, 2 * np.pi)) / k for k, f in enumerate((120, 240, 360), 1))
+        audio = 0.6 * shaped / np.std(shaped) + 0.3 * hum
+    elif kind == "hvac":
+        shaped = np.fft.irfft(spectrum / np.maximum(freqs, 30.0) * 30.0, n)
+        audio = shaped / np.std(shaped)
+    elif kind == "crowd":
+        audio = np.zeros(n)
+        for _ in range(8):
+            band = rng.uniform(300, 2500)
+            voice = np.fft.irfft(spectrum * np.exp(-(((freqs - band) / 400.0) ** 2)) * rng.uniform(0.5, 1.5), n)
+            syllables = 0.5 + 0.5 * np.sin(2 * np.pi * rng.uniform(3, 6) * t + rng.uniform(0, 2 * np.pi))
+            audio += voice / (np.std(voice) + 1e-9) * syllables
+            spectrum = np.fft.rfft(rng.standard_normal(n))
+    else:
+        raise ValueError(f"Unknown noise kind '{kind}'")
+    # -30 dBFS RMS: loud enough to reach the VAD past the energy gate.
+    audio *= 10 ** (-30 / 20) / (np.sqrt(np.mean(audio**2)) + 1e-12)
+    return audio.astype(np.float32)
+
+
+def benchmark(seconds: float, block_size: int = settings.block_size) -> tuple[float, float]:
+    """
+    Return (CPU seconds per second of audio, worst block in seconds).
+    """
+    gate = SpectralGate()
+    audio = noise_clip("fan", seconds)
+    block = np.empty(block_size, dtype=np.float32)
+    start = time.process_time()
+    for i in range(0, len(audio) - block_size + 1, block_size):
+        block[:] = audio[i : i + block_size]
+        gate.process(block, out=block)
+    return (time.process_time() - start) / seconds, gate.worst
+
+
+def count_false_triggers(audio: np.ndarray, denoise: bool, block_size: int = settings.block_size) -> tuple[int, int]:
+    """
+    Run speech-free audio through the segmenter (energy gate + Silero VAD);
+    returns (segments opened, frames classified as speech).
+    """
+    from local_translator.src.vad.energy_gate import EnergyGate
+    from local_translator.src.vad.segmenter import SpeechSegmenter
+    from local_translator.src.vad.silero_vad import SileroVAD
+
+    vad = SileroVAD(sample_rate=settings.sample_rate, threshold=settings.vad_threshold)
+    speech_frames = 0
+    is_speech = vad.speech_probability
+
+    def counting(frame: np.ndarray) -> float:
+        nonlocal speech_frames
+        prob = is_speech(frame)
+        speech_frames += prob >= vad.threshold
+        return prob
+
+    vad.speech_probability = counting  # type: ignore[method-assign]
+    segmenter = SpeechSegmenter(
+        vad,
+        frame_duration=block_size / settings.sample_rate,
+        max_silence=settings.max_silence_after_speech,
+        energy_gate=EnergyGate(margin_db=settings.energy_gate_margin_db) if settings.energy_gate else None,
+        lookback_frames=settings.gate_lookback_frames,
+        denoiser=SpectralGate() if denoise else None,
+    )
+    usable = len(audio) - len(audio) % block_size
+    frames = [frame.copy() for frame in audio[:usable].reshape(-1, block_size)]
+    segments = 0
+    for start in range(0, len(frames), 32):
+        segments += len(segmenter.push(frames[start : start + 32]))
+    segments += segmenter.flush() is not None
+    return segments, speech_frames
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the streaming denoiser.")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("wavs", nargs="*", type=Path, help="speech-free noise recordings (default: synthetic set)")
+    args = parser.parse_args(argv)
+
+    cost, worst = benchmark(args.seconds)
+    block_ms = settings.block_size / settings.sample_rate * 1000.0
+    print(
+        f"CPU: {cost * 1000:.2f} ms per audio-second; worst {block_ms:.0f} ms block "
+        f"{worst * 1000:.2f} ms (budget {settings.denoise_budget_ms:.1f} ms)"
+    )
+
+    if args.wavs:
+        from local_translator.src.audio.resampler import PolyphaseResampler
+        from local_translator.src.audio.source import read_wav
+
+        clips = {}
+        for path in args.wavs:
+            rate, data = read_wav(path)
+            clips[path.name] = PolyphaseResampler(rate, settings.sample_rate, channels=data.shape[1]).process(data)
+    else:
+        clips = {kind: noise_clip(kind, args.seconds, seed=i) for i, kind in enumerate(("fan", "hvac", "crowd"))}
+
+    try:
+        for name, audio in clips.items():
+            before = count_false_triggers(audio, denoise=False)
+            after = count_false_triggers(audio, denoise=True)
+            print(
+                f"{name:>12}: false segments {before[0]} -> {after[0]}, "
+                f"speech frames {before[1]} -> {after[1]} ({len(audio) / settings.sample_rate:.0f} s of noise)"
+            )
+    except (ImportError, FileNotFoundError) as exc:
+        print(f"VAD comparison skipped: {exc}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from local_translator.src.audio.output_stream import AudioOutputStream
+from local_translator.src.audio.resampler import PolyphaseResampler
+from local_translator.src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from local_translator.src.audio.source import AudioSource
+
+
+class NLMSEchoCanceller:
+    """
+    Block NLMS adaptive filter that removes the loudspeaker signal from the mic.
+    Weights are updated once per block, so the work is a few vectorized dot products.
+    """
+
+    def __init__(self, filter_len: int = 256, step_size: float = 0.3, eps: float = 1e-6) -> None:
+        self.filter_len = filter_len
+        self.step_size = step_size
+        self.eps = eps
+        self._weights = np.zeros(filter_len, dtype=np.float32)
+
+    def reset(self) -> None:
+        self._weights.fill(0.0)
+
+    def process(self, mic: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        """
+        Return the echo-reduced mic block.
+        reference must hold filter_len - 1 history samples followed by len(mic) samples
+        time-aligned with the mic block.
+        """
+        n = len(mic)
+        # Row i holds reference[i + filter_len - 1], ..., reference[i] (newest first).
+        windows = np.lib.stride_tricks.sliding_window_view(reference[: n + self.filter_len - 1], self.filter_len)
+        taps = windows[:, ::-1]
+        echo = taps @ self._weights
+        error = (mic - echo).astype(np.float32, copy=False)
+        # Per-sample reference power: each block moves the weights a full NLMS step.
+        power = float(np.einsum("ij,ij->", taps, taps)) / (n * self.filter_len)
+        self._weights += (self.step_size / (power + self.eps)) * (taps.T @ error) / n
+        return error
+
+
+@dataclass
+class _Track:
+    # Playback state of one watched output stream.
+    output: AudioOutputStream
+    resampler: PolyphaseResampler
+    next_write: Optional[int] = None  # absolute ring index where its next block continues
+    last_end: Optional[float] = None  # when its last played block ends (perf_counter)
+
+
+class DuplexCoordinator:
+    """
+    Knows when our own TTS is playing and keeps it out of the VAD/STT path.
+
+    During playback VAD probabilities are gated to zero (mode="gate") or scaled
+    down (mode="duck"). Frames can optionally be cleaned with an NLMS echo
+    canceller fed by the played reference. Sustained confident speech while
+    playing counts as barge-in: playback is flushed and frames pass through.
+
+    The reference is kept in a ring indexed by time (mic-rate samples since
+    the coordinator was created): played blocks are placed by their speaker
+    timestamp and mic frames are matched by the source's capture timestamp
+    (see AudioSource.frame_time), so queueing on either side does not skew
+    the alignment. echo_delay is the acoustic path on top of that.
+
+    Every output that reaches the loudspeaker must be watched (the one given
+    here plus any added with watch()): all of them gate the VAD, are flushed
+    on barge-in and are summed into the echo reference.
+    """
+
+    def __init__(
+        self,
+        output: AudioOutputStream,
+        sample_rate: int,
+        mode: str = "gate",
+        duck_factor: float = 0.3,
+        hangover: float = 0.3,
+        barge_in_threshold: float = 0.85,
+        barge_in_frames: int = 6,
+        echo_canceller: Optional[NLMSEchoCanceller] = None,
+        echo_delay: float = 0.0,
+        source: Optional[AudioSource] = None,
+    ) -> None:
+        if mode not in ("gate", "duck"):
+            raise ValueError(f"Unknown duplex mode: {mode}")
+        self.output = output
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.duck_factor = duck_factor
+        self.hangover = hangover
+        self.barge_in_threshold = barge_in_threshold
+        self.barge_in_frames = barge_in_frames
+        self.echo_canceller = echo_canceller
+        self.source = source
+        self.gated_frames = 0
+        self.barge_ins = 0
+        self._echo_delay = int(echo_delay * sample_rate)
+        self._tracks: list[_Track] = []
+        # Reference ring at the mic rate: a few seconds is plenty for alignment.
+        # Written on the audio thread and read on the processing thread, under _lock.
+        self._ref = np.zeros(sample_rate * 4, dtype=np.float32)
+        self._ref_head = 0  # one past the newest reference sample (absolute index)
+        self._epoch = time.perf_counter()
+        self._frames_seen = 0
+        self._barge_run = 0
+        self._barged_in = False
+        self._lock = threading.Lock()
+        self._log = get_logger(__name__)
+        self.watch(output)
+
+    @property
+    def outputs(self) -> list[AudioOutputStream]:
+        return [track.output for track in self._tracks]
+
+    def watch(self, output: AudioOutputStream) -> None:
+        """
+        Also treat `output` as our own playback (e.g. a second voice on its own stream).
+        """
+        track = _Track(output, PolyphaseResampler(output.sample_rate, self.sample_rate))
+        with self._lock:
+            self._tracks.append(track)
+        output.add_listener(lambda block, played_at: self._on_playback(track, block, played_at))
+
+    @property
+    def playback_active(self) -> bool:
+        if any(track.output.is_playing for track in self._tracks):
+            return True
+        now = time.perf_counter()
+        with self._lock:
+            return any(
+                track.last_end is not None and now - track.last_end < self.hangover for track in self._tracks
+            )
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Remove our own playback from a mic frame (no-op without an echo canceller).
+        Must see every frame the source queued, in order, to match capture times.
+        """
+        index = self._frames_seen
+        self._frames_seen += 1
+        if self.echo_canceller is None or not self.playback_active:
+            return frame
+        captured_at = self.source.frame_time(index) if self.source is not None else None
+        reference = self._reference_for(len(frame), captured_at)
+        return self.echo_canceller.process(frame, reference)
+
+    def weigh(self, speech_prob: float) -> float:
+        """
+        Adjust a VAD probability for the current playback state, handling barge-in.
+        """
+        if not self.playback_active:
+            self._barge_run = 0
+            self._barged_in = False
+            return speech_prob
+        if self._barged_in:
+            return speech_prob
+
+        if speech_prob >= self.barge_in_threshold:
+            self._barge_run += 1
+            if self._barge_run >= self.barge_in_frames:
+                self._barged_in = True
+                self.barge_ins += 1
+                for output in self.outputs:
+                    output.flush()
+                self._log.info("Barge-in detected; stopping TTS playback")
+                return speech_prob
+        else:
+            self._barge_run = 0
+
+        self.gated_frames += 1
+        if self.mode == "gate":
+            return 0.0
+        return speech_prob * self.duck_factor
+
+    def _on_playback(self, track: _Track, block: np.ndarray, played_at: float) -> None:
+        end = played_at + len(block) / track.output.sample_rate
+        if self.echo_canceller is None:
+            with self._lock:
+                track.last_end = end
+            return
+        # Reference is kept at the mic rate so it lines up with captured frames.
+        samples = track.resampler.process(block)
+        with self._lock:
+            track.last_end = end
+            self._write_ring(track, samples, played_at)
+
+    def _index(self, at: float) -> int:
+        return int(round((at - self._epoch) * self.sample_rate))
+
+    def _write_ring(self, track: _Track, samples: np.ndarray, played_at: float) -> None:
+        # Caller holds self._lock. Tracks overlapping in time are summed, as in the room.
+        expected = self._index(played_at)
+        start = track.next_write
+        if start is None or abs(start - expected) > len(samples) + self.sample_rate // 50:
+            # First block after a pause, or callback jitter beyond a block: re-anchor on
+            # the timestamp. Otherwise blocks stay contiguous, as the stream plays them.
+            start = expected
+        end = start + len(samples)
+        track.next_write = end
+        size = len(self._ref)
+        if start < self._ref_head - size:
+            return
+        if end > self._ref_head:
+            # Positions reused from an older lap (or skipped while idle) become silence.
+            stale = np.arange(max(self._ref_head, end - size), end)
+            self._ref[stale % size] = 0.0
+            self._ref_head = end
+        self._ref[np.arange(start, end) % size] += samples
+
+    def _reference_for(self, n: int, captured_at: Optional[float]) -> np.ndarray:
+        assert self.echo_canceller is not None
+        total = n + self.echo_canceller.filter_len - 1
+        with self._lock:
+            if captured_at is not None:
+                stop = self._index(captured_at) + n - self._echo_delay
+            else:
+                # No capture clock (e.g. file replay): assume the newest reference is current.
+                stop = self._ref_head - self._echo_delay
+            idx = np.arange(stop - total, stop)
+            reference = self._ref[idx % len(self._ref)]
+            # Not played yet, or already overwritten: no reference.
+            reference[(idx >= self._ref_head) | (idx < self._ref_head - len(self._ref))] = 0.0
+        return reference
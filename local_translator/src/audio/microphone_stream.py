@@ -2,17 +2,23 @@ from __future__ import annotations
 
 import queue
 import threading
+import time
 from typing import Optional
 
 import numpy as np
 import sounddevice as sd
 
-from local_translator.src.utils.logger import get_logger
+from local_translator.src.audio.resampler import PolyphaseResampler
+from local_translator.src.audio.source import AudioSource
+from local_translator.src.utils.logger import EventCounter, get_logger
+from local_translator.src.utils.profiler import profiler
 
 
-class MicrophoneStream:
+class MicrophoneStream(AudioSource):
     """
     Non-blocking microphone capture that pushes audio frames into a queue.
+    The device is opened at its native rate; audio is downmixed and resampled
+    to sample_rate in the callback and re-chunked into block_size frames.
     """
 
     def __init__(
@@ -22,31 +28,74 @@ class MicrophoneStream:
         channels: int = 1,
         dtype: str = "float32",
         audio_queue: Optional[queue.Queue] = None,
+        device: Optional[int | str] = None,
+        native_rate: bool = True,
     ) -> None:
         self.sample_rate = sample_rate
         self.block_size = block_size
         self.channels = channels
         self.dtype = dtype
         self.audio_queue = audio_queue or queue.Queue(maxsize=100)
+        self.device = device
+        self.native_rate = native_rate
+        self.device_rate = sample_rate
+        self._resampler: Optional[PolyphaseResampler] = None
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.dropped_frames = 0
+        # (queued frame index, capture time) of the latest callback; see frame_time().
+        self._queued = 0
+        self._anchor: Optional[tuple[int, float]] = None
         self._stream: Optional[sd.InputStream] = None
         self._lock = threading.Lock()
         self._log = get_logger(__name__)
+        # The callback runs on PortAudio's real-time thread: it only counts, the
+        # log listener reports the totals once per interval.
+        self._status_events = EventCounter(
+            self._log, "Sounddevice status %(detail)s: %(count)d callbacks in last %(seconds).1f s"
+        )
+        self._dropped = EventCounter(
+            self._log, "Audio queue is full: dropped %(count)d frames in last %(seconds).1f s"
+        )
 
-    def _callback(self, indata, frames, time, status) -> None:  # type: ignore[override]
+    def _callback(self, indata, frames, time_info, status) -> None:  # type: ignore[override]
+        profiler.register("capture")
         if status:
-            self._log.warning("Sounddevice status: %s", status)
+            self._status_events.add(detail=status)
         with self._lock:
             if self._stream is None:
                 return
-        # Convert to mono if needed and copy to avoid referencing input buffer.
-        data = np.copy(indata)
-        if self.channels > 1:
-            data = np.mean(data, axis=1, keepdims=True)
-        data = data.astype(self.dtype, copy=False).flatten()
-        try:
-            self.audio_queue.put_nowait(data)
-        except queue.Full:
-            self._log.warning("Audio queue is full; dropping frame")
+        # PortAudio stamps the buffer on the stream clock; shift it onto perf_counter.
+        now = time.perf_counter()
+        adc = time_info.inputBufferAdcTime
+        captured = now - (time_info.currentTime - adc) if adc else now - frames / self.device_rate
+        # Downmix + resample in one pass; the result never references indata.
+        samples = self._resampler.process(indata) if self._resampler else indata[:, 0].copy()
+        pending = np.concatenate((self._pending, samples)) if self._pending.size else samples
+        # Leftover samples from the previous callback were captured just before this buffer.
+        first = captured - len(self._pending) / self.sample_rate
+        anchor = None
+        offset = 0
+        while len(pending) - offset >= self.block_size:
+            data = pending[offset : offset + self.block_size].astype(self.dtype)
+            try:
+                self.audio_queue.put_nowait(data)
+            except queue.Full:
+                self.dropped_frames += 1
+                self._dropped.add()
+            else:
+                if anchor is None:
+                    anchor = (self._queued, first + offset / self.sample_rate)
+                self._queued += 1
+            offset += self.block_size
+        if anchor is not None:
+            self._anchor = anchor
+        self._pending = pending[offset:]
+
+    def frame_time(self, index: int) -> Optional[float]:
+        anchor = self._anchor
+        if anchor is None:
+            return None
+        return anchor[1] + (index - anchor[0]) * self.block_size / self.sample_rate
 
     def start(self) -> None:
         """
@@ -54,16 +103,28 @@ class MicrophoneStream:
         """
         if self._stream is not None:
             return
+        if self.native_rate:
+            info = sd.query_devices(self.device, "input")
+            self.device_rate = int(info["default_samplerate"])
+        self._resampler = PolyphaseResampler(self.device_rate, self.sample_rate, channels=self.channels)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._queued = 0
+        self._anchor = None
+        device_block = int(round(self.block_size * self.device_rate / self.sample_rate))
         self._stream = sd.InputStream(
-            samplerate=self.sample_rate,
-            blocksize=self.block_size,
+            samplerate=self.device_rate,
+            blocksize=device_block,
             channels=self.channels,
-            dtype=self.dtype,
+            dtype="float32",
+            device=self.device,
             callback=self._callback,
         )
         self._stream.start()
         self._log.info(
-            "Microphone stream started (sr=%d, block=%d)", self.sample_rate, self.block_size
+            "Microphone stream started (device_sr=%d, sr=%d, block=%d)",
+            self.device_rate,
+            self.sample_rate,
+            self.block_size,
         )
 
     def stop(self) -> None:
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import collections
+import threading
+import time
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, Optional
+
+import numpy as np
+
+from local_translator.src.utils.logger import EventCounter, get_logger
+from local_translator.src.utils.profiler import profiler
+
+# Fills the given (frames, channels) buffer in place; returns True if any audio was rendered.
+RenderCallback = Callable[[np.ndarray], bool]
+# Receives each rendered mono block (a view; copy it to keep it) on the audio thread,
+# with the time.perf_counter() at which its first sample reaches the speaker.
+PlaybackListener = Callable[[np.ndarray, float], None]
+
+
+@dataclass
+class _Chunk:
+    data: np.ndarray
+    requested_at: Optional[float] = None
+    offset: int = 0
+
+
+class SoundDeviceSink:
+    """
+    Plays rendered audio through a single long-lived sounddevice.OutputStream.
+    """
+
+    def __init__(self, device: Optional[int | str] = None) -> None:
+        self.device = device
+        self._stream = None
+        self._status_events = EventCounter(
+            get_logger(__name__), "Output status %(detail)s: %(count)d callbacks in last %(seconds).1f s"
+        )
+
+    @property
+    def latency(self) -> float:
+        return float(self._stream.latency) if self._stream is not None else 0.0
+
+    def start(self, render: RenderCallback, sample_rate: int, block_size: int, channels: int) -> None:
+        # Imported here so the null/file sinks work on machines without PortAudio.
+        import sounddevice as sd
+
+        def _callback(outdata, frames, time_info, status) -> None:  # type: ignore[no-untyped-def]
+            profiler.register("playback")
+            if status:
+                self._status_events.add(detail=status)  # no logging on the audio thread
+            render(outdata)
+
+        self._stream = sd.OutputStream(
+            samplerate=sample_rate,
+            blocksize=block_size,
+            channels=channels,
+            dtype="float32",
+            device=self.device,
+            callback=_callback,
+        )
+        self._stream.start()
+
+    def stop(self) -> None:
+        if self._stream is None:
+            return
+        self._stream.stop()
+        self._stream.close()
+        self._stream = None
+
+
+class NullSink:
+    """
+    Device-less sink that pulls audio from the engine and discards it.
+    With realtime=False queued audio is consumed as fast as possible (for tests).
+    """
+
+    latency = 0.0
+
+    def __init__(self, realtime: bool = True) -> None:
+        self.realtime = realtime
+        self.frames_written = 0
+        self._thread: Optional[threading.Thread] = None
+        self._running = threading.Event()
+
+    def start(self, render: RenderCallback, sample_rate: int, block_size: int, channels: int) -> None:
+        self._running.set()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(render, sample_rate, block_size, channels),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def write(self, block: np.ndarray) -> None:
+        self.frames_written += len(block)
+
+    def _run(self, render: RenderCallback, sample_rate: int, block_size: int, channels: int) -> None:
+        block = np.zeros((block_size, channels), dtype=np.float32)
+        period = block_size / sample_rate
+        next_deadline = time.perf_counter()
+        while self._running.is_set():
+            active = render(block)
+            if active:
+                self.write(block)
+            if self.realtime or not active:
+                next_deadline += period
+                delay = next_deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_deadline = time.perf_counter()
+
+
+class WavFileSink(NullSink):
+    """
+    Records everything the engine plays into a 16-bit WAV file.
+    """
+
+    def __init__(self, path: Path, realtime: bool = False) -> None:
+        super().__init__(realtime=realtime)
+        self.path = Path(path)
+        self._wav: Optional[wave.Wave_write] = None
+
+    def start(self, render: RenderCallback, sample_rate: int, block_size: int, channels: int) -> None:
+        self._wav = wave.open(str(self.path), "wb")
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+        super().start(render, sample_rate, block_size, channels)
+
+    def stop(self) -> None:
+        super().stop()
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+    def write(self, block: np.ndarray) -> None:
+        super().write(block)
+        if self._wav is not None:
+            pcm = np.clip(block, -1.0, 1.0) * 32767.0
+            self._wav.writeframes(pcm.astype("<i2").tobytes())
+
+
+class AudioOutputStream:
+    """
+    Persistent audio output that plays queued PCM chunks back-to-back.
+    Owns one output stream for its whole lifetime (the playback counterpart of
+    MicrophoneStream) so speaking never spawns processes or blocks the caller.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        block_size: int = 1024,
+        channels: int = 1,
+        fade_ms: float = 10.0,
+        sink: Optional[SoundDeviceSink | NullSink] = None,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.channels = channels
+        self.sink = sink if sink is not None else SoundDeviceSink()
+        self.last_latency: Optional[float] = None
+        self.latencies: Deque[float] = collections.deque(maxlen=100)
+        self._fade_len = max(1, int(sample_rate * fade_ms / 1000.0))
+        self._chunks: Deque[_Chunk] = collections.deque()
+        self._fade_tail: Optional[np.ndarray] = None
+        self._fade_pos = 0
+        self._mix = np.zeros(block_size, dtype=np.float32)
+        self._idle = threading.Event()
+        self._idle.set()
+        self._listeners: list[PlaybackListener] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._log = get_logger(__name__)
+
+    @property
+    def is_playing(self) -> bool:
+        return not self._idle.is_set()
+
+    def add_listener(self, listener: PlaybackListener) -> None:
+        """
+        Register a callback that receives every non-silent block as it is played.
+        Runs on the audio thread, so it must be cheap.
+        """
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """
+        Open the output device and start pulling audio.
+        """
+        if self._started:
+            return
+        self.sink.start(self._render, self.sample_rate, self.block_size, self.channels)
+        self._started = True
+        self._log.info(
+            "Audio output started (sr=%d, block=%d, sink=%s)",
+            self.sample_rate,
+            self.block_size,
+            type(self.sink).__name__,
+        )
+
+    def stop(self) -> None:
+        """
+        Stop playback and close the output device.
+        """
+        if not self._started:
+            return
+        self.sink.stop()
+        self._started = False
+        with self._lock:
+            self._chunks.clear()
+            self._fade_tail = None
+            self._idle.set()
+        self._log.info("Audio output stopped")
+
+    def enqueue(
+        self,
+        pcm: np.ndarray,
+        interrupt: bool = False,
+        requested_at: Optional[float] = None,
+    ) -> None:
+        """
+        Queue PCM (int16 or float in [-1, 1]) for gapless playback.
+        With interrupt=True anything still queued is cut with a short crossfade.
+        requested_at (time.perf_counter) is the reference for first-sample latency.
+        """
+        data = self._to_float(pcm)
+        if data.size == 0:
+            return
+        if interrupt:
+            data = data.copy() if data is pcm else data
+            n = min(self._fade_len, len(data))
+            data[:n] *= np.linspace(0.0, 1.0, n, endpoint=False, dtype=np.float32)
+        with self._lock:
+            if interrupt:
+                self._start_fade_out()
+            self._chunks.append(_Chunk(data=data, requested_at=requested_at or time.perf_counter()))
+            self._idle.clear()
+
+    def flush(self) -> None:
+        """
+        Drop all queued audio, fading out whatever is currently playing.
+        """
+        with self._lock:
+            self._start_fade_out()
+            if self._fade_tail is None:
+                self._idle.set()
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every queued chunk has been played.
+        """
+        return self._idle.wait(timeout)
+
+    def _to_float(self, pcm: np.ndarray) -> np.ndarray:
+        pcm = np.asarray(pcm)
+        if pcm.ndim > 1:
+            pcm = pcm.mean(axis=1)
+        if pcm.dtype == np.int16:
+            return pcm.astype(np.float32) / 32768.0
+        return pcm.astype(np.float32, copy=False)
+
+    def _start_fade_out(self) -> None:
+        # Caller holds self._lock.
+        remaining = []
+        needed = self._fade_len
+        for chunk in self._chunks:
+            part = chunk.data[chunk.offset : chunk.offset + needed]
+            remaining.append(part)
+            needed -= len(part)
+            if needed <= 0:
+                break
+        self._chunks.clear()
+        if not remaining:
+            return
+        tail = np.concatenate(remaining)
+        tail = tail * np.linspace(1.0, 0.0, len(tail), dtype=np.float32)
+        if self._fade_tail is not None:
+            # A fade already in progress is mixed into the new one.
+            old = self._fade_tail[self._fade_pos : self._fade_pos + len(tail)]
+            tail[: len(old)] += old
+        self._fade_tail = tail
+        self._fade_pos = 0
+
+    def _render(self, outdata: np.ndarray) -> bool:
+        frames = outdata.shape[0]
+        if self._mix.shape[0] < frames:
+            self._mix = np.zeros(frames, dtype=np.float32)
+        out = self._mix[:frames]
+        out.fill(0.0)
+        pos = 0
+        with self._lock:
+            while pos < frames and self._chunks:
+                chunk = self._chunks[0]
+                if chunk.offset == 0 and chunk.requested_at is not None:
+                    latency = time.perf_counter() - chunk.requested_at + self.sink.latency
+                    self.last_latency = latency
+                    self.latencies.append(latency)
+                n = min(frames - pos, len(chunk.data) - chunk.offset)
+                out[pos : pos + n] = chunk.data[chunk.offset : chunk.offset + n]
+                chunk.offset += n
+                pos += n
+                if chunk.offset >= len(chunk.data):
+                    self._chunks.popleft()
+                    # Only the first chunk of an utterance measures latency.
+                    if self._chunks:
+                        self._chunks[0].requested_at = None
+            active = pos > 0
+            if self._fade_tail is not None:
+                n = min(frames, len(self._fade_tail) - self._fade_pos)
+                out[:n] += self._fade_tail[self._fade_pos : self._fade_pos + n]
+                self._fade_pos += n
+                active = True
+                if self._fade_pos >= len(self._fade_tail):
+                    self._fade_tail = None
+            if not self._chunks and self._fade_tail is None:
+                self._idle.set()
+        outdata[:] = out[:, None]
+        if active:
+            played_at = time.perf_counter() + self.sink.latency
+            for listener in self._listeners:
+                listener(out, played_at)
+        return active
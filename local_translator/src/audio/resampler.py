@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+
+class PolyphaseResampler:
+    """
+    Streaming rational resampler (windowed-sinc polyphase FIR) with channel downmix.
+
+    Keeps its filter history between calls, so feeding arbitrary block sizes gives
+    the same output as resampling the whole signal at once. Multichannel input is
+    mixed to mono in the same call before filtering.
+    """
+
+    def __init__(
+        self,
+        in_rate: int,
+        out_rate: int,
+        channels: int = 1,
+        taps_per_phase: int = 96,  # >90 dB rejection from 1.1x the output Nyquist (48k/44.1k -> 16k)
+        cutoff: float = 0.9,
+        kaiser_beta: float = 9.0,
+    ) -> None:
+        g = math.gcd(int(in_rate), int(out_rate))
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.channels = channels
+        self.up = int(out_rate) // g
+        self.down = int(in_rate) // g
+        self.taps_per_phase = taps_per_phase
+        self._mix = np.full(channels, 1.0 / channels, dtype=np.float32)
+        self._phases = self._design(cutoff, kaiser_beta)
+        self._history = np.zeros(taps_per_phase - 1, dtype=np.float32)
+        # Upsampled-domain time of the next output sample, relative to history[0].
+        self._t = (taps_per_phase - 1) * self.up
+
+    @property
+    def passthrough(self) -> bool:
+        return self.up == 1 and self.down == 1
+
+    def reset(self) -> None:
+        self._history.fill(0.0)
+        self._t = (self.taps_per_phase - 1) * self.up
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        Resample one block; returns mono float32 at out_rate.
+        block is (frames,) or (frames, channels).
+        """
+        block = np.asarray(block, dtype=np.float32)
+        if block.ndim == 2:
+            block = block @ self._mix if block.shape[1] > 1 else block[:, 0]
+        if self.passthrough:
+            return block.copy()
+
+        if block.size == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        x = np.concatenate((self._history, block))
+        # Output n uses input indices base-K+1 .. base, with base = t // up.
+        last_t = len(x) * self.up - 1
+        count = max(0, (last_t - self._t) // self.down + 1)
+        if count == 0 or len(x) < self.taps_per_phase:
+            # Tiny block: nothing due yet, keep all of it for the next call.
+            self._history = x
+            return np.zeros(0, dtype=np.float32)
+        t = self._t + self.down * np.arange(count, dtype=np.int64)
+        base = t // self.up
+        phase = t % self.up
+        windows = np.lib.stride_tricks.sliding_window_view(x, self.taps_per_phase)
+        # windows[i] = x[i : i + K]; output needs x[base - K + 1 : base + 1].
+        out = np.einsum("nk,nk->n", windows[base - self.taps_per_phase + 1], self._phases[phase])
+
+        next_t = self._t + self.down * count
+        # Never keep less than K - 1 samples: the next output may still be inputs away.
+        keep_from = min(max(next_t // self.up - (self.taps_per_phase - 1), 0), len(x) - (self.taps_per_phase - 1))
+        self._history = x[keep_from:].copy()
+        self._t = next_t - keep_from * self.up
+        return out.astype(np.float32, copy=False)
+
+    def _design(self, cutoff: float, beta: float) -> np.ndarray:
+        # Prototype low-pass at the upsampled rate, cut at the narrower Nyquist.
+        length = self.up * self.taps_per_phase
+        fc = 0.5 * cutoff / max(self.up, self.down)
+        m = np.arange(length) - (length - 1) / 2.0
+        h = 2.0 * fc * np.sinc(2.0 * fc * m) * np.kaiser(length, beta)
+        # Unity DC gain per phase after zero-stuffing.
+        h *= self.up / h.sum()
+        # phases[p, k] = h[p + k * up], so y[n] = sum_k phases[p, k] * x[base - k].
+        phases = h.reshape(self.taps_per_phase, self.up).T
+        # Reverse taps so they line up with windows ordered oldest -> newest.
+        return np.ascontiguousarray(phases[:, ::-1], dtype=np.float32)
+
+
+def benchmark(in_rate: int, out_rate: int, channels: int, block_size: int, seconds: float) -> float:
+    """
+    Return CPU seconds spent per second of input audio.
+    """
+    resampler = PolyphaseResampler(in_rate, out_rate, channels=channels)
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal((int(in_rate * seconds), channels)).astype(np.float32) * 0.1
+    start = time.process_time()
+    for i in range(0, len(audio), block_size):
+        resampler.process(audio[i : i + block_size])
+    return (time.process_time() - start) / seconds
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the streaming resampler.")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--out-rate", type=int, default=16_000)
+    args = parser.parse_args(argv)
+
+    for in_rate in (48_000, 44_100, 16_000):
+        for channels in (1, 2):
+            block = int(in_rate * 0.03)
+            cost = benchmark(in_rate, args.out_rate, channels, block, args.seconds)
+            print(f"{in_rate:>6} Hz x{channels} -> {args.out_rate} Hz: {cost * 1000:.2f} ms CPU per audio-second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import abc
+import queue
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from local_translator.src.audio.resampler import PolyphaseResampler
+from local_translator.src.utils.logger import get_logger
+
+
+class AudioSource(abc.ABC):
+    """
+    Anything that pushes mono float32 frames of block_size samples at sample_rate
+    into audio_queue. The pipeline only depends on this interface.
+    """
+
+    sample_rate: int
+    block_size: int
+    audio_queue: queue.Queue
+    dropped_frames: int = 0
+
+    @abc.abstractmethod
+    def start(self) -> None:
+        """
+        Start producing frames.
+        """
+
+    @abc.abstractmethod
+    def stop(self) -> None:
+        """
+        Stop producing frames and release resources.
+        """
+
+    def frame_time(self, index: int) -> Optional[float]:
+        """
+        Capture time (time.perf_counter) of the first sample of the index-th
+        queued frame, or None when the source has no capture clock.
+        """
+        return None
+
+
+def read_wav(path: Path) -> tuple[int, np.ndarray]:
+    """
+    Read a PCM WAV file as float32 in [-1, 1], shaped (frames, channels).
+    """
+    with wave.open(str(path), "rb") as wf:
+        sample_rate = wf.getframerate()
+        channels = wf.getnchannels()
+        sampwidth = wf.getsampwidth()
+        audio_bytes = wf.readframes(wf.getnframes())
+
+    if sampwidth == 1:
+        data = (np.frombuffer(audio_bytes, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sampwidth == 2:
+        data = np.frombuffer(audio_bytes, dtype="<i2").astype(np.float32) / 32768.0
+    elif sampwidth == 4:
+        data = np.frombuffer(audio_bytes, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width: {sampwidth}")
+    return sample_rate, data.reshape(-1, channels)
+
+
+class FileAudioSource(AudioSource):
+    """
+    Replays WAV files into the audio queue as if they came from a microphone.
+
+    speed=1.0 paces frames in real time, speed=N runs N times faster and
+    speed=0 pushes as fast as the consumer accepts them. Paced runs drop frames
+    on a full queue (like the microphone does); unpaced runs apply backpressure.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[Path],
+        sample_rate: int,
+        block_size: int,
+        audio_queue: Optional[queue.Queue] = None,
+        speed: float = 1.0,
+        loop: bool = False,
+        max_duration: Optional[float] = None,
+    ) -> None:
+        if not paths:
+            raise ValueError("FileAudioSource needs at least one WAV file")
+        self.paths = [Path(p) for p in paths]
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.audio_queue = audio_queue or queue.Queue(maxsize=100)
+        self.speed = speed
+        self.loop = loop
+        self.max_duration = max_duration
+        self.dropped_frames = 0
+        self.frames_emitted = 0
+        self.finished = threading.Event()
+        self._clips = [self._load(p) for p in self.paths]
+        self._thread: Optional[threading.Thread] = None
+        self._running = threading.Event()
+        self._log = get_logger(__name__)
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.frames_emitted * self.block_size / self.sample_rate
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._running.set()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._log.info(
+            "File audio source started (%d file(s), speed=%s, loop=%s)",
+            len(self._clips),
+            self.speed or "max",
+            self.loop,
+        )
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self._thread = None
+        self._log.info("File audio source stopped")
+
+    def _load(self, path: Path) -> np.ndarray:
+        rate, data = read_wav(path)
+        resampler = PolyphaseResampler(rate, self.sample_rate, channels=data.shape[1])
+        audio = resampler.process(data)
+        # Pad to whole frames so every pushed frame has block_size samples.
+        pad = (-len(audio)) % self.block_size
+        return np.pad(audio, (0, pad)).astype(np.float32)
+
+    def _frames(self):
+        while True:
+            for clip in self._clips:
+                for offset in range(0, len(clip), self.block_size):
+                    yield clip[offset : offset + self.block_size]
+            if not self.loop:
+                return
+
+    def _run(self) -> None:
+        frame_duration = self.block_size / self.sample_rate
+        period = frame_duration / self.speed if self.speed > 0 else 0.0
+        next_deadline = time.perf_counter()
+        try:
+            for frame in self._frames():
+                if not self._running.is_set():
+                    return
+                if self.max_duration is not None and self.audio_seconds >= self.max_duration:
+                    return
+                if period:
+                    try:
+                        self.audio_queue.put_nowait(frame.copy())
+                    except queue.Full:
+                        self.dropped_frames += 1
+                    next_deadline += period
+                    delay = next_deadline - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                else:
+                    while self._running.is_set():
+                        try:
+                            self.audio_queue.put(frame.copy(), timeout=0.5)
+                            break
+                        except queue.Full:
+                            continue
+                self.frames_emitted += 1
+        finally:
+            self.finished.set()
@@ -0,0 +1,2 @@
+"""Scheduling and orchestration between the audio front-end and the models."""
+
@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Optional, Union
+
+import numpy as np
+
+from local_translator.src.audio.denoise import denoiser_from_settings
+from local_translator.src.translation.streaming import aiter_clauses, aiterate
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.disfluency import DisfluencyFilter
+from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.types import TranscriptionResult
+from local_translator.src.vad.energy_gate import EnergyGate
+from local_translator.src.vad.segmenter import SpeechSegmenter
+from local_translator.src.vad.silero_vad import SileroVAD
+
+
+@dataclass(frozen=True)
+class TranslatorEvent:
+    segment_id: int
+
+
+@dataclass(frozen=True)
+class SpeechStarted(TranslatorEvent):
+    time: float  # seconds of input audio consumed when speech was detected
+
+
+@dataclass(frozen=True)
+class SpeechEnded(TranslatorEvent):
+    time: float
+    duration: float  # seconds of speech in the segment
+
+
+@dataclass(frozen=True)
+class PartialTranscript(TranslatorEvent):
+    text: str
+
+
+@dataclass(frozen=True)
+class FinalTranscript(TranslatorEvent):
+    text: str
+    language: str
+    truncated: bool = False
+
+
+@dataclass(frozen=True)
+class PartialTranslation(TranslatorEvent):
+    text: str  # one clause, in order
+
+
+@dataclass(frozen=True)
+class FinalTranslation(TranslatorEvent):
+    text: str
+
+
+@dataclass(frozen=True)
+class AudioChunk(TranslatorEvent):
+    pcm: np.ndarray = field(repr=False)  # int16 mono
+    sample_rate: int
+
+
+@dataclass(frozen=True)
+class SegmentFailed(TranslatorEvent):
+    error: str
+
+
+Event = Union[
+    SpeechStarted,
+    SpeechEnded,
+    PartialTranscript,
+    FinalTranscript,
+    PartialTranslation,
+    FinalTranslation,
+    AudioChunk,
+    SegmentFailed,
+]
+
+_END = object()
+
+
+class AsyncTranslator:
+    """
+    asyncio front end for the VAD -> STT -> MT (-> TTS) chain:
+
+        async for event in translator.stream(audio_chunks):
+            ...
+
+    audio_chunks is any async iterable of mono float32 arrays at sample_rate,
+    of any length. Each stream() call is an independent session (its own VAD
+    state and segmenter) and runs as two tasks on the caller's loop: capture/VAD
+    and segment processing, so speech keeps being segmented while an earlier
+    segment is translated. No threads are created per session: blocking model
+    calls go to one dedicated executor per stage, shared by all sessions, which
+    also serializes access to each model. Cancelling the consuming task, or
+    leaving the `async for` early, cancels both tasks; a model call already
+    running finishes in its executor and its result is discarded.
+    """
+
+    def __init__(
+        self,
+        stt: Any,
+        translator: Any,
+        tts: Any = None,
+        sample_rate: int = settings.sample_rate,
+        block_size: int = settings.block_size,
+        max_silence: float = settings.max_silence_after_speech,
+        partial_interval: Optional[float] = None,
+        vad_factory: Optional[Callable[[], SileroVAD]] = None,
+        energy_gate: bool = settings.energy_gate,
+        strip_disfluencies: bool = settings.strip_disfluencies,
+    ) -> None:
+        self.stt = stt
+        self.translator = translator
+        self.tts = tts
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.max_silence = max_silence
+        self.partial_interval = partial_interval
+        self.vad_factory = vad_factory or (
+            lambda: SileroVAD(sample_rate=sample_rate, threshold=settings.vad_threshold)
+        )
+        self.energy_gate = energy_gate
+        self.disfluency = DisfluencyFilter() if strip_disfluencies else None
+        self._log = get_logger(__name__)
+        self._vad_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="async-vad")
+        self._stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-stt")
+        self._mt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-mt")
+        self._tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-tts")
+
+    @classmethod
+    def from_settings(cls, speak: bool = False, **kwargs: Any) -> "AsyncTranslator":
+        """
+        Load the models the way the pipeline does (calibrated profile, TTS cache).
+        """
+        from local_translator.src.pipeline.calibration import select_profile
+        from local_translator.src.stt.faster_whisper_stt import FasterWhisperSTT
+        from local_translator.src.translation.helsinki_translator import HelsinkiTranslator
+
+        profile = select_profile()
+        stt = FasterWhisperSTT(
+            model_size=profile.whisper_model_size,
+            device=profile.whisper_device,
+            compute_type=profile.whisper_compute_type,
+        )
+        translator = HelsinkiTranslator(
+            model_name=profile.translation_model_name,
+            device=settings.translation_device,
+            num_beams=profile.translation_num_beams,
+        )
+        tts = None
+        if speak:
+            from local_translator.src.tts.cache import cache_from_settings
+            from local_translator.src.tts.piper_tts import PiperTTS
+
+            tts = PiperTTS(cache=cache_from_settings())
+            tts.preload(settings.tts_preload)
+        return cls(stt, translator, tts, **kwargs)
+
+    async def stream(self, chunks: AsyncIterable[np.ndarray]) -> AsyncIterator[Event]:
+        session = _Session(self)
+        events: asyncio.Queue = asyncio.Queue()
+        segments: asyncio.Queue = asyncio.Queue()
+        capture = asyncio.create_task(session.capture(chunks, segments, events))
+        process = asyncio.create_task(session.process(segments, events))
+        try:
+            while True:
+                event = await events.get()
+                if event is _END:
+                    break
+                if isinstance(event, BaseException):
+                    raise event
+                yield event
+        finally:
+            for task in (capture, process):
+                task.cancel()
+            await asyncio.gather(capture, process, return_exceptions=True)
+
+    async def translate_audio(self, audio: np.ndarray, segment_id: int = 0) -> AsyncIterator[Event]:
+        """
+        Events for one already segmented utterance (no VAD).
+        """
+        async for event in self._process_segment(segment_id, audio, None):
+            yield event
+
+    def close(self) -> None:
+        for executor in (self._vad_executor, self._stt_executor, self._mt_executor, self._tts_executor):
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _process_segment(
+        self, segment_id: int, audio: np.ndarray, features: Optional[np.ndarray]
+    ) -> AsyncIterator[Event]:
+        loop = asyncio.get_running_loop()
+        try:
+            transcription: TranscriptionResult
+            if features is not None:
+                transcription = await loop.run_in_executor(
+                    self._stt_executor, self.stt.transcribe_features, audio, features
+                )
+            else:
+                transcription = await loop.run_in_executor(self._stt_executor, self.stt.transcribe, audio)
+            yield FinalTranscript(segment_id, transcription.text, transcription.language, transcription.truncated)
+            text = transcription.text.strip()
+            if self.disfluency is not None:
+                text = self.disfluency.clean(text, transcription.language)
+            if not text:
+                return
+
+            if hasattr(self.translator, "translate_stream"):
+                pieces = aiterate(self.translator.translate_stream(text), self._mt_executor)
+                clauses = []
+                async for clause in aiter_clauses(pieces):
+                    clauses.append(clause)
+                    yield PartialTranslation(segment_id, clause)
+                    async for event in self._speak(segment_id, clause):
+                        yield event
+                yield FinalTranslation(segment_id, " ".join(clauses))
+            else:
+                translation = await loop.run_in_executor(
+                    self._mt_executor, self.translator.translate, text
+                )
+                yield FinalTranslation(segment_id, translation)
+                async for event in self._speak(segment_id, translation):
+                    yield event
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._log.error("Segment %d failed: %s", segment_id, exc)
+            yield SegmentFailed(segment_id, f"{type(exc).__name__}: {exc}")
+
+    async def _speak(self, segment_id: int, text: str) -> AsyncIterator[AudioChunk]:
+        tts = self.tts
+        if tts is None or not text:
+            return
+        async for pcm in aiterate(tts.synthesize_stream(text), self._tts_executor):
+            yield AudioChunk(segment_id, pcm, tts.sample_rate)
+
+
+class _Session:
+    def __init__(self, owner: AsyncTranslator) -> None:
+        self.owner = owner
+        self._log = owner._log
+        self.features = None
+        if getattr(owner.stt, "accepts_features", False) and settings.streaming_features:
+            from local_translator.src.stt.features import StreamingLogMel
+
+            self.features = StreamingLogMel(n_mels=owner.stt.n_mels)
+        self.segmenter = SpeechSegmenter(
+            owner.vad_factory(),
+            frame_duration=owner.block_size / owner.sample_rate,
+            max_silence=owner.max_silence,
+            energy_gate=EnergyGate(margin_db=settings.energy_gate_margin_db) if owner.energy_gate else None,
+            lookback_frames=settings.gate_lookback_frames,
+            features=self.features,
+            denoiser=denoiser_from_settings(),
+        )
+        self.samples = 0
+        self.next_id = 0
+        self.announced = False
+        self._partial: Optional[asyncio.Task] = None
+        self._partial_at = 0
+
+    @property
+    def now(self) -> float:
+        return self.samples / self.owner.sample_rate
+
+    async def capture(self, chunks: AsyncIterable[np.ndarray], segments: asyncio.Queue, events: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        block = self.owner.block_size
+        carry = np.zeros(0, dtype=np.float32)
+        try:
+            async for chunk in chunks:
+                carry = np.concatenate((carry, np.asarray(chunk, dtype=np.float32).reshape(-1)))
+                usable = len(carry) - len(carry) % block
+                if not usable:
+                    continue
+                frames = list(carry[:usable].reshape(-1, block))
+                carry = carry[usable:]
+                done = await loop.run_in_executor(self.owner._vad_executor, self.segmenter.push_with_features, frames)
+                self.samples += usable
+                self._announce(done, segments, events)
+                self._maybe_partial(events)
+            if len(carry):
+                frame = np.pad(carry, (0, block - len(carry)))
+                done = await loop.run_in_executor(self.owner._vad_executor, self.segmenter.push_with_features, [frame])
+                self.samples += len(carry)
+                self._announce(done, segments, events)
+            audio, features = self.segmenter.flush_with_features()
+            if audio is not None:
+                self._announce([(audio, features)], segments, events)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await events.put(exc)
+        finally:
+            await segments.put(_END)
+
+    def _announce(self, done: list, segments: asyncio.Queue, events: asyncio.Queue) -> None:
+        for audio, features in done:
+            if not self.announced:
+                events.put_nowait(SpeechStarted(self.next_id, self.now))
+            duration = len(audio) / self.owner.sample_rate
+            events.put_nowait(SpeechEnded(self.next_id, self.now, duration))
+            segments.put_nowait((self.next_id, audio, features))
+            self.next_id += 1
+            self.announced = False
+        if self.segmenter.active and not self.announced:
+            events.put_nowait(SpeechStarted(self.next_id, self.now))
+            self.announced = True
+            self._partial_at = self.samples
+
+    def _maybe_partial(self, events: asyncio.Queue) -> None:
+        interval = self.owner.partial_interval
+        if interval is None or not self.segmenter.active:
+            return
+        if self._partial is not None and not self._partial.done():
+            return  # at most one partial decode in flight per session
+        if self.samples - self._partial_at < interval * self.owner.sample_rate:
+            return
+        audio = self.segmenter.current_audio()
+        if audio is None:
+            return
+        self._partial_at = self.samples
+        self._partial = asyncio.create_task(self._run_partial(self.next_id, audio, events))
+
+    async def _run_partial(self, segment_id: int, audio: np.ndarray, events: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.owner._stt_executor, self.owner.stt.transcribe, audio)
+        except Exception as exc:
+            self._log.warning("Partial transcript failed: %s", exc)
+            return
+        # A partial that finishes after its segment closed is stale.
+        if segment_id == self.next_id and self.segmenter.active and result.text:
+            events.put_nowait(PartialTranscript(segment_id, result.text))
+
+    async def process(self, segments: asyncio.Queue, events: asyncio.Queue) -> None:
+        try:
+            while True:
+                item = await segments.get()
+                if item is _END:
+                    break
+                async for event in self.owner._process_segment(*item):
+                    await events.put(event)
+        finally:
+            if self._partial is not None:
+                self._partial.cancel()
+            await events.put(_END)
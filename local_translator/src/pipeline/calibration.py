@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import hashlib
+import json
+import os
+import platform
+import statistics
+import time
+import wave
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from local_translator.src.audio.resampler import PolyphaseResampler
+from local_translator.src.audio.source import read_wav
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.logger import get_logger
+
+CACHE_NAME = "calibration.json"
+CLIP_NAME = "calibration_es.wav"
+CALIBRATION_TEXT = (
+    "Buenos días a todos. Hoy vamos a revisar los resultados del último trimestre "
+    "y a decidir los próximos pasos del proyecto."
+)
+
+# Most accurate first; the first candidate that fits the budget wins.
+STT_CANDIDATES = {
+    "cuda": [
+        ("small", "float16"),
+        ("small", "int8_float16"),
+        ("base", "float16"),
+        ("base", "int8"),
+        ("tiny", "int8"),
+    ],
+    "cpu": [
+        ("small", "int8"),
+        ("base", "int8"),
+        ("tiny", "int8"),
+    ],
+}
+MT_BEAMS = (4, 2, 1)
+VERSIONED_PACKAGES = ("faster-whisper", "ctranslate2", "transformers", "torch")
+
+log = get_logger(__name__)
+
+
+@dataclass
+class Profile:
+    whisper_model_size: str
+    whisper_compute_type: str
+    whisper_device: str
+    translation_num_beams: int
+    translation_model_name: str = settings.translation_model_name
+    stt_latency: float = 0.0  # seconds for the calibration clip
+    stt_rtf: float = 0.0
+    mt_latency: float = 0.0
+    calibrated: bool = False
+
+
+def default_profile() -> Profile:
+    """
+    The static configuration from settings, used when calibration is off or impossible.
+    """
+    return Profile(
+        whisper_model_size=settings.whisper_model_size,
+        whisper_compute_type=settings.whisper_compute_type,
+        whisper_device=settings.whisper_device,
+        translation_num_beams=settings.translation_num_beams,
+    )
+
+
+def cuda_available() -> bool:
+    try:
+        import ctranslate2
+
+        return ctranslate2.get_cuda_device_count() > 0
+    except Exception:
+        return False
+
+
+def host_fingerprint(budget: float) -> tuple[str, dict]:
+    """
+    Hash of everything that changes the measurement: hardware, library versions,
+    the candidate list and the budget. Returns (digest, details).
+    """
+    gpu = None
+    if cuda_available():
+        try:
+            import torch
+
+            gpu = torch.cuda.get_device_name(0)
+        except Exception:
+            gpu = "cuda"
+    versions = {}
+    for package in VERSIONED_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    details = {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "gpu": gpu,
+        "python": platform.python_version(),
+        "versions": versions,
+        "budget": round(budget, 3),
+        "candidates": STT_CANDIDATES,
+        "beams": MT_BEAMS,
+        "selection": "joint",  # profiles cached by the STT-first selection are re-measured
+    }
+    digest = hashlib.sha256(json.dumps(details, sort_keys=True).encode()).hexdigest()[:16]
+    return digest, details
+
+
+def load_clip(path: Path, sample_rate: int = 16_000) -> np.ndarray:
+    """
+    Calibration clip as mono float32 at sample_rate. If the WAV is missing it is
+    synthesized once with a Spanish Piper voice (models/piper/es_*.onnx).
+    """
+    if not path.is_file():
+        _synthesize_clip(path)
+    rate, data = read_wav(path)
+    mono = data.mean(axis=1).astype(np.float32)
+    if rate != sample_rate:
+        resampler = PolyphaseResampler(rate, sample_rate)
+        mono = np.concatenate((resampler.process(mono), resampler.process(np.zeros(rate // 10, np.float32))))
+    return mono
+
+
+def _synthesize_clip(path: Path) -> None:
+    voices = sorted((settings.models_dir / "piper").glob("es_*.onnx"))
+    if not voices:
+        raise FileNotFoundError(
+            f"No calibration clip at {path} and no Spanish Piper voice to synthesize one; "
+            "record a few seconds of Spanish speech into that file"
+        )
+    from local_translator.src.tts.piper_tts import PiperTTS
+
+    tts = PiperTTS(model_name=voices[0].name)
+    pcm = tts.synthesize(CALIBRATION_TEXT)
+    if not pcm.size:
+        raise FileNotFoundError(f"Piper produced no audio for the calibration clip ({voices[0].name})")
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(tts.sample_rate)
+        wf.writeframes(pcm.astype("<i2").tobytes())
+    log.info("Synthesized calibration clip %s with %s", path, voices[0].name)
+
+
+def _timed(fn, runs: int) -> tuple[float, object]:
+    result = fn()  # warm-up: first call pays for CUDA kernels / allocator growth
+    durations = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations), result
+
+
+def calibrate(clip: np.ndarray, budget: float, sample_rate: int = 16_000, runs: int = 3) -> Profile:
+    """
+    Measure candidates on this host and return the most accurate profile whose
+    STT + MT latency for the clip fits in budget. The clip should be about as
+    long as a typical segment (a few seconds). Whisper accuracy comes first:
+    a size is only taken if it still fits with greedy MT, and then the widest
+    beam that fits is used. Falls back to the fastest Whisper configuration
+    that loaded, with greedy MT, when nothing fits.
+    """
+    from local_translator.src.stt.faster_whisper_stt import FasterWhisperSTT
+    from local_translator.src.translation.helsinki_translator import HelsinkiTranslator
+
+    device = "cuda" if cuda_available() else "cpu"
+    duration = len(clip) / sample_rate
+    translator = HelsinkiTranslator(device=device)
+    mt_latencies: dict[int, float] = {}
+    mt_text = CALIBRATION_TEXT
+
+    def mt_latency(beams: int) -> float:
+        # Measured once per beam width, on the first transcription of the clip.
+        if beams not in mt_latencies:
+            translator.num_beams = beams
+            mt_latencies[beams], _ = _timed(lambda: translator.translate(mt_text), runs)
+            log.info("MarianMT beams=%d: %.3fs", beams, mt_latencies[beams])
+        return mt_latencies[beams]
+
+    chosen: Optional[tuple[str, str, float]] = None
+    fastest: Optional[tuple[str, str, float]] = None
+    for size, compute in STT_CANDIDATES[device]:
+        try:
+            stt = FasterWhisperSTT(model_size=size, device=device, compute_type=compute)
+            latency, result = _timed(lambda: stt.transcribe(clip), runs)
+        except Exception as exc:
+            log.warning("Skipping Whisper %s/%s: %s", size, compute, exc)
+            continue
+        finally:
+            stt = None
+            gc.collect()
+        log.info(
+            "Whisper %s/%s on %s: %.3fs for %.1fs audio (RTF %.2f)",
+            size,
+            compute,
+            device,
+            latency,
+            duration,
+            latency / duration,
+        )
+        if not mt_latencies and result.text:
+            mt_text = result.text
+        candidate = (size, compute, latency)
+        if fastest is None or latency < fastest[2]:
+            fastest = candidate
+        if latency + mt_latency(MT_BEAMS[-1]) <= budget:
+            chosen = candidate
+            break
+
+    if chosen is None:
+        if fastest is None:
+            raise RuntimeError("No Whisper configuration could be loaded for calibration")
+        log.warning("No Whisper configuration meets %.2fs with greedy MT; using the fastest one", budget)
+        chosen = fastest
+    size, compute, stt_latency = chosen
+
+    for beams in MT_BEAMS:
+        if stt_latency + mt_latency(beams) <= budget:
+            break
+    translator = None
+    gc.collect()
+
+    return Profile(
+        whisper_model_size=size,
+        whisper_compute_type=compute,
+        whisper_device=device,
+        translation_num_beams=beams,
+        stt_latency=stt_latency,
+        stt_rtf=stt_latency / duration,
+        mt_latency=mt_latency(beams),
+        calibrated=True,
+    )
+
+
+def select_profile(force: bool = False, clip_path: Optional[Path] = None) -> Profile:
+    """
+    Profile for this host: from the per-fingerprint cache when available,
+    otherwise calibrated now and cached. Returns the static settings profile
+    when auto_profile is off or calibration cannot run.
+    """
+    if not settings.auto_profile and not force:
+        return default_profile()
+
+    budget = settings.latency_budget * settings.calibration_headroom
+    cache_path = settings.models_dir / CACHE_NAME
+    fingerprint, details = host_fingerprint(budget)
+    try:
+        cache = json.loads(cache_path.read_text()) if cache_path.is_file() else {}
+    except (OSError, ValueError):
+        cache = {}
+    if not force and fingerprint in cache:
+        profile = Profile(**cache[fingerprint]["profile"])
+        log.info(
+            "Using cached profile %s/%s, beams=%d",
+            profile.whisper_model_size,
+            profile.whisper_compute_type,
+            profile.translation_num_beams,
+        )
+        return profile
+
+    try:
+        clip = load_clip(clip_path or settings.models_dir / CLIP_NAME)
+        log.info("Calibrating models for this host (budget %.2fs per segment)...", budget)
+        profile = calibrate(clip, budget)
+    except Exception as exc:
+        log.warning("Calibration skipped (%s); using configured models", exc)
+        return default_profile()
+
+    cache[fingerprint] = {
+        "profile": asdict(profile),
+        "host": details,
+        "measured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    cache_path.write_text(json.dumps(cache, indent=2) + "\n")
+    log.info(
+        "Selected profile %s/%s, beams=%d (STT %.2fs, MT %.2fs)",
+        profile.whisper_model_size,
+        profile.whisper_compute_type,
+        profile.translation_num_beams,
+        profile.stt_latency,
+        profile.mt_latency,
+    )
+    return profile
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pick Whisper/MT settings from measured speed on this host.")
+    parser.add_argument("--force", action="store_true", help="Re-measure even if a cached profile exists")
+    parser.add_argument("--clip", type=Path, help=f"Spanish WAV to measure with (default models/{CLIP_NAME})")
+    args = parser.parse_args(argv)
+
+    profile = select_profile(force=args.force, clip_path=args.clip)
+    for key, value in asdict(profile).items():
+        print(f"{key:<24} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterable, Optional
+
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.types import TranscriptionResult
+
+
+class LanguageTracker:
+    """
+    Remembers the spoken language for the current speaker turn so Whisper
+    detects it once per turn rather than on every segment.
+
+    A turn is a run of segments that start less than `turn_gap` seconds after
+    the previous one closed. The first segment of a turn is transcribed with
+    detection (restricted to `languages`); if the detected language reaches
+    `threshold` it is cached and the rest of the turn is decoded with it,
+    otherwise the next segment detects again. A cached decode that looks
+    wrong (see confirm) also drops the cache, so a switch of language inside
+    a turn costs one extra decode rather than the rest of the turn.
+    """
+
+    def __init__(
+        self,
+        languages: Iterable[str] = settings.conversation_languages,
+        threshold: float = settings.language_confidence,
+        turn_gap: float = settings.language_turn_gap,
+        recheck_logprob: float = settings.language_recheck_logprob,
+        recheck_no_speech: float = settings.language_recheck_no_speech,
+    ) -> None:
+        self.languages = tuple(languages)
+        if len(self.languages) < 2:
+            raise ValueError("Language detection needs at least two conversation languages")
+        self.threshold = threshold
+        self.turn_gap = turn_gap
+        self.recheck_logprob = recheck_logprob
+        self.recheck_no_speech = recheck_no_speech
+        self.detections = 0
+        self.cache_hits = 0
+        self.rechecks = 0
+        self._log = get_logger(__name__)
+        self._language: Optional[str] = None
+        self._last_end = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def language(self) -> Optional[str]:
+        return self._language
+
+    def language_for(self, start: float) -> Optional[str]:
+        """
+        Cached language for a segment starting at `start` (monotonic seconds),
+        or None when it has to be detected.
+        """
+        with self._lock:
+            if self._language is not None and start - self._last_end <= self.turn_gap:
+                self.cache_hits += 1
+                return self._language
+            if self._language is not None:
+                self._log.debug("New speaker turn after %.1fs; detecting language again", start - self._last_end)
+            self._language = None
+            self.detections += 1
+            return None
+
+    def confirm(self, result: TranscriptionResult) -> bool:
+        """
+        Check a segment decoded with the cached language. A poor decode (low
+        avg_logprob or high no_speech_prob) drops the cache and returns False:
+        the caller should decode the segment again with detection.
+        """
+        if not result.text:
+            return True
+        if result.avg_logprob >= self.recheck_logprob and result.no_speech_prob <= self.recheck_no_speech:
+            return True
+        with self._lock:
+            self._language = None
+            self.rechecks += 1
+            self.detections += 1
+        self._log.info(
+            "Poor decode as '%s' (logprob %.2f, no-speech %.2f); detecting language again",
+            result.language,
+            result.avg_logprob,
+            result.no_speech_prob,
+        )
+        return False
+
+    def observe(self, language: str, probability: float, end: float) -> None:
+        """
+        Record a transcribed segment: extends the turn, and caches a detection
+        confident enough to be reused.
+        """
+        with self._lock:
+            self._last_end = max(self._last_end, end)
+            if self._language is None and language in self.languages and probability >= self.threshold:
+                self._language = language
+                self._log.info("Speaker turn in '%s' (p=%.2f)", language, probability)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._language = None
+            self._last_end = float("-inf")
+
+    def other(self, language: str) -> str:
+        """
+        The conversation language to translate `language` into (bidirectional mode).
+        """
+        for candidate in self.languages:
+            if candidate != language:
+                return candidate
+        return language
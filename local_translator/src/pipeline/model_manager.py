@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import gc
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Optional, Union
+
+from local_translator.src.pipeline.calibration import STT_CANDIDATES, Profile
+from local_translator.src.utils.logger import get_logger
+
+
+@dataclass
+class ModelSet:
+    profile: Profile
+    stt: Any
+    translator: Any
+
+
+def build_ladder(profile: Profile) -> list[Profile]:
+    """
+    Quality levels from `profile` downwards: first greedy MT instead of beam
+    search (no reload), then each smaller Whisper size for the device.
+    """
+    ladder = [profile]
+    current = profile
+    if current.translation_num_beams > 1:
+        current = dataclasses.replace(current, translation_num_beams=1, calibrated=False)
+        ladder.append(current)
+    candidates = STT_CANDIDATES.get(profile.whisper_device, STT_CANDIDATES["cpu"])
+    sizes = [size for size, _ in candidates]
+    seen = {profile.whisper_model_size}
+    start = sizes.index(profile.whisper_model_size) if profile.whisper_model_size in sizes else -1
+    for size, compute in candidates[start + 1 :]:
+        if size in seen:
+            continue
+        seen.add(size)
+        current = dataclasses.replace(current, whisper_model_size=size, whisper_compute_type=compute)
+        ladder.append(current)
+    return ladder
+
+
+def release_models(*models: Any) -> None:
+    """
+    Stop worker-backed engines and return freed GPU memory to the driver.
+    """
+    # A worker process can serve as both STT and MT; stop it once.
+    for model in {id(m): m for m in models}.values():
+        stop = getattr(model, "stop", None)
+        if callable(stop):
+            stop()
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+class ModelManager:
+    """
+    Owns the active STT/MT engines and swaps them at runtime.
+
+    Replacements are built on a background thread while the current models keep
+    serving; the swap happens in `current()`, which the pipeline calls once per
+    segment, so a segment never mixes models. The manager watches the real-time
+    factor over a sliding window of processed audio and moves one level down
+    the ladder when it stays above downgrade_rtf, and one level up when it stays
+    below upgrade_rtf. `downgrade()`, `upgrade()` and `switch_to()` are the
+    manual hooks.
+    """
+
+    def __init__(
+        self,
+        ladder: list[Profile],
+        build: Callable[[Profile, Optional[ModelSet]], ModelSet],
+        level: int = 0,
+        window_seconds: float = 30.0,
+        downgrade_rtf: float = 1.0,
+        upgrade_rtf: float = 0.5,
+        cooldown: float = 60.0,
+        auto: bool = True,
+    ) -> None:
+        self.ladder = ladder
+        self.build = build
+        self.level = level
+        self.window_seconds = window_seconds
+        self.downgrade_rtf = downgrade_rtf
+        self.upgrade_rtf = upgrade_rtf
+        self.cooldown = cooldown
+        self.auto = auto
+        self.swaps = 0
+        self.listeners: list[Callable[[ModelSet], None]] = []
+        self._log = get_logger(__name__)
+        self._lock = threading.Lock()
+        self._window: Deque[tuple[float, float]] = collections.deque()  # (audio_s, processing_s)
+        self._last_change = time.monotonic()
+        self._loading: Optional[threading.Thread] = None
+        self._pending: Optional[tuple[int, ModelSet]] = None
+        self._active = build(ladder[level], None)
+
+    @property
+    def profile(self) -> Profile:
+        return self._active.profile
+
+    @property
+    def loading(self) -> bool:
+        """
+        True while a replacement is loading or loaded but not yet swapped in.
+        """
+        return (self._loading is not None and self._loading.is_alive()) or self._pending is not None
+
+    def current(self) -> ModelSet:
+        """
+        Models to use for the next segment; applies a finished background load.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, None
+            if pending is None:
+                return self._active
+            old = self._active
+            self.level, self._active = pending
+            self._window.clear()
+            self._last_change = time.monotonic()
+            self.swaps += 1
+            active = self._active
+        self._log.info(
+            "Swapped models -> level %d (Whisper %s/%s, beams=%d, %s)",
+            self.level,
+            active.profile.whisper_model_size,
+            active.profile.whisper_compute_type,
+            active.profile.translation_num_beams,
+            active.profile.translation_model_name,
+        )
+        in_use = (active.stt, active.translator)
+        release_models(*(m for m in (old.stt, old.translator) if all(m is not keep for keep in in_use)))
+        for listener in self.listeners:
+            listener(active)
+        return active
+
+    def observe(self, audio_seconds: float, processing_seconds: float) -> None:
+        """
+        Record one processed segment and change level if the load calls for it.
+        """
+        if audio_seconds <= 0:
+            return
+        with self._lock:
+            self._window.append((audio_seconds, processing_seconds))
+            audio = sum(a for a, _ in self._window)
+            while self._window and audio - self._window[0][0] >= self.window_seconds:
+                audio -= self._window.popleft()[0]
+            processing = sum(p for _, p in self._window)
+        if not self.auto or audio < self.window_seconds * 0.5:
+            return
+        if self.loading or time.monotonic() - self._last_change < self.cooldown:
+            return
+        rtf = processing / audio
+        if rtf > self.downgrade_rtf and self.level + 1 < len(self.ladder):
+            self._log.warning("Sustained RTF %.2f over %.0fs of audio; downgrading", rtf, audio)
+            self.downgrade()
+        elif rtf < self.upgrade_rtf and self.level > 0:
+            self._log.info("RTF %.2f leaves headroom; upgrading", rtf)
+            self.upgrade()
+
+    def downgrade(self) -> bool:
+        return self.switch_to(min(self.level + 1, len(self.ladder) - 1))
+
+    def upgrade(self) -> bool:
+        return self.switch_to(max(self.level - 1, 0))
+
+    def switch_to(self, target: Union[int, Profile]) -> bool:
+        """
+        Start loading a ladder level (or any Profile) in the background.
+        Returns False if it is already active or another switch is in progress.
+        """
+        if isinstance(target, Profile):
+            if target in self.ladder:
+                level = self.ladder.index(target)
+            else:
+                self.ladder.append(target)
+                level = len(self.ladder) - 1
+        else:
+            level = target
+        if level == self.level or self.loading:
+            return False
+        self._last_change = time.monotonic()
+        self._loading = threading.Thread(target=self._load, args=(level,), name="model-loader", daemon=True)
+        self._loading.start()
+        return True
+
+    def wait_until_loaded(self, timeout: Optional[float] = None) -> None:
+        if self._loading is not None:
+            self._loading.join(timeout)
+
+    def close(self) -> None:
+        self.wait_until_loaded()
+        with self._lock:
+            sets = [self._active] + ([self._pending[1]] if self._pending else [])
+            self._pending = None
+        release_models(*(m for s in sets for m in (s.stt, s.translator)))
+
+    def _load(self, level: int) -> None:
+        profile = self.ladder[level]
+        self._log.info(
+            "Loading level %d in the background (Whisper %s/%s, beams=%d)",
+            level,
+            profile.whisper_model_size,
+            profile.whisper_compute_type,
+            profile.translation_num_beams,
+        )
+        started = time.perf_counter()
+        try:
+            models = self.build(profile, self._active)
+        except Exception as exc:
+            self._log.error("Could not load level %d: %s", level, exc)
+            return
+        with self._lock:
+            self._pending = (level, models)
+        self._log.info("Level %d ready in %.1fs; swapping at the next segment", level, time.perf_counter() - started)
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import socket
+import socketserver
+import struct
+import threading
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.profiler import profiler
+from local_translator.src.utils.types import TranscriptionResult
+
+# Frame: 4-byte big-endian header length, JSON header, then header["payload_bytes"] raw bytes.
+_LENGTH = struct.Struct("!I")
+MAX_HEADER_BYTES = 1 << 20
+MAX_PAYLOAD_BYTES = int(settings.remote_max_payload_mb * (1 << 20))
+
+
+class RemoteError(RuntimeError):
+    """The worker answered, but the job itself failed (not retried elsewhere)."""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_frame(sock: socket.socket, header: dict, payload: bytes = b"") -> None:
+    header = dict(header, payload_bytes=len(payload))
+    encoded = json.dumps(header).encode("utf-8")
+    sock.sendall(_LENGTH.pack(len(encoded)) + encoded + payload)
+
+
+def recv_frame(sock: socket.socket, max_payload: int = MAX_PAYLOAD_BYTES) -> tuple[dict, bytes]:
+    (length,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    if length > MAX_HEADER_BYTES:
+        raise ConnectionError(f"header of {length} bytes refused")
+    header = json.loads(_recv_exact(sock, length))
+    size = header.get("payload_bytes", 0)
+    # Checked before reading: a bogus length must not make us buffer gigabytes.
+    if not isinstance(size, int) or not 0 <= size <= max_payload:
+        raise ConnectionError(f"payload of {size!r} bytes refused (limit {max_payload})")
+    payload = _recv_exact(sock, size)
+    return header, payload
+
+
+class WorkerServer(socketserver.ThreadingTCPServer):
+    """
+    Serves an STT engine (and optionally a translator) over framed TCP.
+
+    Ops: "stt" (float32 PCM payload), "mt" (header text), "ping" (health and
+    load). Every answer carries the worker's current queue length so clients
+    can balance on it. Model calls are serialized: one engine, one job at a time.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], stt: Any, translator: Any = None) -> None:
+        self.stt = stt
+        self.translator = translator
+        self.queued = 0
+        self.served = 0
+        self._model_lock = threading.Lock()
+        self._count_lock = threading.Lock()
+        self._log = get_logger(__name__)
+        super().__init__(address, _WorkerHandler)
+
+    def run_job(self, header: dict, payload: bytes) -> dict:
+        op = header.get("op")
+        if op == "ping":
+            return {"capabilities": ["stt"] + (["mt"] if self.translator is not None else [])}
+        if op == "profile":
+            # Blocks this connection only; jobs on other connections are what gets sampled.
+            counts = profiler.capture(min(float(header.get("seconds", 5.0)), 60.0))
+            return {"collapsed": [f"{stack} {count}" for stack, count in counts.most_common()]}
+        with self._count_lock:
+            self.queued += 1
+        try:
+            with self._model_lock:
+                profiler.annotate(op, header.get("segment"))
+                if op == "stt":
+                    audio = np.frombuffer(payload, dtype="<f4")
+                    result = self.stt.transcribe(audio, header.get("language", settings.source_language), header.get("candidates", ()))
+                    return {
+                        "text": result.text,
+                        "language": result.language,
+                        "duration": result.duration,
+                        "truncated": result.truncated,
+                        "language_probability": result.language_probability,
+                        "avg_logprob": result.avg_logprob,
+                        "no_speech_prob": result.no_speech_prob,
+                    }
+                if op == "mt":
+                    if self.translator is None:
+                        raise ValueError("this worker has no translator")
+                    aborts = getattr(self.translator, "repetition_aborts", 0)
+                    text = self.translator.translate(header.get("text", ""))
+                    return {"text": text, "aborted": getattr(self.translator, "repetition_aborts", 0) > aborts}
+                raise ValueError(f"unknown op {op!r}")
+        finally:
+            profiler.annotate()
+            with self._count_lock:
+                self.queued -= 1
+                self.served += 1
+
+
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        server: WorkerServer = self.server  # type: ignore[assignment]
+        sock: socket.socket = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        while True:
+            try:
+                header, payload = recv_frame(sock)
+            except (ConnectionError, OSError, ValueError):
+                return
+            try:
+                answer = {"ok": True, "result": server.run_job(header, payload)}
+            except Exception as exc:
+                server._log.error("Job %s failed: %s", header.get("op"), exc)
+                answer = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            answer.update(id=header.get("id"), queue=server.queued)
+            try:
+                send_frame(sock, answer)
+            except OSError:
+                return
+
+    def finish(self) -> None:
+        # One thread per connection: drop its profiler labels when it ends.
+        profiler.unregister()
+
+
+class RemoteNode:
+    """
+    Client side of one worker: a persistent connection used for one request at a time.
+    """
+
+    def __init__(self, address: str, timeout: float = 30.0) -> None:
+        host, _, port = address.rpartition(":")
+        self.address = address
+        self.host = host or "127.0.0.1"
+        self.port = int(port)
+        self.timeout = timeout
+        self.healthy = False
+        self.capabilities: set[str] = set()
+        self.reported_queue = 0
+        self.inflight = 0
+        self.failures = 0
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+
+    @property
+    def load(self) -> int:
+        return self.reported_queue + self.inflight
+
+    def call(self, op: str, payload: bytes = b"", timeout: Optional[float] = None, **fields: Any) -> dict:
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+                    self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self._sock.settimeout(timeout or self.timeout)
+                request_id = next(self._ids)
+                send_frame(self._sock, dict(fields, op=op, id=request_id), payload)
+                header, _ = recv_frame(self._sock)
+                if header.get("id") != request_id:
+                    raise ConnectionError("out-of-order reply")
+            except (OSError, ValueError):
+                self.close()
+                raise
+        self.reported_queue = header.get("queue", 0)
+        if not header.get("ok"):
+            raise RemoteError(f"{self.address}: {header.get('error')}")
+        return header["result"]
+
+    def close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+
+class RemoteDispatcher:
+    """
+    Spreads segments over N worker nodes, offering the same `transcribe` /
+    `translate` calls as the local engines.
+
+    Each job goes to the healthy node with the shortest queue (as last
+    reported plus jobs we have in flight there). A background thread pings
+    every node; a node that fails a call or a ping is taken out until a ping
+    succeeds again, and the job is retried on another node.
+    """
+
+    def __init__(
+        self,
+        addresses: Sequence[str],
+        timeout: float = 30.0,
+        health_interval: float = 2.0,
+        retries: int = 2,
+    ) -> None:
+        if not addresses:
+            raise ValueError("RemoteDispatcher needs at least one worker address")
+        self.nodes = [RemoteNode(address, timeout=timeout) for address in addresses]
+        self.health_interval = health_interval
+        self.retries = retries
+        self.repetition_aborts = 0
+        self.retried = 0
+        self._log = get_logger(__name__)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        for node in self.nodes:
+            self._ping(node)
+        if not any(node.healthy for node in self.nodes):
+            self._log.warning("No remote worker reachable yet (%s)", ", ".join(addresses))
+        self._health = threading.Thread(target=self._health_loop, name="remote-health", daemon=True)
+        self._health.start()
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        language: Optional[str] = settings.source_language,
+        candidates: Sequence[str] = (),
+    ) -> TranscriptionResult:
+        payload = np.ascontiguousarray(audio, dtype="<f4").tobytes()
+        result = self._dispatch(
+            "stt", payload, language=language, candidates=list(candidates), segment=profiler.current_segment()
+        )
+        return TranscriptionResult(
+            text=result["text"],
+            language=result["language"],
+            duration=result["duration"],
+            truncated=result.get("truncated", False),
+            language_probability=result.get("language_probability", 1.0),
+            avg_logprob=result.get("avg_logprob", 0.0),
+            no_speech_prob=result.get("no_speech_prob", 0.0),
+        )
+
+    def translate(self, text: str) -> str:
+        if not text or not text.strip():
+            return ""
+        result = self._dispatch("mt", text=text, segment=profiler.current_segment())
+        self.repetition_aborts += bool(result.get("aborted"))
+        return result["text"]
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._health.join(timeout=self.health_interval + 1.0)
+        for node in self.nodes:
+            node.close()
+
+    def _pick(self, op: str, exclude: set[int]) -> Optional[RemoteNode]:
+        with self._lock:
+            candidates = [
+                node
+                for node in self.nodes
+                if node.healthy and op in node.capabilities and id(node) not in exclude
+            ]
+            if not candidates:
+                return None
+            node = min(candidates, key=lambda n: n.load)
+            node.inflight += 1
+            return node
+
+    def _dispatch(self, op: str, payload: bytes = b"", **fields: Any) -> dict:
+        tried: set[int] = set()
+        last_error: Optional[Exception] = None
+        for attempt in range(self.retries + 1):
+            node = self._pick(op, tried)
+            if node is None:
+                break
+            tried.add(id(node))
+            try:
+                return node.call(op, payload, **fields)
+            except RemoteError:
+                raise
+            except (OSError, ValueError) as exc:
+                last_error = exc
+                node.healthy = False
+                node.failures += 1
+                self.retried += 1
+                self._log.warning("Worker %s failed (%s); retrying elsewhere", node.address, exc)
+            finally:
+                with self._lock:
+                    node.inflight -= 1
+        raise ConnectionError(f"No remote worker could run {op!r}: {last_error or 'none healthy'}")
+
+    def _ping(self, node: RemoteNode) -> None:
+        was_healthy = node.healthy
+        try:
+            result = node.call("ping", timeout=min(node.timeout, 5.0))
+        except (OSError, ValueError, RemoteError):
+            node.healthy = False
+        else:
+            node.capabilities = set(result.get("capabilities", []))
+            node.healthy = True
+        if node.healthy != was_healthy:
+            self._log.info("Worker %s is %s", node.address, "up" if node.healthy else "down")
+
+    def _health_loop(self) -> None:
+        while not self._stop.wait(self.health_interval):
+            for node in self.nodes:
+                # Busy nodes answer pings only between jobs; their last call already proves them alive.
+                if node.inflight == 0 or not node.healthy:
+                    self._ping(node)
+
+
+def serve(host: str, port: int, with_translator: bool = True) -> None:
+    from local_translator.src.pipeline.calibration import select_profile
+    from local_translator.src.stt.faster_whisper_stt import FasterWhisperSTT
+    from local_translator.src.translation.helsinki_translator import HelsinkiTranslator
+
+    log = get_logger(__name__)
+    profile = select_profile()
+    stt = FasterWhisperSTT(
+        model_size=profile.whisper_model_size,
+        device=profile.whisper_device,
+        compute_type=profile.whisper_compute_type,
+    )
+    translator = None
+    if with_translator:
+        translator = HelsinkiTranslator(
+            model_name=profile.translation_model_name,
+            device=settings.translation_device,
+            num_beams=profile.translation_num_beams,
+        )
+    with WorkerServer((host, port), stt, translator) as server:
+        log.info("Worker listening on %s:%d (mt=%s)", host, port, with_translator)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run an STT/MT worker node.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--no-mt", action="store_true", help="Serve transcription only")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, with_translator=not args.no_mt)
+
+
+if __name__ == "__main__":
+    main()
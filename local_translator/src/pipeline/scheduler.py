@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import collections
+import threading
+import time
+from typing import Callable, Deque, Optional
+
+import numpy as np
+
+from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.profiler import profiler
+from local_translator.src.utils.types import Segment
+
+# Silence inserted between merged segments so Whisper still sees a pause.
+MERGE_GAP_SECONDS = 0.2
+
+
+class SegmentScheduler:
+    """
+    Deadline-aware queue between the segmenter and STT/MT.
+
+    Every segment gets a deadline (close time + latency budget). A single worker
+    processes segments in order and, using a running estimate of the processing
+    real-time factor, reacts when it falls behind:
+
+    - short queued segments are merged into one STT call (fewer fixed costs);
+    - segments that will finish past their deadline are translated but not
+      spoken (`speak=False`), so the text still appears;
+    - segments older than max_lag are dropped without processing (and handed
+      to on_drop, e.g. to archive their audio; it runs under the queue lock,
+      so it must not block).
+    """
+
+    def __init__(
+        self,
+        process: Callable[[Segment, bool], None],
+        sample_rate: int,
+        latency_budget: float = 3.0,
+        merge_short_seconds: float = 2.0,
+        merge_max_seconds: float = 8.0,
+        max_lag: float = 10.0,
+        initial_rtf: float = 0.3,
+        on_drop: Optional[Callable[[Segment], None]] = None,
+    ) -> None:
+        self.process = process
+        self.on_drop = on_drop
+        self.sample_rate = sample_rate
+        self.latency_budget = latency_budget
+        self.merge_short_seconds = merge_short_seconds
+        self.merge_max_seconds = merge_max_seconds
+        self.max_lag = max_lag
+        self.rtf = initial_rtf  # EWMA of processing seconds per audio second
+        self.merged = 0
+        self.dropped = 0
+        self.tts_skipped = 0
+        self.max_lag_seen = 0.0
+        self._log = get_logger(__name__)
+        self._queue: Deque[Segment] = collections.deque()
+        self._cond = threading.Condition()
+        self._next_id = 0
+        self._running = False
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="segment-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, drain: bool = True, timeout: float = 10.0) -> None:
+        """
+        Stop the worker. With drain=True queued segments are processed first.
+        """
+        if drain:
+            self.wait_until_idle(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def submit(self, audio: np.ndarray, features: Optional[np.ndarray] = None) -> Segment:
+        now = time.monotonic()
+        with self._cond:
+            segment = Segment(
+                id=self._next_id,
+                audio=audio,
+                duration=len(audio) / self.sample_rate,
+                closed_at=now,
+                deadline=now + self.latency_budget,
+                features=features,
+            )
+            self._next_id += 1
+            self._queue.append(segment)
+            self._cond.notify()
+        return segment
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def backlog_seconds(self) -> float:
+        """
+        Estimated time to clear the queue at the current real-time factor.
+        """
+        with self._cond:
+            return sum(s.duration for s in self._queue) * self.rtf
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        profiler.register("scheduler")
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                segment = self._next_segment()
+                self._busy = segment is not None
+            if segment is None:
+                continue
+
+            speak = time.monotonic() + segment.duration * self.rtf <= segment.deadline
+            if not speak:
+                self.tts_skipped += 1
+            started = time.perf_counter()
+            try:
+                self.process(segment, speak)
+            except Exception as exc:  # pragma: no cover - defensive
+                self._log.error("Segment %d failed: %s", segment.id, exc)
+            elapsed = time.perf_counter() - started
+            if segment.duration > 0:
+                self.rtf = 0.8 * self.rtf + 0.2 * (elapsed / segment.duration)
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def _next_segment(self) -> Optional[Segment]:
+        # Caller holds self._cond.
+        now = time.monotonic()
+        while self._queue and now - self._queue[0].closed_at > self.max_lag:
+            stale = self._queue.popleft()
+            self.dropped += 1
+            self._log.warning("Dropped segment %d (%.1fs old)", stale.id, now - stale.closed_at)
+            if self.on_drop is not None:
+                self.on_drop(stale)
+        if not self._queue:
+            self._cond.notify_all()
+            return None
+
+        head = self._queue.popleft()
+        self.max_lag_seen = max(self.max_lag_seen, now - head.closed_at)
+        if not self._overloaded(head, now):
+            return head
+
+        parts = [head]
+        total = head.duration
+        while (
+            self._queue
+            and parts[-1].duration < self.merge_short_seconds
+            and self._queue[0].duration < self.merge_short_seconds
+            and total + MERGE_GAP_SECONDS + self._queue[0].duration <= self.merge_max_seconds
+        ):
+            nxt = self._queue.popleft()
+            parts.append(nxt)
+            total += MERGE_GAP_SECONDS + nxt.duration
+        if len(parts) == 1:
+            return head
+
+        self.merged += len(parts) - 1
+        gap = np.zeros(int(MERGE_GAP_SECONDS * self.sample_rate), dtype=head.audio.dtype)
+        pieces = []
+        for part in parts:
+            if pieces:
+                pieces.append(gap)
+            pieces.append(part.audio)
+        self._log.info("Merged segments %d-%d under backlog", head.id, parts[-1].id)
+        return Segment(
+            id=head.id,
+            audio=np.concatenate(pieces),
+            duration=total,
+            closed_at=head.closed_at,
+            deadline=head.deadline,
+            parts=len(parts),
+        )  # no features: the merged audio (with gaps) is re-extracted by the STT engine
+
+    def _overloaded(self, head: Segment, now: float) -> bool:
+        # Would finishing everything queued behind head (at the current RTF) miss head's budget?
+        queued = head.duration + sum(s.duration for s in self._queue)
+        return now + queued * self.rtf > head.deadline
@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+import collections
+import itertools
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, Deque, Optional, Sequence
+
+import numpy as np
+
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.types import TranscriptionResult
+
+# Messages from a worker: (job_id, ok, payload). job_id READY/FATAL are control messages.
+READY = -1
+FATAL = -2
+
+
+class SharedAudioRing:
+    """
+    Fixed-size float32 ring in shared memory. The parent writes segments and
+    passes (offset, length) to the worker, so audio is never pickled. Space is
+    reclaimed in FIFO order when a segment is released.
+    """
+
+    def __init__(self, capacity: int, name: Optional[str] = None) -> None:
+        self.capacity = capacity
+        self._owner = name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=capacity * 4)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._buffer = np.ndarray((capacity,), dtype=np.float32, buffer=self._shm.buf)
+        self._head = 0
+        self._used = 0
+        self._live: Deque[list] = collections.deque()  # [offset, length, released]
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def write(self, audio: np.ndarray) -> tuple[int, int]:
+        samples = np.asarray(audio, dtype=np.float32).reshape(-1)
+        length = len(samples)
+        if length > self.capacity:
+            raise ValueError(f"Segment of {length} samples exceeds ring capacity {self.capacity}")
+        with self._lock:
+            if self.capacity - self._used < length:
+                raise BufferError("Shared audio ring is full; worker is not keeping up")
+            offset = self._head
+            first = min(length, self.capacity - offset)
+            self._buffer[offset : offset + first] = samples[:first]
+            self._buffer[: length - first] = samples[first:]
+            self._head = (offset + length) % self.capacity
+            self._used += length
+            self._live.append([offset, length, False])
+        return offset, length
+
+    def read(self, offset: int, length: int) -> np.ndarray:
+        """
+        Copy of a segment (the slot may be reused once it is released).
+        """
+        first = min(length, self.capacity - offset)
+        if first == length:
+            return self._buffer[offset : offset + length].copy()
+        return np.concatenate((self._buffer[offset:], self._buffer[: length - first]))
+
+    def release(self, offset: int) -> None:
+        with self._lock:
+            for entry in self._live:
+                if entry[0] == offset and not entry[2]:
+                    entry[2] = True
+                    break
+            while self._live and self._live[0][2]:
+                self._used -= self._live.popleft()[1]
+
+    def close(self) -> None:
+        self._buffer = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def build_engines(stt_kwargs: dict, translator_kwargs: Optional[dict]) -> tuple[Any, Any]:
+    """
+    Default engine factory, executed inside the worker process.
+    """
+    from local_translator.src.stt.faster_whisper_stt import FasterWhisperSTT
+
+    stt = FasterWhisperSTT(**stt_kwargs)
+    translator = None
+    if translator_kwargs is not None:
+        from local_translator.src.translation.helsinki_translator import HelsinkiTranslator
+
+        translator = HelsinkiTranslator(**translator_kwargs)
+    return stt, translator
+
+
+def _worker_main(factory, stt_kwargs, translator_kwargs, ring_name, capacity, jobs, results) -> None:
+    log = get_logger("local_translator.worker")
+    try:
+        ring = SharedAudioRing(capacity, name=ring_name)
+        stt, translator = factory(stt_kwargs, translator_kwargs)
+    except Exception as exc:
+        results.put((FATAL, False, f"{type(exc).__name__}: {exc}"))
+        return
+    results.put((READY, True, None))
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        job_id, kind, payload = job
+        try:
+            if kind == "stt":
+                offset, length, language, candidates = payload
+                result = stt.transcribe(ring.read(offset, length), language, candidates)
+                results.put(
+                    (
+                        job_id,
+                        True,
+                        (
+                            result.text,
+                            result.language,
+                            result.duration,
+                            result.truncated,
+                            result.language_probability,
+                            result.avg_logprob,
+                            result.no_speech_prob,
+                        ),
+                    )
+                )
+            elif kind == "mt":
+                aborts = getattr(translator, "repetition_aborts", 0)
+                text = translator.translate(payload)
+                results.put((job_id, True, (text, getattr(translator, "repetition_aborts", 0) > aborts)))
+            else:
+                raise ValueError(f"Unknown job kind {kind}")
+        except Exception as exc:
+            log.error("Worker job %d failed: %s", job_id, exc)
+            results.put((job_id, False, f"{type(exc).__name__}: {exc}"))
+    ring.close()
+
+
+class WorkerCrashed(RuntimeError):
+    """Raised to callers whose job was in flight when the worker died or hung."""
+
+
+class ModelWorker:
+    """
+    Hosts the STT engine (and optionally MT) in a separate process so model code
+    never competes for the GIL with audio capture and VAD.
+
+    Exposes the same `transcribe` / `translate` calls as the in-process engines.
+    Audio goes through a SharedAudioRing, job descriptors and results through
+    small queues. A supervisor thread restarts the process if it dies or a job
+    exceeds job_timeout; the in-flight job fails with WorkerCrashed and capture
+    carries on untouched.
+    """
+
+    def __init__(
+        self,
+        stt_kwargs: dict,
+        translator_kwargs: Optional[dict] = None,
+        sample_rate: int = 16_000,
+        ring_seconds: float = 60.0,
+        start_timeout: float = 180.0,
+        job_timeout: float = 30.0,
+        max_restarts: int = 5,
+        factory: Callable[[dict, Optional[dict]], tuple[Any, Any]] = build_engines,
+    ) -> None:
+        self.stt_kwargs = stt_kwargs
+        self.translator_kwargs = translator_kwargs
+        self.sample_rate = sample_rate
+        self.start_timeout = start_timeout
+        self.job_timeout = job_timeout
+        self.max_restarts = max_restarts
+        self.factory = factory
+        self.restarts = 0
+        self.repetition_aborts = 0  # MT generations the worker cut short
+        self._log = get_logger(__name__)
+        # spawn: CUDA cannot be initialised in a forked child.
+        self._ctx = mp.get_context("spawn")
+        self._ring = SharedAudioRing(int(sample_rate * ring_seconds))
+        self._ids = itertools.count()
+        self._pending: dict[int, list] = {}  # job_id -> [event, ok, payload, started_at, generation]
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._process: Optional[mp.process.BaseProcess] = None
+        self._jobs = None
+        self._results = None
+        self._running = False
+        self._reader: Optional[threading.Thread] = None
+        self._supervisor: Optional[threading.Thread] = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._spawn()
+        self._running = True
+        self._supervisor = threading.Thread(target=self._supervise, name="model-worker-supervisor", daemon=True)
+        self._supervisor.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._supervisor is not None:
+            self._supervisor.join(timeout=2.0)
+            self._supervisor = None
+        self._terminate(graceful=True)
+        self._fail_pending("worker stopped")
+        self._ring.close()
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        language: Optional[str] = settings.source_language,
+        candidates: Sequence[str] = (),
+    ) -> TranscriptionResult:
+        offset, length = self._ring.write(audio)
+        try:
+            text, language, duration, truncated, probability, avg_logprob, no_speech_prob = self._call(
+                "stt", (offset, length, language, tuple(candidates))
+            )
+        finally:
+            self._ring.release(offset)
+        return TranscriptionResult(
+            text=text,
+            language=language,
+            duration=duration,
+            truncated=truncated,
+            language_probability=probability,
+            avg_logprob=avg_logprob,
+            no_speech_prob=no_speech_prob,
+        )
+
+    def translate(self, text: str) -> str:
+        if self.translator_kwargs is None:
+            raise RuntimeError("This worker was started without a translator")
+        if not text or not text.strip():
+            return ""
+        translation, aborted = self._call("mt", text)
+        self.repetition_aborts += aborted
+        return translation
+
+    def _call(self, kind: str, payload: Any) -> Any:
+        if not self.alive:
+            raise WorkerCrashed("model worker is not running")
+        job_id = next(self._ids)
+        with self._lock:
+            entry = [threading.Event(), False, None, time.monotonic(), self._generation]
+            self._pending[job_id] = entry
+            jobs = self._jobs
+        jobs.put((job_id, kind, payload))
+        entry[0].wait()
+        if not entry[1]:
+            if isinstance(entry[2], WorkerCrashed):
+                raise entry[2]
+            raise RuntimeError(entry[2])
+        return entry[2]
+
+    def _spawn(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._jobs = self._ctx.Queue()
+            self._results = self._ctx.Queue()
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                self.factory,
+                self.stt_kwargs,
+                self.translator_kwargs,
+                self._ring.name,
+                self._ring.capacity,
+                self._jobs,
+                self._results,
+            ),
+            name="model-worker",
+            daemon=True,
+        )
+        self._process.start()
+        deadline = time.monotonic() + self.start_timeout
+        while True:
+            try:
+                job_id, ok, payload = self._results.get(timeout=0.5)
+                break
+            except queue.Empty:
+                if not self._process.is_alive():
+                    exitcode = self._process.exitcode
+                    self._terminate(graceful=False)
+                    raise RuntimeError(f"Model worker exited during startup (exit code {exitcode})")
+                if time.monotonic() > deadline:
+                    self._terminate(graceful=False)
+                    raise RuntimeError(f"Model worker did not become ready within {self.start_timeout:.0f}s")
+        if job_id == FATAL:
+            self._terminate(graceful=False)
+            raise RuntimeError(f"Model worker failed to load: {payload}")
+        self._reader = threading.Thread(target=self._read_results, args=(self._results,), daemon=True)
+        self._reader.start()
+        self._log.info("Model worker ready (pid=%s)", self._process.pid)
+
+    def _read_results(self, results) -> None:
+        while True:
+            try:
+                job_id, ok, payload = results.get(timeout=0.5)
+            except queue.Empty:
+                if results is not self._results:
+                    return  # a newer process owns the pipeline now
+                continue
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                entry = self._pending.pop(job_id, None)
+            if entry is not None:
+                entry[1], entry[2] = ok, payload
+                entry[0].set()
+
+    def _supervise(self) -> None:
+        while self._running:
+            time.sleep(0.5)
+            if not self._running:
+                return
+            reason = None
+            if not self.alive:
+                reason = "worker died"
+            else:
+                now = time.monotonic()
+                with self._lock:
+                    current = {k: e for k, e in self._pending.items() if e[4] == self._generation}
+                    orphans = [e for e in self._pending.values() if e[4] != self._generation]
+                    self._pending = current
+                    timed_out = any(now - e[3] > self.job_timeout for e in current.values())
+                for entry in orphans:
+                    # Queued to a process that has since been replaced.
+                    entry[1], entry[2] = False, WorkerCrashed("worker restarted")
+                    entry[0].set()
+                if timed_out:
+                    reason = "job timed out"
+            if reason is None:
+                continue
+
+            exitcode = self._process.exitcode if self._process is not None else None
+            self._log.error("Model worker failure (%s, exit code %s); restarting", reason, exitcode)
+            self._terminate(graceful=False)
+            self._fail_pending(reason)
+            if self.restarts >= self.max_restarts:
+                self._log.error("Model worker restarted %d times; giving up", self.restarts)
+                self._running = False
+                return
+            self.restarts += 1
+            time.sleep(min(2.0**self.restarts, 30.0))
+            try:
+                self._spawn()
+            except Exception as exc:
+                self._log.error("Model worker restart failed: %s", exc)
+
+    def _fail_pending(self, reason: str) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for entry in pending.values():
+            entry[1], entry[2] = False, WorkerCrashed(reason)
+            entry[0].set()
+
+    def _terminate(self, graceful: bool) -> None:
+        process = self._process
+        if process is None:
+            return
+        if graceful and process.is_alive():
+            try:
+                self._jobs.put(None)
+            except (OSError, ValueError):
+                pass
+            process.join(timeout=5.0)
+        if process.is_alive():
+            process.kill()
+            process.join(timeout=2.0)
+        self._process = None
@@ -1,16 +1,51 @@
 from __future__ import annotations
 
+import re
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterable, Optional, Sequence
 
 import numpy as np
-from faster_whisper import WhisperModel
+from faster_whisper import WhisperModel, __version__ as faster_whisper_version
 
 # Asumo que esta ruta es correcta
 from local_translator.src.utils.config import settings
 from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.model_store import get_model_store
+from local_translator.src.utils.repetition import token_budget, trim_looping_text
 from local_translator.src.utils.types import TranscriptionResult
 
+# Whisper's decoder context is 448 tokens; leave room for the prompt/special tokens.
+MAX_NEW_TOKENS = 440
+
+# stt.features reproduces the extractor of faster-whisper >= 1.1 (160-sample
+# trailing pad, last frame dropped); older releases pad by 30 s instead.
+FEATURES_MIN_VERSION = (1, 1)
+
+
+def _version_tuple(version: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", version)[:2])
+
+
+class _PrecomputedFeatures:
+    """
+    Stands in for WhisperModel.feature_extractor: returns features injected by
+    transcribe_features() once, otherwise computes them as usual.
+    """
+
+    def __init__(self, extractor: Any) -> None:
+        self._extractor = extractor
+        self.features: Optional[np.ndarray] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._extractor, name)
+
+    def __call__(self, waveform: np.ndarray, *args: Any, **kwargs: Any) -> np.ndarray:
+        features, self.features = self.features, None
+        if features is not None:
+            return features
+        return self._extractor(waveform, *args, **kwargs)
+
 
 class FasterWhisperSTT:
     """
@@ -31,13 +66,28 @@ class FasterWhisperSTT:
         self.compute_type = compute_type
         self.model_dir = model_dir or settings.models_dir
         
+        # Copia local verificada si existe; si no, descarga en model_dir como antes
+        local_dir = get_model_store().local_path(f"Systran/faster-whisper-{self.model_size}")
+
         # El modelo se carga en la GPU (cuda)
         self._model = WhisperModel(
-            self.model_size,
+            str(local_dir) if local_dir else self.model_size,
             device=self.device,
             compute_type=self.compute_type,
             download_root=str(self.model_dir),
+            local_files_only=local_dir is not None,
         )
+        self._features = _PrecomputedFeatures(self._model.feature_extractor)
+        self._model.feature_extractor = self._features
+        self._features_lock = threading.Lock()
+        # Precomputed features only match the extractor of recent releases.
+        self.accepts_features = _version_tuple(faster_whisper_version) >= FEATURES_MIN_VERSION
+        if not self.accepts_features:
+            self._log.info(
+                "faster-whisper %s predates %s; computing features at decode time",
+                faster_whisper_version,
+                ".".join(map(str, FEATURES_MIN_VERSION)),
+            )
         self._log.info(
             "Loaded Faster-Whisper (size=%s, device=%s, compute=%s)",
             self.model_size,
@@ -45,20 +95,104 @@ class FasterWhisperSTT:
             self.compute_type,
         )
 
-    def transcribe(self, audio: np.ndarray) -> TranscriptionResult:
+    @property
+    def n_mels(self) -> int:
+        """
+        Mel bands the loaded model expects (80, or 128 for large-v3).
+        """
+        return int(self._features.mel_filters.shape[0])
+
+    def transcribe_features(
+        self,
+        audio: np.ndarray,
+        features: np.ndarray,
+        language: Optional[str] = settings.source_language,
+        candidates: Sequence[str] = (),
+    ) -> TranscriptionResult:
+        """
+        Like transcribe(), but with the log-mel spectrogram already computed
+        (see stt.features.StreamingLogMel); only encoder and decoder work remain.
+        The audio is still needed for the duration.
+        """
+        if not self.accepts_features:
+            return self.transcribe(audio, language, candidates)
+        if features.ndim != 2 or features.shape[0] != self.n_mels:
+            self._log.debug("Features of shape %s do not fit this model; recomputing", features.shape)
+            return self.transcribe(audio, language, candidates)
+        with self._features_lock:
+            self._features.features = features
+            try:
+                return self.transcribe(audio, language, candidates)
+            finally:
+                self._features.features = None
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        language: Optional[str] = settings.source_language,
+        candidates: Sequence[str] = (),
+    ) -> TranscriptionResult:
         """
         Run transcription on a mono float32 audio array (16 kHz).
+        Decoding is capped in proportion to the audio length and uses a single
+        temperature, so a looping segment costs at most one bounded decode.
+
+        With language=None Whisper detects the language in the same call (on
+        the encoder pass it needs anyway). `candidates` restricts detection:
+        a language outside them is replaced by the likeliest candidate and the
+        audio decoded again, and language_probability is renormalised over them.
         """
-        segments, info = self._model.transcribe(
-            audio=audio,
-            language="es",
-            beam_size=1,
-            vad_filter=False,
+        max_new_tokens = token_budget(
+            len(audio) / settings.sample_rate,
+            settings.stt_tokens_per_second,
+            settings.stt_token_margin,
+            MAX_NEW_TOKENS,
         )
+        segments, info = self._decode(audio, language, max_new_tokens)
+        probability = info.language_probability
+        if language is None and candidates:
+            probs = dict(info.all_language_probs or ())
+            total = sum(probs.get(lang, 0.0) for lang in candidates)
+            language = info.language
+            if language not in candidates:
+                language = max(candidates, key=lambda lang: probs.get(lang, 0.0))
+                self._log.debug("Detected %s outside %s; decoding as %s", info.language, list(candidates), language)
+                segments, _ = self._decode(audio, language, max_new_tokens)
+            probability = probs.get(language, 0.0) / total if total > 0 else 0.0
         # For low latency we concatenate text from all returned segments.
-        text = " ".join(segment.text.strip() for segment in segments)
+        window_tokens: dict[int, int] = {}
+        parts = []
+        logprob_sum = 0.0
+        no_speech = 0.0
+        for segment in segments:
+            # max_new_tokens applies to each 30 s window (segment.seek), not to the whole call.
+            window_tokens[segment.seek] = window_tokens.get(segment.seek, 0) + len(segment.tokens)
+            logprob_sum += segment.avg_logprob * len(segment.tokens)
+            no_speech = max(no_speech, segment.no_speech_prob)
+            parts.append(segment.text.strip())
+        tokens = max(window_tokens.values(), default=0)
+        total_tokens = sum(window_tokens.values())
+        text, looped = trim_looping_text(" ".join(parts).strip())
+        truncated = looped or tokens >= max_new_tokens
+        if truncated:
+            self._log.warning("Transcription cut (tokens=%d/%d, loop=%s)", tokens, max_new_tokens, looped)
         return TranscriptionResult(
-            text=text.strip(),
-            language=info.language,
+            text=text,
+            language=language or info.language,
             duration=info.duration,
-        )
\ No newline at end of file
+            truncated=truncated,
+            language_probability=probability,
+            avg_logprob=logprob_sum / total_tokens if total_tokens else 0.0,
+            no_speech_prob=no_speech,
+        )
+
+    def _decode(self, audio: np.ndarray, language: Optional[str], max_new_tokens: int) -> tuple[Iterable[Any], Any]:
+        return self._model.transcribe(
+            audio=audio,
+            language=language,
+            beam_size=1,
+            vad_filter=False,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            max_new_tokens=max_new_tokens,
+        )
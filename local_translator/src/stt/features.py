@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Whisper front-end parameters (identical for every model size; only n_mels varies).
+SAMPLE_RATE = 16_000
+N_FFT = 400
+HOP_LENGTH = 160
+_HALF = N_FFT // 2  # center=True reflect padding on each side
+
+
+def mel_filters(n_mels: int = 80, sample_rate: int = SAMPLE_RATE, n_fft: int = N_FFT) -> np.ndarray:
+    """
+    Slaney-style mel filterbank (n_mels, n_fft // 2 + 1), as used by Whisper and
+    faster-whisper's FeatureExtractor.
+    """
+    fftfreqs = np.fft.rfftfreq(n=n_fft, d=1.0 / sample_rate)
+    mels = np.linspace(0.0, 45.245640471924965, n_mels + 2)
+    f_sp = 200.0 / 3
+    freqs = f_sp * mels
+    min_log_hz = 1000.0
+    min_log_mel = min_log_hz / f_sp
+    logstep = np.log(6.4) / 27.0
+    log_t = mels >= min_log_mel
+    freqs[log_t] = min_log_hz * np.exp(logstep * (mels[log_t] - min_log_mel))
+
+    fdiff = np.diff(freqs)
+    ramps = freqs.reshape(-1, 1) - fftfreqs.reshape(1, -1)
+    lower = -ramps[:-2] / fdiff[:-1].reshape(-1, 1)
+    upper = ramps[2:] / fdiff[1:].reshape(-1, 1)
+    weights = np.maximum(0, np.minimum(lower, upper))
+    enorm = 2.0 / (freqs[2 : n_mels + 2] - freqs[:n_mels])
+    weights *= enorm[:, np.newaxis]
+    return weights
+
+
+_WINDOW = np.hanning(N_FFT + 1)[:-1]  # periodic Hann
+
+
+def _log_mel_frames(padded: np.ndarray, count: int, filters: np.ndarray) -> np.ndarray:
+    """
+    log10 mel power of `count` consecutive frames starting at padded[0]; (count, n_mels).
+    One strided view and one batched rFFT for the whole block.
+    """
+    span = padded[: (count - 1) * HOP_LENGTH + N_FFT]
+    frames = sliding_window_view(span, N_FFT)[::HOP_LENGTH]
+    power = np.abs(np.fft.rfft(frames * _WINDOW, axis=-1)) ** 2
+    return np.log10(np.maximum(power @ filters.T, 1e-10))
+
+
+def _normalize(log_spec: np.ndarray) -> np.ndarray:
+    log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+    return ((log_spec + 4.0) / 4.0).astype(np.float32)
+
+
+def log_mel_spectrogram(audio: np.ndarray, n_mels: int = 80, filters: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Whole-utterance features, (n_mels, frames), matching faster-whisper's
+    FeatureExtractor(audio) (160 samples of trailing padding, last frame dropped).
+    """
+    filters = mel_filters(n_mels) if filters is None else filters
+    audio = np.pad(np.asarray(audio, dtype=np.float32), (0, HOP_LENGTH))
+    padded = np.pad(audio, _HALF, mode="reflect")
+    count = 1 + len(audio) // HOP_LENGTH
+    return _normalize(_log_mel_frames(padded, count, filters)[:-1].T)
+
+
+class StreamingLogMel:
+    """
+    Computes Whisper log-mel frames block by block while a segment is still
+    being captured, so closing the segment only costs the last few frames and
+    the global max normalisation.
+
+    Frames are produced as soon as their 400-sample window lies entirely in
+    audio already seen; the frames that touch the end padding are computed in
+    finish(). The result equals log_mel_spectrogram() on the concatenated audio.
+    """
+
+    def __init__(self, n_mels: int = 80) -> None:
+        self.n_mels = n_mels
+        self._filters = mel_filters(n_mels)
+        self.reset()
+
+    def reset(self) -> None:
+        self._head: list[np.ndarray] = []  # audio before the left padding can be built
+        self._head_len = 0
+        self._pending: Optional[np.ndarray] = None  # padded samples from the next frame on
+        self._blocks: list[np.ndarray] = []
+        self._frames = 0
+        self._samples = 0
+
+    @property
+    def frames_ready(self) -> int:
+        return self._frames
+
+    def push(self, samples: np.ndarray) -> None:
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        self._samples += len(samples)
+        if self._pending is None:
+            self._head.append(samples)
+            self._head_len += len(samples)
+            if self._head_len <= _HALF:
+                return
+            audio = np.concatenate(self._head)
+            self._head = []
+            # Left reflect padding needs samples 1..200.
+            self._pending = np.concatenate((audio[_HALF:0:-1], audio))
+        else:
+            self._pending = np.concatenate((self._pending, samples))
+        count = (len(self._pending) - N_FFT) // HOP_LENGTH + 1
+        if count > 0:
+            self._emit(count)
+
+    def finish(self) -> np.ndarray:
+        """
+        Features for everything pushed since the last reset, (n_mels, frames); resets.
+        """
+        if self._pending is None:
+            audio = np.concatenate(self._head) if self._head else np.zeros(0, dtype=np.float32)
+            self.reset()
+            return log_mel_spectrogram(audio, self.n_mels, self._filters)
+
+        tail = np.concatenate((self._pending, np.zeros(HOP_LENGTH, dtype=np.float32)))
+        reflect = tail[-_HALF - 1 : -1][::-1]
+        self._pending = np.concatenate((tail, reflect))
+        total = 1 + (self._samples + HOP_LENGTH) // HOP_LENGTH
+        self._emit(total - self._frames)
+        log_spec = np.concatenate(self._blocks)[:-1].T
+        self.reset()
+        return _normalize(log_spec)
+
+    def _emit(self, count: int) -> None:
+        self._blocks.append(_log_mel_frames(self._pending, count, self._filters))
+        self._frames += count
+        self._pending = self._pending[count * HOP_LENGTH :]
@@ -8,7 +8,11 @@ from typing import Any, Optional, Union
 import numpy as np
 from faster_whisper import WhisperModel
 
+from local_translator.src.stt.faster_whisper_stt import MAX_NEW_TOKENS
+from local_translator.src.utils.config import settings
 from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.model_store import get_model_store
+from local_translator.src.utils.repetition import token_budget, trim_looping_text
 
 AudioInput = Union[str, Path, np.ndarray, list[Any]]
 
@@ -39,39 +43,62 @@ class WhisperSTT:
                 self._log.warning("CUDA check failed; falling back to CPU")
                 resolved_device = "cpu"
 
+        local_dir = get_model_store().local_path(f"Systran/faster-whisper-{model_size}")
         self.model = WhisperModel(
-            model_size,
+            str(local_dir) if local_dir else model_size,
             device=resolved_device,
             compute_type=compute_type,
+            local_files_only=local_dir is not None,
         )
         self.device = resolved_device
+        self.truncated = 0  # transcriptions cut at the token cap or a repetition loop
         self._log.info("Whisper Model loaded on %s", self.device)
 
-    def transcribe(self, audio_segment: AudioInput) -> str:
+    def transcribe(self, audio_segment: AudioInput, language: Optional[str] = "es") -> str:
         """
-        Transcribe a given audio input to Spanish text.
+        Transcribe a given audio input (Spanish unless another language is
+        given; None lets Whisper detect it).
         Accepts file paths or numpy arrays supported by faster-whisper.
         """
         if audio_segment is None:
             return ""
 
+        # Cap decoding in proportion to the audio so a loop cannot run to 448 tokens.
+        max_new_tokens = None
+        if isinstance(audio_segment, np.ndarray):
+            max_new_tokens = token_budget(
+                len(audio_segment) / settings.sample_rate,
+                settings.stt_tokens_per_second,
+                settings.stt_token_margin,
+                MAX_NEW_TOKENS,
+            )
+
         segments_iter, _ = self.model.transcribe(
             audio_segment,
-            language="es",
+            language=language,
             beam_size=1,
             vad_filter=False,
             temperature=0.0,
+            condition_on_previous_text=False,
+            max_new_tokens=max_new_tokens,
         )
 
         segments = []
+        window_tokens: dict[int, int] = {}
         for segment in segments_iter:
+            # The token cap is per 30 s window (segment.seek), not per call.
+            window_tokens[segment.seek] = window_tokens.get(segment.seek, 0) + len(segment.tokens)
             print(
                 f"DEBUG RAW SEGMENT: '{segment.text}' (Start: {segment.start}, End: {segment.end})"
             )
             segments.append(segment)
             print(f"DEBUG Segment: {segment.text} (Log-prob: {segment.avg_logprob})")
 
-        text = " ".join(segment.text.strip() for segment in segments).strip()
+        tokens = max(window_tokens.values(), default=0)
+        text, looped = trim_looping_text(" ".join(segment.text.strip() for segment in segments).strip())
+        if looped or (max_new_tokens is not None and tokens >= max_new_tokens):
+            self.truncated += 1
+            self._log.warning("Transcription cut (tokens=%d, loop=%s)", tokens, looped)
         if not text:
             self._log.warning(
                 "Audio processed but no text detected. Check microphone volume."
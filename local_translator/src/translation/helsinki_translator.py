@@ -1,12 +1,44 @@
 from __future__ import annotations
 
+import threading
 import time
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 
 import torch
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
-
+from transformers import (
+    AutoModelForSeq2SeqLM,
+    AutoTokenizer,
+    StoppingCriteria,
+    StoppingCriteriaList,
+    TextIteratorStreamer,
+)
+
+from local_translator.src.translation.streaming import aiterate, split_sentences
+from local_translator.src.utils.config import settings
 from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.profiler import profiler
+from local_translator.src.utils.model_store import get_model_store
+from local_translator.src.utils.repetition import find_loop, token_budget, trim_loop
+
+# Hard ceiling kept from the previous fixed max_length.
+MAX_NEW_TOKENS = 256
+
+
+class RepetitionStoppingCriteria(StoppingCriteria):
+    """
+    Stops generation once every hypothesis ends in a back-to-back repeated n-gram.
+    """
+
+    def __init__(self, max_ngram: int, min_repeats: int) -> None:
+        self.max_ngram = max_ngram
+        self.min_repeats = min_repeats
+        self.triggered = False
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> bool:
+        rows = input_ids.tolist()
+        if all(find_loop(row, self.max_ngram, self.min_repeats)[0] for row in rows):
+            self.triggered = True
+        return self.triggered
 
 
 class HelsinkiTranslator:
@@ -20,8 +52,15 @@ class HelsinkiTranslator:
         model_name: str = "Helsinki-NLP/opus-mt-es-en",
         model_dir: Optional[str] = None,
         device: Optional[str] = "cuda",
+        num_beams: int = 4,
+        prefix: str = "",
     ) -> None:
         self._log = get_logger(__name__)
+        self.model_name = model_name
+        self.num_beams = num_beams
+        # Target-language token for multilingual opus-mt models, e.g. ">>por<<".
+        self.prefix = prefix
+        self.repetition_aborts = 0
 
         # Validación de dispositivo
         if device == "cuda" and not torch.cuda.is_available():
@@ -34,9 +73,20 @@ class HelsinkiTranslator:
         # Si nos pasan un directorio, lo usamos como cache_dir para guardar los modelos allí
         cache_dir = model_dir if model_dir else None
 
+        # Preferimos la copia verificada del almacén local: sin red y con safetensors (mmap)
+        local_dir = get_model_store().local_path(model_name)
+        if local_dir is not None:
+            source = str(local_dir)
+            load_kwargs = {"local_files_only": True}
+            model_kwargs = {"use_safetensors": True} if any(local_dir.glob("*.safetensors")) else {}
+        else:
+            source = model_name
+            load_kwargs = {"cache_dir": cache_dir}
+            model_kwargs = {}
+
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name, cache_dir=cache_dir)
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name, cache_dir=cache_dir)
+            self.tokenizer = AutoTokenizer.from_pretrained(source, **load_kwargs)
+            self.model = AutoModelForSeq2SeqLM.from_pretrained(source, **load_kwargs, **model_kwargs)
         except Exception as e:
             self._log.error(f"Error cargando el modelo {model_name}: {e}")
             raise e
@@ -59,26 +109,24 @@ class HelsinkiTranslator:
             return ""
 
         try:
-            # Tokenizar
-            encoded = self.tokenizer(
-                text,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-            ).to(self.device)
+            encoded, stop_on_loop, generate_kwargs = self._prepare(text)
 
             # Generar traducción
             with torch.no_grad():
-                generated_tokens = self.model.generate(
-                    **encoded, 
-                    max_length=256,
-                    num_beams=4,        # Mejora un poco la calidad
-                    early_stopping=True
-                )
+                generated_tokens = self.model.generate(**encoded, **generate_kwargs)
+
+            sequences = generated_tokens.tolist()
+            if stop_on_loop.triggered:
+                self.repetition_aborts += 1
+                self._log.warning("Traducción cortada por repetición: %s", text)
+                sequences = [
+                    trim_loop(seq, settings.repetition_max_ngram, settings.repetition_min_repeats)
+                    for seq in sequences
+                ]
 
             # Decodificar
             output_text = self.tokenizer.batch_decode(
-                generated_tokens, skip_special_tokens=True
+                sequences, skip_special_tokens=True
             )
             return output_text[0] if output_text else ""
             
@@ -86,6 +134,86 @@ class HelsinkiTranslator:
             self._log.error(f"Error durante traducción: {e}")
             return ""
 
+    def translate_stream(self, text: str) -> Iterator[str]:
+        """
+        Translate incrementally, yielding pieces of English text as they are ready
+        ("".join of the pieces is the full translation). Greedy decoding
+        (num_beams=1) streams token by token; beam search cannot be streamed, so
+        the input is translated sentence by sentence and each finished sentence
+        is yielded.
+        """
+        if not text or not text.strip():
+            return
+        if self.num_beams > 1:
+            for index, sentence in enumerate(split_sentences(text)):
+                translated = self.translate(sentence)
+                if translated:
+                    yield translated if index == 0 else " " + translated
+            return
+
+        try:
+            encoded, stop_on_loop, generate_kwargs = self._prepare(text)
+        except Exception as e:
+            self._log.error(f"Error durante traducción: {e}")
+            return
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=60.0)
+
+        segment = profiler.current_segment()
+
+        def _generate() -> None:
+            profiler.register("mt")
+            profiler.annotate("mt", segment)
+            try:
+                with torch.no_grad():
+                    self.model.generate(**encoded, **generate_kwargs, streamer=streamer)
+            except Exception as e:  # pragma: no cover - defensive
+                self._log.error(f"Error durante traducción: {e}")
+                streamer.end()
+            finally:
+                profiler.unregister()
+
+        worker = threading.Thread(target=_generate, name="mt-stream", daemon=True)
+        worker.start()
+        for piece in streamer:
+            if piece:
+                yield piece
+        worker.join()
+        if stop_on_loop.triggered:
+            self.repetition_aborts += 1
+            self._log.warning("Traducción cortada por repetición: %s", text)
+
+    async def atranslate_stream(self, text: str) -> AsyncIterator[str]:
+        """
+        asyncio version of translate_stream (generation runs off the event loop).
+        """
+        async for piece in aiterate(self.translate_stream(text)):
+            yield piece
+
+    def _prepare(self, text: str) -> tuple[dict, RepetitionStoppingCriteria, dict]:
+        # Tokenizar
+        encoded = self.tokenizer(
+            f"{self.prefix} {text}" if self.prefix else text,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+        ).to(self.device)
+
+        # Límite proporcional a la entrada y corte en cuanto se detecta un bucle
+        max_new_tokens = token_budget(
+            encoded["input_ids"].shape[-1],
+            settings.mt_tokens_per_source_token,
+            settings.mt_token_margin,
+            MAX_NEW_TOKENS,
+        )
+        stop_on_loop = RepetitionStoppingCriteria(settings.repetition_max_ngram, settings.repetition_min_repeats)
+        generate_kwargs = dict(
+            max_new_tokens=max_new_tokens,
+            num_beams=self.num_beams,  # 4 mejora un poco la calidad; 1 es más rápido
+            early_stopping=self.num_beams > 1,
+            stopping_criteria=StoppingCriteriaList([stop_on_loop]),
+        )
+        return encoded, stop_on_loop, generate_kwargs
+
 
 if __name__ == "__main__":
     # Prueba rápida
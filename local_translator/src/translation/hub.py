@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional
+
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.logger import get_logger
+
+PIVOT = "en"
+
+
+def parse_model_spec(spec: str) -> tuple[str, str]:
+    """
+    "Helsinki-NLP/opus-mt-tc-big-en-pt >>por<<" -> (model name, target prefix).
+    """
+    name, _, prefix = spec.strip().partition(" ")
+    return name, prefix.strip()
+
+
+def _default_factory(spec: str, num_beams: int) -> Any:
+    from local_translator.src.translation.helsinki_translator import HelsinkiTranslator
+
+    name, prefix = parse_model_spec(spec)
+    return HelsinkiTranslator(
+        model_name=name,
+        model_dir=str(settings.models_dir),
+        device=settings.translation_device,
+        num_beams=num_beams,
+        prefix=prefix,
+    )
+
+
+@dataclass
+class _Slot:
+    spec: str
+    translator: Any = None
+    pinned: bool = False  # owned by someone else (e.g. the pipeline's primary model): never unloaded
+    last_used: float = 0.0
+    users: int = 0
+    aborts: int = 0  # repetition aborts of translators already unloaded
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class TranslationHub:
+    """
+    Several opus-mt models keyed by language pair ("es-fr"), loaded on first
+    use and unloaded after idle_unload seconds without work.
+
+    A pair without its own model is routed through English, and when several
+    targets need that hop it is computed once: es -> {en, fr, pt} costs one
+    es-en pass plus fr and pt in parallel. translate_many() is the fan-out
+    entry point; translate() handles one target.
+    """
+
+    def __init__(
+        self,
+        models: Optional[Iterable[tuple[str, str]]] = None,
+        num_beams: int = settings.translation_num_beams,
+        idle_unload: float = settings.translation_idle_unload,
+        factory: Callable[[str, int], Any] = _default_factory,
+        max_parallel: int = 4,
+    ) -> None:
+        self.num_beams = num_beams
+        self.idle_unload = idle_unload
+        self.factory = factory
+        self._log = get_logger(__name__)
+        self._slots = {pair: _Slot(spec) for pair, spec in (models or settings.translation_models)}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="mt-hub")
+        self._closed = threading.Event()
+        self._janitor: Optional[threading.Thread] = None
+        if idle_unload > 0:
+            self._janitor = threading.Thread(target=self._unload_loop, name="mt-hub-janitor", daemon=True)
+            self._janitor.start()
+
+    @property
+    def pairs(self) -> list[str]:
+        return list(self._slots)
+
+    @property
+    def loaded(self) -> list[str]:
+        return [pair for pair, slot in self._slots.items() if slot.translator is not None]
+
+    @property
+    def repetition_aborts(self) -> int:
+        return sum(
+            slot.aborts + (getattr(slot.translator, "repetition_aborts", 0) if slot.translator is not None else 0)
+            for slot in self._slots.values()
+        )
+
+    def adopt(self, pair: str, translator: Any) -> None:
+        """
+        Serve `pair` with an already loaded translator (kept loaded; the caller owns it).
+        """
+        with self._lock:
+            slot = self._slots.setdefault(pair, _Slot(getattr(translator, "model_name", pair)))
+        with slot.lock:
+            if slot.translator is not None and not slot.pinned and slot.translator is not translator:
+                slot.aborts += getattr(slot.translator, "repetition_aborts", 0)
+            slot.translator = translator
+            slot.pinned = True
+
+    def preload(self, pairs: Iterable[str]) -> None:
+        """
+        Load `pairs` now and keep them loaded (never idle-unloaded), for
+        directions on the main segment path that must not pay a cold load.
+        """
+        for pair in pairs:
+            slot = self._slots[pair]
+            with slot.lock:
+                self._load(pair, slot)
+                slot.pinned = True
+
+    def route(self, source: str, target: str) -> list[str]:
+        """
+        Pairs to chain for source -> target (empty when they are the same language).
+        """
+        if source == target:
+            return []
+        direct = f"{source}-{target}"
+        if direct in self._slots:
+            return [direct]
+        if PIVOT not in (source, target) and f"{source}-{PIVOT}" in self._slots and f"{PIVOT}-{target}" in self._slots:
+            return [f"{source}-{PIVOT}", f"{PIVOT}-{target}"]
+        raise KeyError(f"No translation model or English pivot for {source}->{target}")
+
+    def translate(self, text: str, target: str, source: str = settings.source_language) -> str:
+        for pair in self.route(source, target):
+            text = self._run(pair, text)
+        return text
+
+    def translate_many(
+        self,
+        text: str,
+        targets: Iterable[str],
+        source: str = settings.source_language,
+        known: Optional[dict[str, str]] = None,
+    ) -> dict[str, str]:
+        """
+        Translate one transcript into every target in parallel. `known` holds
+        translations already available (e.g. the pipeline's own English), which
+        are returned as-is and reused as pivot.
+        """
+        targets = list(dict.fromkeys(targets))
+        done = dict(known or {})
+        done.setdefault(source, text)
+        routes = {target: self.route(source, target) for target in targets if target not in done}
+        # The shared pivot hop first, once.
+        if any(len(route) == 2 for route in routes.values()) and PIVOT not in done:
+            done[PIVOT] = self._run(f"{source}-{PIVOT}", text)
+            routes.pop(PIVOT, None)  # English itself is a target: that hop is its translation
+        futures = {
+            target: self._executor.submit(self._run, route[-1], done[PIVOT] if len(route) == 2 else text)
+            for target, route in routes.items()
+        }
+        for target, future in futures.items():
+            done[target] = future.result()
+        return {target: done[target] for target in targets}
+
+    def unload_idle(self, now: Optional[float] = None) -> list[str]:
+        """
+        Free models unused for idle_unload seconds; returns the pairs unloaded.
+        """
+        from local_translator.src.pipeline.model_manager import release_models
+
+        now = time.monotonic() if now is None else now
+        freed = []
+        for pair, slot in self._slots.items():
+            with slot.lock:
+                if slot.translator is None or slot.pinned or slot.users:
+                    continue
+                if now - slot.last_used < self.idle_unload:
+                    continue
+                translator, slot.translator = slot.translator, None
+                slot.aborts += getattr(translator, "repetition_aborts", 0)
+            freed.append(pair)
+            del translator
+        if freed:
+            release_models()
+            self._log.info("Unloaded idle translation models: %s", ", ".join(freed))
+        return freed
+
+    def close(self) -> None:
+        self._closed.set()
+        self._executor.shutdown(wait=True)
+        for slot in self._slots.values():
+            if not slot.pinned:
+                slot.translator = None
+
+    def _run(self, pair: str, text: str) -> str:
+        slot = self._slots[pair]
+        with slot.lock:
+            slot.users += 1
+            try:
+                translator = self._load(pair, slot)
+            except Exception:
+                slot.users -= 1
+                raise
+        try:
+            return translator.translate(text)
+        finally:
+            with slot.lock:
+                slot.users -= 1
+                slot.last_used = time.monotonic()
+
+    def _load(self, pair: str, slot: _Slot) -> Any:
+        # Caller holds slot.lock.
+        if slot.translator is None:
+            started = time.perf_counter()
+            slot.translator = self.factory(slot.spec, self.num_beams)
+            self._log.info("Loaded %s (%s) in %.1fs", pair, slot.spec, time.perf_counter() - started)
+        return slot.translator
+
+    def _unload_loop(self) -> None:
+        while not self._closed.wait(min(30.0, self.idle_unload)):
+            self.unload_idle()
+
+
+@dataclass(frozen=True)
+class TargetText:
+    segment_id: int
+    target: str
+    text: str
+    closed_at: float = 0.0  # time.monotonic() when the source segment closed
+
+
+class FanOut:
+    """
+    Translates each transcript into extra target languages off the main
+    segment path and feeds one queue per target. With a speaker for a target
+    (e.g. that language's PiperTTS.speak), a thread per target drains its
+    queue into it; otherwise consumers read `queues[target]` themselves.
+    on_result, if given, also sees every translation (e.g. to archive it).
+
+    Like SegmentScheduler, it never falls further behind than max_lag: jobs
+    and translations older than that are dropped, and a full target queue
+    drops its oldest entry to make room (all counted in `dropped`).
+    """
+
+    def __init__(
+        self,
+        hub: TranslationHub,
+        targets: Iterable[str],
+        speakers: Optional[dict[str, Callable[[str], None]]] = None,
+        source: str = settings.source_language,
+        max_pending: int = 8,
+        max_lag: float = settings.max_segment_lag,
+        on_result: Optional[Callable[[TargetText], None]] = None,
+    ) -> None:
+        self.hub = hub
+        self.on_result = on_result
+        self.targets = list(targets)
+        self.source = source
+        self.max_lag = max_lag
+        self.queues: dict[str, queue.Queue[TargetText]] = {
+            target: queue.Queue(maxsize=max_pending) for target in self.targets
+        }
+        self.dropped = 0
+        self._log = get_logger(__name__)
+        self._jobs: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._threads = [threading.Thread(target=self._translate_loop, name="fanout", daemon=True)]
+        for target, speak in (speakers or {}).items():
+            self._threads.append(
+                threading.Thread(target=self._speak_loop, args=(target, speak), name=f"fanout-{target}", daemon=True)
+            )
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        segment_id: int,
+        text: str,
+        known: Optional[dict[str, str]] = None,
+        closed_at: Optional[float] = None,
+    ) -> bool:
+        """
+        Queue a transcript; False (and counted in `dropped`) if the fan-out is behind.
+        closed_at (time.monotonic) is when the segment closed, for the max_lag check.
+        """
+        if not text.strip():
+            return True
+        closed_at = time.monotonic() if closed_at is None else closed_at
+        try:
+            self._jobs.put_nowait((segment_id, text, known, closed_at))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            self._log.warning("Fan-out behind; segment %d not translated into %s", segment_id, self.targets)
+            return False
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._jobs.put(None)
+        self._threads[0].join(timeout)
+        for q in self.queues.values():
+            self._put(q, None)  # type: ignore[arg-type]
+        for thread in self._threads[1:]:
+            thread.join(timeout)
+
+    def _translate_loop(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            segment_id, text, known, closed_at = job
+            if self._stale(segment_id, closed_at, "translation"):
+                continue
+            try:
+                results = self.hub.translate_many(text, self.targets, self.source, known)
+            except Exception as exc:
+                self._log.error("Fan-out of segment %d failed: %s", segment_id, exc)
+                continue
+            for target, translated in results.items():
+                self._log.info("[%d] %s: %s", segment_id, target.upper(), translated)
+                item = TargetText(segment_id, target, translated, closed_at)
+                if self.on_result is not None:
+                    self.on_result(item)
+                self._put(self.queues[target], item)
+
+    def _speak_loop(self, target: str, speak: Callable[[str], None]) -> None:
+        q = self.queues[target]
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            if self._stale(item.segment_id, item.closed_at, f"{target} speech"):
+                continue
+            try:
+                speak(item.text)
+            except Exception as exc:
+                self._log.error("TTS for %s failed: %s", target, exc)
+
+    def _stale(self, segment_id: int, closed_at: float, stage: str) -> bool:
+        age = time.monotonic() - closed_at
+        if age <= self.max_lag:
+            return False
+        self.dropped += 1
+        self._log.warning("Fan-out dropped %s of segment %d (%.1fs old)", stage, segment_id, age)
+        return True
+
+    def _put(self, q: queue.Queue, item: Optional[TargetText]) -> None:
+        # Bounded: a slow consumer loses the oldest entry, never the newest (or the stop marker).
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                pass
+            try:
+                old = q.get_nowait()
+            except queue.Empty:
+                continue
+            if old is None:
+                q.put_nowait(old)  # keep the stop marker; there is room again now
+                return
+            self.dropped += 1
+            self._log.warning("Fan-out %s queue full; dropped segment %d", old.target, old.segment_id)
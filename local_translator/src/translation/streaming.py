@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from concurrent.futures import Executor
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Sentence end: terminal punctuation followed by whitespace.
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+# Clause boundary for early TTS: any of these at the end of the buffered text.
+_CLAUSE_END = re.compile(r"[.!?…,;:]\s*$")
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    Split source text into sentences so beam search can be finalised per sentence.
+    """
+    return [part.strip() for part in _SENTENCE_END.split(text.strip()) if part.strip()]
+
+
+def iter_clauses(deltas: Iterable[str], min_chars: int = 12) -> Iterator[str]:
+    """
+    Regroup streamed text deltas into clause-sized chunks for TTS: a chunk is
+    released at the first punctuation boundary once it has min_chars
+    characters, and whatever remains is released at the end.
+    """
+    buffer = ""
+    for delta in deltas:
+        buffer += delta
+        if _clause_ready(buffer, min_chars):
+            yield buffer.strip()
+            buffer = ""
+    if buffer.strip():
+        yield buffer.strip()
+
+
+async def aiter_clauses(deltas: AsyncIterable[str], min_chars: int = 12) -> AsyncIterator[str]:
+    """
+    iter_clauses for an async stream of deltas.
+    """
+    buffer = ""
+    async for delta in deltas:
+        buffer += delta
+        if _clause_ready(buffer, min_chars):
+            yield buffer.strip()
+            buffer = ""
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def _clause_ready(buffer: str, min_chars: int) -> bool:
+    return len(buffer.strip()) >= min_chars and _CLAUSE_END.search(buffer) is not None
+
+
+async def aiterate(iterator: Iterator[T], executor: Optional[Executor] = None) -> AsyncIterator[T]:
+    """
+    Consume a blocking iterator from asyncio code without blocking the event loop.
+    Each next() runs in `executor` (the loop's default executor if None).
+    """
+    loop = asyncio.get_running_loop()
+    done = object()
+    while True:
+        item = await loop.run_in_executor(executor, next, iterator, done)
+        if item is done:
+            return
+        yield item
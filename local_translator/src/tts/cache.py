@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import collections
+import hashlib
+import json
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.logger import get_logger
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Cache-key form of a phrase: whitespace collapsed, ends trimmed. Case and
+    punctuation are kept because Piper's prosody depends on them.
+    """
+    return _SPACES.sub(" ", text).strip()
+
+
+def cache_key(voice: str, text: str, params: Optional[dict] = None) -> str:
+    payload = json.dumps([voice, normalize_text(text), params or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PCMCache:
+    """
+    Content-addressed cache of synthesized int16 PCM.
+
+    Memory tier: LRU bounded by total bytes. Optional disk tier under disk_dir,
+    one file per key, raw or zlib-compressed; disk hits are promoted to memory.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        disk_dir: Optional[Path] = None,
+        compress: bool = True,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.compress = compress
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._log = get_logger(__name__)
+        self._entries: collections.OrderedDict[str, np.ndarray] = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, count: bool = True) -> Optional[np.ndarray]:
+        """
+        Cached PCM for key, or None. count=False leaves the hit/miss counters
+        alone (lookups that are not playback, e.g. preloading).
+        """
+        with self._lock:
+            pcm = self._entries.get(key)
+            if pcm is not None:
+                self._entries.move_to_end(key)
+                self.hits += count
+                return pcm
+        pcm = self._read_disk(key)
+        if pcm is None:
+            self.misses += count
+            return None
+        self.disk_hits += count
+        self._remember(key, pcm)
+        return pcm
+
+    def put(self, key: str, pcm: np.ndarray) -> None:
+        pcm = np.ascontiguousarray(pcm, dtype=np.int16)
+        pcm.flags.writeable = False  # shared by every hit
+        self._remember(key, pcm)
+        self._write_disk(key, pcm)
+
+    def _remember(self, key: str, pcm: np.ndarray) -> None:
+        if pcm.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = pcm
+            self._bytes += pcm.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.pcm{'.z' if self.compress else ''}"
+
+    def _read_disk(self, key: str) -> Optional[np.ndarray]:
+        if self.disk_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            if self.compress:
+                data = zlib.decompress(data)
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error) as exc:
+            self._log.warning("Discarding unreadable TTS cache file %s: %s", path.name, exc)
+            path.unlink(missing_ok=True)
+            return None
+        pcm = np.frombuffer(data, dtype="<i2")
+        pcm.flags.writeable = False
+        return pcm
+
+    def _write_disk(self, key: str, pcm: np.ndarray) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._path(key)
+        if path.exists():
+            return
+        data = pcm.astype("<i2", copy=False).tobytes()
+        if self.compress:
+            data = zlib.compress(data, 6)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as exc:
+            self._log.warning("Could not write TTS cache file %s: %s", path.name, exc)
+
+
+def cache_from_settings() -> Optional[PCMCache]:
+    """
+    PCMCache configured from settings (None when tts_cache_mb is 0).
+    """
+    if settings.tts_cache_mb <= 0:
+        return None
+    return PCMCache(
+        max_bytes=int(settings.tts_cache_mb * 1024 * 1024),
+        disk_dir=settings.models_dir / "tts_cache" if settings.tts_disk_cache else None,
+    )
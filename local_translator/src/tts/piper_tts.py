@@ -2,16 +2,25 @@ from __future__ import annotations
 
 import os
 import subprocess
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Generator, Iterable, Iterator, Optional
 
+import numpy as np
+
+from local_translator.src.audio.output_stream import AudioOutputStream
+from local_translator.src.tts.cache import PCMCache, cache_key
+from local_translator.src.utils.config import settings
 from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.model_store import get_model_store
 
 
 class PiperTTS:
     """
     Wrapper for local Piper TTS using pre-downloaded binaries/models.
-    Streams generated audio directly to aplay for low latency playback.
+    Streams generated audio into a persistent AudioOutputStream when one is
+    given, otherwise falls back to piping into aplay.
+    With a PCMCache, phrases synthesized before are played straight from it.
     """
 
     def __init__(
@@ -19,12 +28,23 @@ class PiperTTS:
         models_root: Optional[Path] = None,
         binary_name: str = "piper",
         model_name: str = "en_US-ryan-medium.onnx",
+        output: Optional[AudioOutputStream] = None,
+        sample_rate: int = settings.tts_sample_rate,
+        chunk_seconds: float = 0.25,
+        cache: Optional[PCMCache] = None,
+        max_cached_chars: int = 120,
     ) -> None:
         self._log = get_logger(__name__)
         base_dir = models_root or Path(__file__).resolve().parents[2] / "models" / "piper"
         self.base_dir = base_dir
         self.piper_bin = (base_dir / binary_name).resolve()
-        self.model_path = (base_dir / model_name).resolve()
+        self.model_path = self._find_model(base_dir, model_name)
+        self.output = output
+        self.sample_rate = sample_rate
+        self.cache = cache
+        self.max_cached_chars = max_cached_chars
+        # Raw int16 mono, so two bytes per sample.
+        self._chunk_bytes = int(sample_rate * chunk_seconds) * 2
 
         if not self.piper_bin.is_file():
             raise FileNotFoundError(f"Piper binary not found at {self.piper_bin}")
@@ -33,12 +53,161 @@ class PiperTTS:
         if not self.model_path.is_file():
             raise FileNotFoundError(f"Piper model not found at {self.model_path}")
 
+        stat = self.model_path.stat()
+        # Voice identity for cache keys: a replaced model file must not hit old entries.
+        self._voice_id = f"{self.model_path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+
         self._log.info("Piper TTS initialized (bin=%s, model=%s)", self.piper_bin, self.model_path)
 
-    def speak(self, text: str) -> None:
+    @staticmethod
+    def _find_model(base_dir: Path, model_name: str) -> Path:
+        """
+        The voice next to the binary, else the pinned copy in the model store
+        (artifact "piper-<voice>", fetched with its .onnx.json beside it).
+        """
+        path = base_dir / model_name
+        if not path.is_file():
+            local_dir = get_model_store().local_path(f"piper-{Path(model_name).stem}")
+            if local_dir is not None:
+                path = next(local_dir.rglob(model_name), path)
+        return path.resolve()
+
+    def synthesize(self, text: str) -> np.ndarray:
+        """
+        Synthesize text to a mono int16 array at self.sample_rate.
+        """
+        chunks = list(self.synthesize_stream(text))
+        if len(chunks) == 1:
+            return chunks[0]
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int16)
+
+    def synthesize_stream(self, text: str) -> Iterator[np.ndarray]:
+        """
+        Yield int16 PCM chunks as Piper produces them (a cache hit is one chunk).
+        The phrase is cached once synthesis has completed successfully.
+        """
+        key = self._cache_key(text)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        yield from self._synthesize_into_cache(text, key)
+
+    def preload(self, phrases: Iterable[str]) -> int:
+        """
+        Synthesize common phrases into the cache ahead of time; returns how many were added.
+        """
+        if self.cache is None:
+            return 0
+        added = 0
+        for phrase in phrases:
+            key = self._cache_key(phrase)
+            # Warm-up lookups are not playback, so they do not count as misses.
+            if key is None or self.cache.get(key, count=False) is not None:
+                continue
+            for _ in self._synthesize_into_cache(phrase, key):
+                pass
+            if self.cache.get(key, count=False) is not None:
+                added += 1
+        self._log.info(
+            "Preloaded %d TTS phrases (%d entries, %.1f MB)",
+            added,
+            len(self.cache),
+            self.cache.size_bytes / 1e6,
+        )
+        return added
+
+    def speak(self, text: str, interrupt: bool = False) -> None:
+        """
+        Speak text. With an output stream this returns as soon as synthesis ends
+        (playback continues in the background); interrupt=True cuts off anything
+        still playing.
+        """
         if not text:
             return
+        if self.output is None:
+            self._speak_aplay(text)
+            return
+
+        requested_at = time.perf_counter()
+        first = True
+        for pcm in self.synthesize_stream(text):
+            self.output.enqueue(
+                pcm,
+                interrupt=interrupt and first,
+                requested_at=requested_at if first else None,
+            )
+            first = False
+
+    def _cache_key(self, text: str) -> Optional[str]:
+        if self.cache is None or not text or len(text) > self.max_cached_chars:
+            return None
+        return cache_key(self._voice_id, text, {"sample_rate": self.sample_rate})
+
+    def _synthesize_into_cache(self, text: str, key: Optional[str]) -> Iterator[np.ndarray]:
+        # The outcome stays local to this generator: concurrent streams on one
+        # instance must not cache each other's truncated phrases.
+        chunks: list[np.ndarray] = []
+        ok = yield from self._synthesize_chunks(text, chunks if key is not None else None)
+        if key is not None and ok and chunks:
+            self.cache.put(key, np.concatenate(chunks))
+
+    def _synthesize_chunks(self, text: str, keep: Optional[list] = None) -> Generator[np.ndarray, None, bool]:
+        """
+        Yield PCM chunks from a Piper run (also appended to `keep`); returns
+        True only if Piper exited cleanly.
+        """
+        if not text:
+            return False
+        try:
+            piper_proc = subprocess.Popen(
+                [str(self.piper_bin), "--model", str(self.model_path), "--output_raw"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except Exception as exc:  # pragma: no cover - defensive
+            self._log.error("TTS synthesis error: %s", exc)
+            return False
+
+        try:
+            assert piper_proc.stdin is not None and piper_proc.stdout is not None
+            piper_proc.stdin.write(text.encode("utf-8"))
+            piper_proc.stdin.close()
 
+            # Yield audio as Piper produces it so playback starts before synthesis ends.
+            carry = b""
+            while True:
+                data = piper_proc.stdout.read1(self._chunk_bytes)
+                if not data:
+                    break
+                data = carry + data
+                usable = len(data) - (len(data) % 2)
+                carry = data[usable:]
+                if usable:
+                    pcm = np.frombuffer(data[:usable], dtype="<i2")
+                    if keep is not None:
+                        keep.append(pcm)
+                    yield pcm
+
+            piper_proc.wait(timeout=30)
+            if piper_proc.returncode != 0:
+                stderr_data = piper_proc.stderr.read() if piper_proc.stderr else b""
+                self._log.error("Piper failed (code=%s): %s", piper_proc.returncode, stderr_data.decode())
+                return False
+            return True
+        except subprocess.TimeoutExpired:
+            self._log.error("TTS synthesis timed out")
+            return False
+        finally:
+            if piper_proc.poll() is None:
+                piper_proc.kill()
+            for stream in (piper_proc.stdout, piper_proc.stderr):
+                if stream:
+                    stream.close()
+
+    def _speak_aplay(self, text: str) -> None:
         # Launch Piper and pipe its raw audio directly to aplay.
         try:
             piper_proc = subprocess.Popen(
@@ -48,7 +217,7 @@ class PiperTTS:
                 stderr=subprocess.PIPE,
             )
             aplay_proc = subprocess.Popen(
-                ["aplay", "-r", "22050", "-f", "S16_LE", "-t", "raw", "-"],
+                ["aplay", "-r", str(self.sample_rate), "-f", "S16_LE", "-t", "raw", "-"],
                 stdin=piper_proc.stdout,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
@@ -69,5 +238,3 @@ class PiperTTS:
             self._log.error("TTS playback timed out")
         except Exception as exc:  # pragma: no cover - defensive
             self._log.error("TTS playback error: %s", exc)
-
-
@@ -0,0 +1,498 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import wave
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.logger import get_logger
+
+DB_NAME = "archive.sqlite3"
+_EXTENSIONS = {"flac": "flac", "opus": "ogg", "wav": "wav"}
+_SOUNDFILE_FORMATS = {"flac": ("FLAC", "PCM_16"), "opus": ("OGG", "OPUS")}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    started REAL NOT NULL,
+    info TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS segments (
+    session TEXT NOT NULL,
+    segment INTEGER NOT NULL,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    transcript TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    audio TEXT,
+    status TEXT NOT NULL DEFAULT 'ok',
+    PRIMARY KEY (session, segment)
+);
+CREATE INDEX IF NOT EXISTS segments_started ON segments (started);
+CREATE TABLE IF NOT EXISTS translations (
+    session TEXT NOT NULL,
+    segment INTEGER NOT NULL,
+    target TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    PRIMARY KEY (session, segment, target)
+);
+"""
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts
+USING fts5(transcript, translation, content='segments', content_rowid='rowid');
+"""
+
+
+@dataclass(frozen=True)
+class ArchivedSegment:
+    session: str
+    segment: int
+    started: float  # wall-clock (epoch seconds) start of the speech
+    duration: float
+    source: str
+    target: str
+    transcript: str
+    translation: str
+    audio: Optional[str] = None  # file relative to the archive root
+    status: str = "ok"  # "failed" (processing raised) or "dropped" (too old to process)
+
+
+@dataclass(frozen=True)
+class ArchivedTranslation:
+    # An extra target language of a segment (see translation.hub.FanOut).
+    session: str
+    segment: int
+    target: str
+    translation: str
+
+
+def _connect(root: Path, readonly: bool = False) -> sqlite3.Connection:
+    path = root / DB_NAME
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    else:
+        root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        if "status" not in {row[1] for row in conn.execute("PRAGMA table_info(segments)")}:
+            # Archives written before segment statuses existed.
+            conn.execute("ALTER TABLE segments ADD COLUMN status TEXT NOT NULL DEFAULT 'ok'")
+        try:
+            conn.executescript(_FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            pass  # SQLite built without FTS5: search falls back to LIKE
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _has_fts(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'segments_fts'").fetchone() is not None
+
+
+class ArchiveWriter:
+    """
+    Keeps a record of every segment of a session (audio, transcript,
+    translation, timestamps) without doing any I/O on the caller's thread.
+    Segments that failed or were dropped unprocessed are kept too, marked by
+    their status, and record_translation() adds extra target languages.
+
+    record() only queues; a writer thread encodes the audio (FLAC or Opus
+    through the optional soundfile package, otherwise int16 WAV), writes one
+    file per segment and inserts a batch of rows into SQLite in WAL mode, so
+    ArchiveReader can search and export while a session is being written.
+    Nothing is ever updated in place. Queued audio is bounded by
+    max_pending_bytes: past it, segments are archived without their audio.
+
+    fsync="batch" makes each batch durable (files synced, then one commit),
+    "always" does so for every segment and "never" leaves it to the OS.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        audio_format: str = settings.archive_audio,
+        fsync: str = settings.archive_fsync,
+        batch_size: int = settings.archive_batch_size,
+        flush_interval: float = settings.archive_flush_interval,
+        max_pending_bytes: int = int(settings.archive_max_pending_mb * 1024 * 1024),
+        sample_rate: int = settings.sample_rate,
+        session: Optional[str] = None,
+        info: Optional[dict] = None,
+    ) -> None:
+        if audio_format not in (*_EXTENSIONS, "none"):
+            raise ValueError(f"Unknown archive audio format '{audio_format}'")
+        if fsync not in ("always", "batch", "never"):
+            raise ValueError(f"Unknown fsync policy '{fsync}'")
+        self.root = Path(root) if root else settings.archive_dir
+        self.audio_format = audio_format
+        self.fsync = fsync
+        self.batch_size = 1 if fsync == "always" else max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending_bytes = max_pending_bytes
+        self.sample_rate = sample_rate
+        self.session = session or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.started = time.time()
+        self.records = 0
+        self.translations = 0
+        self.audio_dropped = 0  # archived without audio because the queue was full
+        self.failed = 0
+        self.batches = 0
+        self.bytes_written = 0
+        self.write_seconds = 0.0
+        self._log = get_logger(__name__)
+        self._queue: queue.Queue = queue.Queue()
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+        self._soundfile: Any = None
+        if audio_format in _SOUNDFILE_FORMATS:
+            try:
+                import soundfile
+
+                self._soundfile = soundfile
+            except ImportError:
+                self._log.warning("soundfile not installed; archiving audio as int16 WAV instead of %s", audio_format)
+                self.audio_format = "wav"
+        # Create the store up front so a bad path fails at start-up, not in the writer.
+        conn = _connect(self.root)
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO sessions (id, started, info) VALUES (?, ?, ?)",
+                (self.session, self.started, json.dumps(info or {}, ensure_ascii=False)),
+            )
+        conn.close()
+        self._thread = threading.Thread(target=self._run, name="archive-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._pending_bytes
+
+    def record(
+        self,
+        segment: int,
+        audio: Optional[np.ndarray],
+        transcript: str,
+        translation: str,
+        started: float,
+        duration: float,
+        source: str = settings.source_language,
+        target: str = settings.translation_targets[0],
+        status: str = "ok",
+    ) -> None:
+        """
+        Queue one segment; never blocks. `started` is wall-clock epoch seconds.
+        """
+        if self.audio_format == "none":
+            audio = None
+        size = len(transcript) + len(translation) + (audio.nbytes if audio is not None else 0)
+        with self._lock:
+            if audio is not None and self._pending_bytes + size > self.max_pending_bytes:
+                size -= audio.nbytes
+                audio = None
+                self.audio_dropped += 1
+                dropped = True
+            else:
+                dropped = False
+            self._pending_bytes += size
+        if dropped:
+            self._log.warning("Archive writer behind; segment %d archived without audio", segment)
+        entry = ArchivedSegment(
+            self.session, segment, started, duration, source, target, transcript, translation, status=status
+        )
+        self._queue.put((entry, audio, size))
+
+    def record_translation(self, segment: int, target: str, translation: str) -> None:
+        """
+        Queue another target language's translation of an archived segment; never blocks.
+        """
+        size = len(translation)
+        with self._lock:
+            self._pending_bytes += size
+        self._queue.put((ArchivedTranslation(self.session, segment, target, translation), None, size))
+
+    def close(self, timeout: float = 30.0) -> None:
+        """
+        Write out everything queued and stop the writer.
+        """
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        conn = _connect(self.root)
+        conn.execute(f"PRAGMA synchronous={'OFF' if self.fsync == 'never' else 'FULL'}")
+        fts = _has_fts(conn)
+        stopping = False
+        try:
+            while not stopping:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._write(conn, batch, fts)
+        finally:
+            try:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                pass
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, batch: list, fts: bool) -> None:
+        started = time.perf_counter()
+        rows = []
+        written: list[Path] = []
+        for entry, audio, _ in batch:
+            path = None
+            if audio is not None:
+                try:
+                    path = self._write_audio(entry, audio)
+                    written.append(self.root / path)
+                except Exception as exc:
+                    self._log.error("Could not archive audio of segment %d: %s", entry.segment, exc)
+            rows.append((entry, path))
+        try:
+            if self.fsync != "never" and written:
+                # Audio first, so a committed row never points at a file lost in a crash.
+                for path in written:
+                    _fsync_path(path)
+                _fsync_path(written[0].parent)
+            with conn:
+                for entry, path in rows:
+                    if isinstance(entry, ArchivedTranslation):
+                        conn.execute(
+                            "INSERT OR IGNORE INTO translations (session, segment, target, translation) "
+                            "VALUES (?, ?, ?, ?)",
+                            (entry.session, entry.segment, entry.target, entry.translation),
+                        )
+                        continue
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO segments "
+                        "(session, segment, started, duration, source, target, transcript, translation, audio, status) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            entry.session,
+                            entry.segment,
+                            entry.started,
+                            entry.duration,
+                            entry.source,
+                            entry.target,
+                            entry.transcript,
+                            entry.translation,
+                            path,
+                            entry.status,
+                        ),
+                    )
+                    if fts and cursor.rowcount:
+                        conn.execute(
+                            "INSERT INTO segments_fts (rowid, transcript, translation) VALUES (?, ?, ?)",
+                            (cursor.lastrowid, entry.transcript, entry.translation),
+                        )
+            extra = sum(isinstance(entry, ArchivedTranslation) for entry, _ in rows)
+            self.records += len(rows) - extra
+            self.translations += extra
+        except (OSError, sqlite3.Error) as exc:
+            self.failed += len(rows)
+            self._log.error("Could not archive %d segments: %s", len(rows), exc)
+        finally:
+            with self._lock:
+                self._pending_bytes -= sum(size for _, _, size in batch)
+            self.batches += 1
+            self.write_seconds += time.perf_counter() - started
+
+    def _write_audio(self, entry: ArchivedSegment, audio: np.ndarray) -> str:
+        relative = f"{entry.session}/{entry.segment:06d}.{_EXTENSIONS[self.audio_format]}"
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767.0).astype(np.int16)
+        tmp = path.with_name(path.name + ".tmp")
+        if self._soundfile is not None:
+            container, subtype = _SOUNDFILE_FORMATS[self.audio_format]
+            self._soundfile.write(str(tmp), pcm, self.sample_rate, format=container, subtype=subtype)
+        else:
+            with wave.open(str(tmp), "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(self.sample_rate)
+                wf.writeframes(pcm.tobytes())
+        os.replace(tmp, path)
+        self.bytes_written += path.stat().st_size
+        return relative
+
+
+def _fsync_path(path: Path) -> None:
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ArchiveReader:
+    """
+    Read side of the archive: list sessions, full-text search (FTS5 when the
+    SQLite build has it, LIKE otherwise) and SRT / JSONL export.
+    """
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self.root = Path(root) if root else settings.archive_dir
+
+    def sessions(self) -> list[dict]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT s.id, s.started, s.info, COUNT(g.segment) AS segments, COALESCE(SUM(g.duration), 0) AS seconds "
+                "FROM sessions s LEFT JOIN segments g ON g.session = s.id GROUP BY s.id ORDER BY s.started"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def segments(self, session: str) -> Iterator[ArchivedSegment]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT * FROM segments WHERE session = ? ORDER BY segment", (session,)).fetchall()
+        return (ArchivedSegment(**row) for row in rows)
+
+    def translations(self, session: str) -> dict[int, dict[str, str]]:
+        """
+        Extra target languages per segment: {segment: {target: translation}}.
+        """
+        with closing(self._connect()) as conn:
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'translations'").fetchone() is None:
+                return {}
+            rows = conn.execute("SELECT * FROM translations WHERE session = ?", (session,)).fetchall()
+        extra: dict[int, dict[str, str]] = {}
+        for row in rows:
+            extra.setdefault(row["segment"], {})[row["target"]] = row["translation"]
+        return extra
+
+    def search(self, text: str, session: Optional[str] = None, limit: int = 50) -> list[ArchivedSegment]:
+        """
+        Segments whose transcript or translation contains all the words in `text`.
+        """
+        words = text.split()
+        if not words:
+            return []
+        with closing(self._connect()) as conn:
+            if _has_fts(conn):
+                query = " ".join('"' + word.replace('"', '""') + '"' for word in words)
+                sql = (
+                    "SELECT g.* FROM segments_fts f JOIN segments g ON g.rowid = f.rowid "
+                    "WHERE segments_fts MATCH ?"
+                )
+                params: list[Any] = [query]
+            else:
+                sql = "SELECT g.* FROM segments g WHERE " + " AND ".join(
+                    "(g.transcript LIKE ? OR g.translation LIKE ?)" for _ in words
+                )
+                params = [pattern for word in words for pattern in (f"%{word}%",) * 2]
+            if session is not None:
+                sql += " AND g.session = ?"
+                params.append(session)
+            sql += " ORDER BY g.started LIMIT ?"
+            params.append(limit)
+            rows = conn.execute(sql, params).fetchall()
+        return [ArchivedSegment(**row) for row in rows]
+
+    def export_jsonl(self, session: str, path: Path) -> int:
+        count = 0
+        extra = self.translations(session)
+        with open(path, "w", encoding="utf-8") as fh:
+            for segment in self.segments(session):
+                record = asdict(segment)
+                if segment.segment in extra:
+                    record["translations"] = extra[segment.segment]
+                fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+    def export_srt(self, session: str, path: Path, text: str = "both") -> int:
+        """
+        Subtitles timed from the session start; text is "transcript", "translation" or "both".
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT started FROM sessions WHERE id = ?", (session,)).fetchone()
+        if row is None:
+            raise KeyError(f"No archived session '{session}'")
+        origin = row["started"]
+        count = 0
+        with open(path, "w", encoding="utf-8") as fh:
+            for segment in self.segments(session):
+                lines = {
+                    "transcript": [segment.transcript],
+                    "translation": [segment.translation],
+                    "both": [segment.transcript, segment.translation],
+                }[text]
+                if not any(lines):
+                    continue  # dropped, failed before STT, or silence
+                start = max(0.0, segment.started - origin)
+                count += 1
+                fh.write(f"{count}\n{_srt_time(start)} --> {_srt_time(start + segment.duration)}\n")
+                fh.write("\n".join(line for line in lines if line) + "\n\n")
+        return count
+
+    def _connect(self) -> sqlite3.Connection:
+        if not (self.root / DB_NAME).is_file():
+            raise FileNotFoundError(f"No archive at {self.root}")
+        return _connect(self.root, readonly=True)
+
+
+def _srt_time(seconds: float) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Browse the session archive.")
+    parser.add_argument("--root", type=Path, default=settings.archive_dir)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("sessions", help="list archived sessions")
+    search = commands.add_parser("search", help="find segments by transcript or translation")
+    search.add_argument("text")
+    search.add_argument("--session")
+    search.add_argument("--limit", type=int, default=50)
+    export = commands.add_parser("export", help="write a session as SRT or JSONL")
+    export.add_argument("session")
+    export.add_argument("output", type=Path)
+    export.add_argument("--text", choices=("transcript", "translation", "both"), default="both")
+    args = parser.parse_args(argv)
+
+    reader = ArchiveReader(args.root)
+    if args.command == "sessions":
+        for session in reader.sessions():
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(session["started"]))
+            print(f"{session['id']}  {started}  {session['segments']} segments, {session['seconds']:.0f} s of speech")
+    elif args.command == "search":
+        for segment in reader.search(args.text, args.session, args.limit):
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(segment.started))
+            print(f"[{segment.session} #{segment.segment} {started}] {segment.transcript} | {segment.translation}")
+    elif args.output.suffix.lower() == ".srt":
+        print(f"{reader.export_srt(args.session, args.output, args.text)} subtitles written to {args.output}")
+    else:
+        print(f"{reader.export_jsonl(args.session, args.output)} segments written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
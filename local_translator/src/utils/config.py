@@ -9,14 +9,136 @@ class Settings:
     sample_rate: int = 16_000
     block_size: int = 480  # ~30 ms blocks at 16kHz
     channels: int = 1
+    capture_native_rate: bool = True  # open the mic at its native rate and resample
     vad_threshold: float = 0.5
+    energy_gate: bool = True  # skip the neural VAD on frames clearly below the noise floor
+    energy_gate_margin_db: float = 6.0  # dB above the adaptive floor that reaches the VAD
+    gate_lookback_frames: int = 10  # skipped frames kept to preserve speech onsets
+    denoise: bool = False  # spectral-gating noise suppression before the VAD (STT gets the raw audio)
+    denoise_threshold_db: float = 6.0  # bins this far above the noise profile pass untouched
+    denoise_reduction_db: float = 18.0  # attenuation of bins at or below the noise profile
+    denoise_budget_ms: float = 3.0  # per-block CPU time above which an overrun is reported
     max_silence_after_speech: float = 0.8  # seconds
+    latency_budget: float = 3.0  # seconds from end of speech to translated output
+    merge_short_seconds: float = 2.0  # under overload, merge queued segments shorter than this
+    merge_max_seconds: float = 8.0  # upper bound for a merged STT call
+    max_segment_lag: float = 10.0  # drop segments older than this without processing
     whisper_model_size: str = "small"
     whisper_device: str = "cuda"
     whisper_compute_type: str = "int8"
+    streaming_features: bool = True  # compute Whisper log-mel frames during capture
     translation_model_name: str = "Helsinki-NLP/opus-mt-es-en"
     translation_device: str = "cuda"  # -1 for CPU in HF pipeline
+    translation_num_beams: int = 4
+    source_language: str = "es"
+    translation_targets: tuple[str, ...] = ("en",)  # first one is the pipeline's own; the rest fan out
+    # "src-tgt" -> opus-mt model ("name >>tok<<" for multilingual models). Pairs without
+    # a model are routed through English (e.g. es-pt = es-en + en-pt).
+    translation_models: tuple[tuple[str, str], ...] = (
+        ("es-en", "Helsinki-NLP/opus-mt-es-en"),
+        ("en-es", "Helsinki-NLP/opus-mt-en-es"),
+        ("es-fr", "Helsinki-NLP/opus-mt-es-fr"),
+        ("en-fr", "Helsinki-NLP/opus-mt-en-fr"),
+        ("en-pt", "Helsinki-NLP/opus-mt-tc-big-en-pt >>por<<"),
+    )
+    translation_idle_unload: float = 300.0  # seconds before an unused fan-out model is freed
+    # "fixed": everything is transcribed as source_language. "detect": Whisper detects the
+    # language once per speaker turn (among conversation_languages) and segments already in
+    # the target are passed through untranslated. "bidirectional": as detect, but each turn
+    # is translated into the other conversation language and spoken with its voice.
+    language_mode: str = "fixed"
+    conversation_languages: tuple[str, ...] = ("es", "en")
+    language_confidence: float = 0.7  # detection probability needed to reuse it for the turn
+    language_turn_gap: float = 1.0  # seconds between segments that start a new speaker turn
+    # A segment decoded with the turn's cached language is detected again when the decode
+    # looks wrong (the speaker switched mid-turn): mean log-probability below this...
+    language_recheck_logprob: float = -1.0
+    # ...or no-speech probability above this (Whisper's own fallback thresholds).
+    language_recheck_no_speech: float = 0.6
+    strip_disfluencies: bool = True  # drop fillers and repeated words between STT and MT
+    # Filler sounds removed anywhere (letters may be stretched: "eh" also matches "eeehh")...
+    disfluency_fillers: tuple[tuple[str, tuple[str, ...]], ...] = (
+        ("es", ("eh", "em", "ehm", "mm", "hm", "uh")),
+        ("en", ("uh", "um", "uhm", "er", "erm", "mm", "hm")),
+    )
+    # ...and discourse markers removed only when they open a clause followed by a comma.
+    disfluency_markers: tuple[tuple[str, tuple[str, ...]], ...] = (
+        ("es", ("este", "o sea", "pues", "bueno", "digamos", "a ver", "en plan")),
+        ("en", ("well", "so", "like", "you know", "I mean", "basically")),
+    )
+    disfluency_max_ngram: int = 3  # longest immediate repetition collapsed ("la casa la casa")
+    # Words whose repetition is legitimate and never collapsed: spelled numbers ("dos dos
+    # tres", "veinte veinte") and grammatical doubles ("she had had enough").
+    disfluency_keep_repeats: tuple[tuple[str, tuple[str, ...]], ...] = (
+        ("es", (
+            "cero", "uno", "una", "dos", "tres", "cuatro", "cinco", "seis", "siete", "ocho", "nueve",
+            "diez", "once", "doce", "trece", "catorce", "quince", "veinte", "treinta", "cuarenta",
+            "cincuenta", "sesenta", "setenta", "ochenta", "noventa", "cien", "ciento", "mil",
+            "millón", "millones",
+        )),
+        ("en", (
+            "zero", "oh", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+            "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "twenty", "thirty", "forty",
+            "fifty", "sixty", "seventy", "eighty", "ninety", "hundred", "thousand", "million",
+            "had", "that",
+        )),
+    )
+    stt_tokens_per_second: float = 8.0  # Whisper new-token cap per second of audio
+    stt_token_margin: int = 16
+    mt_tokens_per_source_token: float = 1.6  # MarianMT new-token cap per source token
+    mt_token_margin: int = 10
+    repetition_max_ngram: int = 4  # abort decoding when an n-gram up to this size...
+    repetition_min_repeats: int = 4  # ...repeats back-to-back this many times
+    auto_profile: bool = True  # pick Whisper size/compute and MT beams by measured speed
+    stt_worker_process: bool = False  # host Whisper in a child process (audio via shared memory)
+    mt_worker_process: bool = False  # also host MarianMT in that process
+    remote_workers: tuple[str, ...] = ()  # "host:port" STT/MT worker nodes; empty = local models
+    remote_max_payload_mb: float = 16.0  # larger frames are refused (8 s of float32 audio is 0.5 MB)
+    calibration_headroom: float = 0.6  # share of latency_budget STT+MT may use per segment
+    auto_downgrade: bool = True  # step down/up the model ladder from the measured RTF
+    downgrade_rtf: float = 1.0  # sustained RTF above this loads a cheaper level
+    upgrade_rtf: float = 0.5  # sustained RTF below this goes back up a level
+    rtf_window_seconds: float = 30.0  # seconds of processed audio the RTF is averaged over
+    model_switch_cooldown: float = 60.0  # minimum seconds between automatic switches
+    tts_sample_rate: int = 22_050  # Piper medium voices
+    output_block_size: int = 1024  # ~46 ms blocks at 22.05kHz
+    # Piper voice per target language (fan-out and bidirectional mode).
+    tts_voices: tuple[tuple[str, str], ...] = (
+        ("en", "en_US-ryan-medium.onnx"),
+        ("es", "es_ES-davefx-medium.onnx"),
+        ("fr", "fr_FR-siwis-medium.onnx"),
+        ("pt", "pt_BR-faber-medium.onnx"),
+    )
+    tts_cache_mb: float = 32.0  # in-memory LRU of synthesized phrases; 0 disables the cache
+    tts_disk_cache: bool = False  # also keep synthesized phrases under models_dir/tts_cache
+    tts_preload: tuple[str, ...] = (
+        "Yes.",
+        "No.",
+        "Okay.",
+        "Thank you.",
+        "Thank you very much.",
+        "Good morning.",
+        "Hello.",
+        "Exactly.",
+        "Of course.",
+        "Very good.",
+    )
+    pipeline_tts: bool = False  # speak translations from InputPipeline
+    duplex_mode: str = "gate"  # "gate" or "duck" VAD while our TTS is playing
+    echo_cancellation: bool = False  # NLMS echo canceller on the mic during playback
+    memory_profile_interval: float = 0.0  # seconds between memory samples; 0 disables
+    profile_signal: str = "SIGPROF"  # kill -PROF <pid> samples every pipeline thread...
+    profile_seconds: float = 10.0  # ...for this long and writes collapsed stacks to profile_dir
+    offline_models: bool = False  # never fall back to the hub for models missing locally
+    archive: bool = False  # keep every segment's audio, transcript and translation in archive_dir
+    archive_audio: str = "flac"  # "flac" / "opus" (need soundfile), "wav" (int16) or "none"
+    archive_fsync: str = "batch"  # "always" (each segment), "batch" (each write batch) or "never"
+    archive_batch_size: int = 16  # segments per SQLite transaction...
+    archive_flush_interval: float = 2.0  # ...or whatever arrived within this many seconds
+    archive_max_pending_mb: float = 64.0  # queued audio beyond this is dropped (text still kept)
     models_dir: Path = Path(__file__).resolve().parents[2] / "models"
+    profile_dir: Path = Path(__file__).resolve().parents[2] / "profiles"
+    archive_dir: Path = Path(__file__).resolve().parents[2] / "archive"
 
 
 settings = Settings()
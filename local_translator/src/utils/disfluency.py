@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import threading
+import time
+from typing import Iterable, Optional, Pattern
+
+from local_translator.src.utils.config import settings
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+# Only commas, ellipses and spaces may separate a word from its repetition ("yo, yo...").
+_REPEAT_GAP = re.compile(r"[\s,]*(?:(?:\.\.\.|…)[\s,]*)?", re.UNICODE)
+_ELLIPSIS = re.compile(r"\s*(?:\.{2,}|…)\s*")
+_SPACE_BEFORE = re.compile(r"\s+([,.;:!?)])")
+_SPACE_AFTER = re.compile(r"([¿¡(])\s+")
+_COMMA_RUNS = re.compile(r"(?:\s*,)+")
+_COMMA_BEFORE_STOP = re.compile(r",\s*([.;:!?])")
+_EMPTY_MARKS = re.compile(r"¿\s*\?|¡\s*!")
+_LEADING = re.compile(r"^[\s,;:.]+")
+_SPACES = re.compile(r"\s{2,}")
+# Opening marks before the first letter of a sentence: "¿Qué...?", "(Sí)".
+_OPENERS = re.compile(r"^[¿¡(\"'«“]*")
+
+
+def _filler_pattern(fillers: Iterable[str]) -> Optional[Pattern[str]]:
+    # Letters may be stretched ("eh" also matches "eeeh", "mm" matches "mmmm").
+    alternatives = sorted(
+        ("".join(re.escape(c) + "+" if c.isalpha() else re.escape(c) for c in filler) for filler in fillers),
+        key=len,
+        reverse=True,
+    )
+    if not alternatives:
+        return None
+    # Swallow the commas around a filler so "quiero, eh, ir" becomes "quiero ir".
+    return re.compile(
+        r"(?:,\s*)?(?<!\w)(?:" + "|".join(alternatives) + r")(?!\w)(?:\s*(?:,|\.\.\.|…))?",
+        re.IGNORECASE | re.UNICODE,
+    )
+
+
+def _marker_pattern(markers: Iterable[str]) -> Optional[Pattern[str]]:
+    alternatives = sorted((r"\s+".join(map(re.escape, marker.split())) for marker in markers), key=len, reverse=True)
+    if not alternatives:
+        return None
+    # Discourse markers ("pues", "o sea") are ordinary words elsewhere: only drop them
+    # when they open a clause and are set off by a comma or an ellipsis.
+    return re.compile(
+        r"(^|[.;:!?¿¡…])\s*(?:(?:" + "|".join(alternatives) + r")\s*(?:,|\.\.\.|…)\s*)+",
+        re.IGNORECASE | re.UNICODE,
+    )
+
+
+class DisfluencyFilter:
+    """
+    Text clean-up between STT and MT: drops filler sounds ("eh", "em"),
+    clause-opening discourse markers ("pues, ...", "o sea, ..."), and
+    immediate repetitions of up to max_ngram words ("yo yo quiero",
+    "la casa, la casa es"). It then normalises whitespace and punctuation.
+    Numbers and the language's `keep` words are never collapsed: "dos dos
+    tres" may be a phone number, "veinte veinte" a year, and "she had had
+    enough" is grammatical.
+
+    Patterns are compiled once per language; clean() is a handful of regex
+    passes, tens of microseconds for a typical segment. The word tokens
+    removed are counted, so the savings show up in the pipeline report.
+    """
+
+    def __init__(
+        self,
+        fillers: Iterable[tuple[str, tuple[str, ...]]] = settings.disfluency_fillers,
+        markers: Iterable[tuple[str, tuple[str, ...]]] = settings.disfluency_markers,
+        max_ngram: int = settings.disfluency_max_ngram,
+        keep: Iterable[tuple[str, tuple[str, ...]]] = settings.disfluency_keep_repeats,
+    ) -> None:
+        fillers, markers = dict(fillers), dict(markers)
+        self.max_ngram = max_ngram
+        self.keep = {language: frozenset(word.lower() for word in words) for language, words in dict(keep).items()}
+        self._fillers = {language: _filler_pattern(words) for language, words in fillers.items()}
+        self._markers = {language: _marker_pattern(words) for language, words in markers.items()}
+        self.segments = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_in - self.tokens_out
+
+    @property
+    def saved_fraction(self) -> float:
+        return self.tokens_saved / self.tokens_in if self.tokens_in else 0.0
+
+    def clean(self, text: str, language: str = settings.source_language) -> str:
+        started = time.perf_counter()
+        result = self._clean(text, language)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.segments += 1
+            self.tokens_in += len(_WORD.findall(text))
+            self.tokens_out += len(_WORD.findall(result))
+            self.seconds += elapsed
+        return result
+
+    def _clean(self, text: str, language: str) -> str:
+        stripped = text.strip()
+        if not stripped:
+            return ""
+        capitalised = stripped[_OPENERS.match(stripped).end() :][:1].isupper()
+        filler = self._fillers.get(language)
+        if filler is not None:
+            stripped = filler.sub(" ", stripped)
+        marker = self._markers.get(language)
+        if marker is not None:
+            stripped = marker.sub(lambda m: m.group(1) + " ", stripped)
+        stripped = self._collapse_repeats(stripped, self.keep.get(language, frozenset()))
+        stripped = _normalise(stripped)
+        first = _OPENERS.match(stripped).end()
+        if capitalised and first < len(stripped):
+            stripped = stripped[:first] + stripped[first].upper() + stripped[first + 1 :]
+        return stripped
+
+    def _collapse_repeats(self, text: str, keep: frozenset[str]) -> str:
+        # Delete the first copy of each immediately repeated n-gram, longest first, until none is left.
+        while True:
+            matches = list(_WORD.finditer(text))
+            words = [m.group(0).lower() for m in matches]
+            cut = None
+            for i in range(len(words)):
+                for n in range(min(self.max_ngram, (len(words) - i) // 2), 0, -1):
+                    if words[i : i + n] != words[i + n : i + 2 * n] or any(w.isdigit() or w in keep for w in words[i : i + n]):
+                        continue
+                    gap = text[matches[i + n - 1].end() : matches[i + n].start()]
+                    if _REPEAT_GAP.fullmatch(gap):
+                        cut = (matches[i].start(), matches[i + n].start())
+                        break
+                if cut is not None:
+                    break
+            if cut is None:
+                return text
+            text = text[: cut[0]] + text[cut[1] :]
+
+
+def _normalise(text: str) -> str:
+    text = _ELLIPSIS.sub(lambda m: "... " if m.end() < len(m.string) else "...", text)
+    text = _EMPTY_MARKS.sub(" ", text)
+    text = _SPACE_BEFORE.sub(r"\1", text)
+    text = _SPACE_AFTER.sub(r"\1", text)
+    text = _COMMA_RUNS.sub(",", text)
+    text = _COMMA_BEFORE_STOP.sub(r"\1", text)
+    text = _LEADING.sub("", text)
+    text = _SPACES.sub(" ", text)
+    return text.strip().rstrip(",")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Clean transcripts (one per line) and report the tokens saved.")
+    parser.add_argument("file", nargs="?", type=argparse.FileType("r", encoding="utf-8"), default=sys.stdin)
+    parser.add_argument("--language", default=settings.source_language)
+    args = parser.parse_args(argv)
+
+    cleaner = DisfluencyFilter()
+    for line in args.file:
+        if line.strip():
+            print(cleaner.clean(line, args.language))
+    if cleaner.segments:
+        print(
+            f"{cleaner.tokens_saved} of {cleaner.tokens_in} tokens removed ({100 * cleaner.saved_fraction:.1f}%), "
+            f"{1e6 * cleaner.seconds / cleaner.segments:.0f} µs per segment",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
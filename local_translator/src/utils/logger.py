@@ -1,21 +1,194 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import logging.handlers
 import os
-from typing import Optional
+import queue
+import threading
+import time
+import weakref
+from typing import Any, Optional
+
+# Records are only queued by the calling thread; formatting and I/O happen on
+# one listener thread. A message template may be emitted RATE_LIMIT times per
+# REPORT_INTERVAL; the rest are counted and summarised once the interval ends.
+REPORT_INTERVAL = 1.0
+RATE_LIMIT = 5
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most `limit` records per (logger, level, template) and
+    interval; suppressed ones are only counted.
+    """
+
+    def __init__(self, limit: int = RATE_LIMIT, interval: float = REPORT_INTERVAL) -> None:
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self._windows: dict[tuple[str, int, Any], list] = {}  # key -> [window_start, emitted, suppressed]
+        self._closed: list[tuple[str, int, Any, int, float]] = []
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, record.msg)
+        now = record.created
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                if window is not None and window[2]:
+                    self._closed.append((*key, window[2], now - window[0]))
+                self._windows[key] = [now, 1, 0]
+                return True
+            if window[1] < self.limit:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+    def take_suppressed(self, now: float) -> list[tuple[str, int, Any, int, float]]:
+        """
+        Close finished windows; returns (name, level, template, suppressed, seconds) for each.
+        """
+        with self._lock:
+            report, self._closed = self._closed, []
+            for key, window in list(self._windows.items()):
+                elapsed = now - window[0]
+                if elapsed < self.interval:
+                    continue
+                if window[2]:
+                    report.append((*key, window[2], elapsed))
+                del self._windows[key]
+        return report
+
+
+class EventCounter:
+    """
+    Counter for real-time threads (audio callbacks) that must not log: add()
+    is a plain integer increment, and the log listener reports the events
+    counted during each interval with `message`, a %-template receiving
+    count, seconds and detail (the last value passed to add()).
+
+        dropped = EventCounter(log, "Audio queue full: dropped %(count)d frames in last %(seconds).1f s")
+        dropped.add()  # in the callback
+    """
+
+    def __init__(self, logger: logging.Logger, message: str, level: int = logging.WARNING) -> None:
+        self.logger = logger
+        self.message = message
+        self.level = level
+        self.count = 0
+        self.detail: Any = None
+        self._reported = 0
+        self._since = time.monotonic()
+        _counters.add(self)
+
+    def add(self, n: int = 1, detail: Any = None) -> None:
+        self.count += n
+        if detail is not None:
+            self.detail = detail
+
+    def report(self, now: float) -> None:
+        count = self.count
+        delta = count - self._reported
+        if not delta:
+            self._since = now
+            return
+        self._reported = count
+        seconds, self._since = now - self._since, now
+        self.logger.log(self.level, self.message, {"count": delta, "seconds": seconds, "detail": self.detail})
+
+
+class _Listener(logging.handlers.QueueListener):
+    """
+    QueueListener that wakes up every REPORT_INTERVAL to publish rate-limit
+    summaries and EventCounter totals, even when nothing else is logged.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, handler: logging.Handler, limiter: RateLimitFilter) -> None:
+        super().__init__(log_queue, handler, respect_handler_level=True)
+        self.limiter = limiter
+        self._next_report = time.monotonic() + REPORT_INTERVAL
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            self._maybe_report()
+            try:
+                return self.queue.get(timeout=REPORT_INTERVAL)
+            except queue.Empty:
+                continue
+
+    def _maybe_report(self) -> None:
+        now = time.monotonic()
+        if now < self._next_report:
+            return
+        self._next_report = now + REPORT_INTERVAL
+        for counter in list(_counters):
+            counter.report(now)
+        for name, level, template, suppressed, seconds in self.limiter.take_suppressed(time.time()):
+            logging.getLogger(name).log(
+                level,
+                "(suppressed %d more \"%s\" messages in last %.1f s)",
+                suppressed,
+                template,
+                seconds,
+            )
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process, so no need to pre-format for pickling: the listener formats.
+        return record
+
+
+_counters: "weakref.WeakSet[EventCounter]" = weakref.WeakSet()
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_limiter = RateLimitFilter()
+_listener: Optional[_Listener] = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener() -> None:
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        handler = logging.StreamHandler()
+        handler.setFormatter(
+            logging.Formatter(
+                fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+                datefmt="%H:%M:%S",
+            )
+        )
+        _listener = _Listener(_queue, handler, _limiter)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """
+    Publish pending counters and write out everything still queued.
+    """
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is None:
+        return
+    now = time.monotonic()
+    for counter in list(_counters):
+        counter.report(now)
+    listener.stop()
 
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     logger = logging.getLogger(name)
     if logger.handlers:
         return logger
+    _start_listener()
     logger.setLevel(logging.INFO)
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        datefmt="%H:%M:%S",
-    )
-    handler.setFormatter(formatter)
+    handler = _DeferredQueueHandler(_queue)
+    handler.addFilter(_limiter)
     logger.addHandler(handler)
 
     # Allow overriding level via env var for debugging.
@@ -24,5 +197,3 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
         logger.setLevel(level.upper())
     logger.propagate = False
     return logger
-
-
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import collections
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Deque, Mapping, Optional, Sequence
+
+import numpy as np
+
+from local_translator.src.utils.logger import get_logger
+
+MB = 1024.0 * 1024.0
+
+# Allocation tracebacks are attributed to the innermost frame matching a marker.
+DEFAULT_STAGE_MARKERS: Mapping[str, Sequence[str]] = {
+    "capture": ("src/audio/",),
+    "vad": ("src/vad/", "onnxruntime"),
+    "stt": ("src/stt/", "faster_whisper", "ctranslate2"),
+    "translation": ("src/translation/", "transformers", "tokenizers"),
+    "tts": ("src/tts/",),
+    "pipeline": ("main_input_test.py", "live_translator"),
+}
+
+
+class MemoryGrowthError(RuntimeError):
+    """Raised when memory keeps growing over a long-running session."""
+
+
+@dataclass
+class MemorySample:
+    timestamp: float
+    rss_mb: float
+    traced_mb: Optional[float] = None
+    gpu_mb: Optional[float] = None
+    stages_mb: dict[str, float] = field(default_factory=dict)
+
+
+def current_rss_mb() -> float:
+    """
+    Resident set size of this process in MB (falls back to peak RSS off Linux).
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def gpu_allocated_mb() -> Optional[float]:
+    """
+    Memory held by torch CUDA tensors, only if torch is already imported.
+    """
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return None
+    try:
+        if torch.cuda.is_available():
+            return torch.cuda.memory_allocated() / MB
+    except Exception:  # pragma: no cover - defensive
+        return None
+    return None
+
+
+def detect_growth(
+    values: Sequence[float],
+    min_growth: float,
+    min_rising_fraction: float = 0.7,
+) -> Optional[str]:
+    """
+    Return a description if values grow steadily by more than min_growth, else None.
+    Steady means the last-quarter mean exceeds the first-quarter mean by min_growth
+    and most consecutive steps do not go down.
+    """
+    if len(values) < 4:
+        return None
+    data = np.asarray(values, dtype=np.float64)
+    quarter = max(1, len(data) // 4)
+    growth = float(data[-quarter:].mean() - data[:quarter].mean())
+    rising = float(np.mean(np.diff(data) >= 0.0))
+    if growth > min_growth and rising >= min_rising_fraction:
+        return f"grew {growth:.1f}MB over {len(data)} samples ({rising:.0%} of steps rising)"
+    return None
+
+
+class MemoryMonitor:
+    """
+    Opt-in background sampler of RSS, tracemalloc usage per pipeline stage and
+    torch GPU memory. Flags steady growth across samples.
+    """
+
+    def __init__(
+        self,
+        interval: float = 30.0,
+        trace: bool = True,
+        trace_frames: int = 16,
+        top_n: int = 10,
+        history: int = 2880,
+        stage_markers: Mapping[str, Sequence[str]] = DEFAULT_STAGE_MARKERS,
+    ) -> None:
+        self.interval = interval
+        self.trace = trace
+        self.trace_frames = trace_frames
+        self.top_n = top_n
+        self.stage_markers = stage_markers
+        self.samples: Deque[MemorySample] = collections.deque(maxlen=history)
+        self.top_allocators: list[str] = []
+        self._started_tracing = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._log = get_logger(__name__)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracing = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._log.info("Memory monitor started (interval=%.0fs, tracemalloc=%s)", self.interval, self.trace)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self._thread = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def sample(self) -> MemorySample:
+        """
+        Take one sample now and append it to the history.
+        """
+        sample = MemorySample(timestamp=time.time(), rss_mb=current_rss_mb(), gpu_mb=gpu_allocated_mb())
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (tracemalloc.Filter(False, tracemalloc.__file__),)
+            )
+            stats = snapshot.statistics("traceback")
+            sample.traced_mb = sum(stat.size for stat in stats) / MB
+            sample.stages_mb = self._by_stage(stats)
+            self.top_allocators = [
+                f"{stat.size / MB:.2f}MB in {stat.count} blocks at {stat.traceback[-1]}"
+                for stat in stats[: self.top_n]
+            ]
+        self.samples.append(sample)
+        return sample
+
+    def check_growth(self, min_growth_mb: float = 100.0, since: Optional[float] = None) -> list[str]:
+        """
+        Describe every series (RSS, traced, GPU, per stage) that grew steadily.
+        since is a time.time() timestamp; earlier samples (warmup) are ignored.
+        """
+        samples = [s for s in self.samples if since is None or s.timestamp >= since]
+        problems = []
+        series: dict[str, list[float]] = {
+            "rss": [s.rss_mb for s in samples],
+            "traced": [s.traced_mb for s in samples if s.traced_mb is not None],
+            "gpu": [s.gpu_mb for s in samples if s.gpu_mb is not None],
+        }
+        for stage in self.stage_markers:
+            series[f"stage:{stage}"] = [s.stages_mb.get(stage, 0.0) for s in samples if s.stages_mb]
+        for name, values in series.items():
+            # Per-stage series are much smaller than RSS; scale the bar accordingly.
+            limit = min_growth_mb if name in ("rss", "gpu") else min_growth_mb / 4
+            problem = detect_growth(values, limit)
+            if problem:
+                problems.append(f"{name} {problem}")
+        return problems
+
+    def assert_no_growth(self, min_growth_mb: float = 100.0, since: Optional[float] = None) -> None:
+        problems = self.check_growth(min_growth_mb, since)
+        if problems:
+            raise MemoryGrowthError("; ".join(problems))
+
+    def report(self) -> None:
+        """
+        Log the latest sample and top allocators.
+        """
+        if not self.samples:
+            return
+        last = self.samples[-1]
+        self._log.info(
+            "Memory: rss=%.1fMB traced=%s gpu=%s stages=%s",
+            last.rss_mb,
+            f"{last.traced_mb:.1f}MB" if last.traced_mb is not None else "-",
+            f"{last.gpu_mb:.1f}MB" if last.gpu_mb is not None else "-",
+            ", ".join(f"{k}={v:.1f}MB" for k, v in sorted(last.stages_mb.items())),
+        )
+        for line in self.top_allocators:
+            self._log.info("  %s", line)
+
+    def _by_stage(self, stats: list[tracemalloc.Statistic]) -> dict[str, float]:
+        totals = dict.fromkeys(self.stage_markers, 0.0)
+        totals["other"] = 0.0
+        for stat in stats:
+            totals[self._stage_of(stat.traceback)] += stat.size / MB
+        return totals
+
+    def _stage_of(self, traceback: tracemalloc.Traceback) -> str:
+        # Frames go from oldest to most recent; the innermost match wins.
+        for frame in reversed(traceback):
+            filename = frame.filename.replace("\\", "/")
+            for stage, markers in self.stage_markers.items():
+                if any(marker in filename for marker in markers):
+                    return stage
+        return "other"
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as exc:  # pragma: no cover - defensive
+                self._log.error("Memory sampling failed: %s", exc)
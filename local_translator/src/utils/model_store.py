@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.logger import get_logger
+
+MANIFEST_NAME = "manifest.json"
+STAMP_NAME = ".verified.json"
+# Where stamps go when the store itself is read-only (e.g. a packaged deployment).
+STAMP_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "local_translator" / "verified"
+
+
+class ModelIntegrityError(RuntimeError):
+    """Raised when a local artifact is missing files or fails its checksum."""
+
+
+@dataclass
+class Artifact:
+    name: str
+    source: str  # "hf" (Hugging Face repo) or "silero" (copied from the silero-vad package)
+    repo_id: Optional[str] = None
+    revision: str = "main"
+    allow_patterns: list[str] = field(default_factory=list)
+    # Filled in by prefetch: relative path -> sha256. Empty means "not pinned yet".
+    files: dict[str, str] = field(default_factory=dict)
+    resolved_revision: Optional[str] = None
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelStore:
+    """
+    Local, checksum-pinned model artifacts under settings.models_dir.
+
+    The manifest lists every artifact the app may load. `prefetch` downloads them
+    once (on a connected machine) and records a sha256 per file; at runtime
+    `local_path` resolves strictly from disk and verifies the pinned checksums.
+    Full hashes are cached per file (size + mtime) so warm starts only stat.
+    """
+
+    def __init__(self, root: Optional[Path] = None, manifest_path: Optional[Path] = None) -> None:
+        self.root = Path(root or settings.models_dir)
+        self.manifest_path = Path(manifest_path or self.root / MANIFEST_NAME)
+        self._log = get_logger(__name__)
+        self.artifacts = self._load_manifest()
+
+    def artifact_dir(self, name: str) -> Path:
+        return self.root / name
+
+    def find(self, repo_id: str) -> Optional[Artifact]:
+        """
+        Return the artifact pinned for a hub repo id (e.g. "Helsinki-NLP/opus-mt-es-en").
+        """
+        for artifact in self.artifacts.values():
+            if artifact.repo_id == repo_id:
+                return artifact
+        return None
+
+    def local_path(self, repo_id_or_name: str, verify: bool = True) -> Optional[Path]:
+        """
+        Local directory for an artifact if it has been prefetched, else None.
+        Raises ModelIntegrityError if it is present but incomplete or corrupt, and
+        FileNotFoundError if settings.offline_models is set and it was never fetched.
+        """
+        artifact = self.artifacts.get(repo_id_or_name) or self.find(repo_id_or_name)
+        directory = self.artifact_dir(artifact.name) if artifact else None
+        if artifact is None or not artifact.files or not directory.is_dir():
+            if settings.offline_models:
+                raise FileNotFoundError(
+                    f"Model '{repo_id_or_name}' is not in the local store {self.root}; "
+                    "run `python -m local_translator.src.utils.model_store prefetch`"
+                )
+            return None
+        if verify:
+            self.verify(artifact.name)
+        return directory
+
+    def verify(self, name: str, full: bool = False) -> None:
+        """
+        Check every pinned file. With full=False files whose size and mtime match the
+        last successful check are not re-hashed.
+        """
+        artifact = self.artifacts[name]
+        directory = self.artifact_dir(name)
+        stamp_paths = self._stamp_paths(name)
+        stamp = {}
+        if not full:
+            for stamp_path in stamp_paths:
+                try:
+                    stamp = json.loads(stamp_path.read_text())
+                    break
+                except (OSError, ValueError):
+                    continue
+
+        updated = dict(stamp)
+        for rel, expected in artifact.files.items():
+            path = directory / rel
+            if not path.is_file():
+                raise ModelIntegrityError(f"{name}: missing file {rel}")
+            info = path.stat()
+            key = [info.st_size, info.st_mtime_ns, expected]
+            if stamp.get(rel) == key:
+                continue
+            actual = sha256_file(path)
+            if actual != expected:
+                raise ModelIntegrityError(f"{name}: checksum mismatch for {rel}")
+            updated[rel] = key
+        if updated != stamp:
+            self._write_stamp(name, stamp_paths, updated)
+
+    def _stamp_paths(self, name: str) -> list[Path]:
+        return [self.artifact_dir(name) / STAMP_NAME, STAMP_CACHE_DIR / f"{name}.json"]
+
+    def _write_stamp(self, name: str, paths: list[Path], stamp: dict) -> None:
+        # Only a speed-up for the next start, so a read-only store is not an error.
+        text = json.dumps(stamp, indent=2)
+        for path in paths:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(text)
+                return
+            except OSError:
+                continue
+        self._log.warning("%s: could not save the verification stamp; files will be re-hashed next start", name)
+
+    def prefetch(self, names: Optional[list[str]] = None, repin: bool = False) -> None:
+        """
+        Download artifacts into the store and pin their checksums in the manifest.
+        Already pinned artifacts are verified against their pins instead (unless repin).
+        """
+        for name in names or list(self.artifacts):
+            artifact = self.artifacts[name]
+            directory = self.artifact_dir(name)
+            directory.mkdir(parents=True, exist_ok=True)
+            self._log.info("Prefetching %s", name)
+            if artifact.source == "hf":
+                self._fetch_hf(artifact, directory)
+            elif artifact.source == "silero":
+                self._fetch_silero(directory)
+            else:
+                raise ValueError(f"{name}: unknown artifact source {artifact.source}")
+
+            files = {
+                str(path.relative_to(directory)): sha256_file(path)
+                for path in sorted(directory.rglob("*"))
+                if path.is_file() and path.name != STAMP_NAME and ".cache" not in path.parts
+            }
+            if artifact.files and not repin:
+                if files != artifact.files:
+                    raise ModelIntegrityError(f"{name}: downloaded files do not match the pinned manifest")
+            else:
+                artifact.files = files
+            self.verify(name, full=True)
+        self._save_manifest()
+
+    def _fetch_hf(self, artifact: Artifact, directory: Path) -> None:
+        from huggingface_hub import HfApi, snapshot_download
+
+        # Pin the branch/tag to a commit first, so the files downloaded are the
+        # ones of the sha recorded in the manifest.
+        revision = artifact.resolved_revision
+        if revision is None:
+            revision = HfApi().model_info(artifact.repo_id, revision=artifact.revision).sha
+        snapshot_download(
+            repo_id=artifact.repo_id,
+            revision=revision,
+            local_dir=str(directory),
+            allow_patterns=artifact.allow_patterns or None,
+        )
+        artifact.resolved_revision = revision
+
+    def _fetch_silero(self, directory: Path) -> None:
+        # Deferred import: silero_vad itself resolves its model through this store.
+        from local_translator.src.vad.silero_vad import MODEL_FILENAME, find_silero_model
+
+        target = directory / MODEL_FILENAME
+        if not target.is_file():
+            shutil.copy2(find_silero_model(), target)
+
+    def _load_manifest(self) -> dict[str, Artifact]:
+        if not self.manifest_path.is_file():
+            return {}
+        raw = json.loads(self.manifest_path.read_text())
+        return {name: Artifact(name=name, **entry) for name, entry in raw.get("artifacts", {}).items()}
+
+    def _save_manifest(self) -> None:
+        artifacts = {}
+        for name, artifact in self.artifacts.items():
+            entry = dict(artifact.__dict__)
+            entry.pop("name")
+            artifacts[name] = entry
+        self.manifest_path.write_text(json.dumps({"artifacts": artifacts}, indent=2) + "\n")
+
+
+_default_store: Optional[ModelStore] = None
+
+
+def get_model_store() -> ModelStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = ModelStore()
+    return _default_store
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the local model store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    prefetch = sub.add_parser("prefetch", help="Download and pin artifacts")
+    prefetch.add_argument("names", nargs="*")
+    prefetch.add_argument("--repin", action="store_true", help="Accept new files/checksums")
+    verify = sub.add_parser("verify", help="Re-hash every local artifact")
+    verify.add_argument("names", nargs="*")
+    sub.add_parser("list", help="Show artifacts and their state")
+    args = parser.parse_args(argv)
+
+    store = ModelStore()
+    if args.command == "prefetch":
+        store.prefetch(args.names or None, repin=args.repin)
+    elif args.command == "verify":
+        failed = False
+        for name in args.names or list(store.artifacts):
+            try:
+                store.verify(name, full=True)
+                print(f"✅ {name}")
+            except (ModelIntegrityError, KeyError) as exc:
+                failed = True
+                print(f"❌ {name}: {exc}")
+        if failed:
+            sys.exit(1)
+    else:
+        for name, artifact in store.artifacts.items():
+            state = "pinned" if artifact.files else "not fetched"
+            present = "present" if store.artifact_dir(name).is_dir() else "missing"
+            print(f"{name:<24} {artifact.repo_id or artifact.source:<36} {state}, {present}")
+
+
+if __name__ == "__main__":
+    main()
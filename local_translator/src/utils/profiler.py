@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import collections
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Counter, Optional
+
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.logger import get_logger
+
+
+class StageProfiler:
+    """
+    On-demand wall-clock sampling profiler for the pipeline threads.
+
+    Threads declare their stage once (`register("vad")`) and may refine it per
+    unit of work (`annotate("stt", segment=12)`); both are a dict store, so the
+    hooks cost next to nothing while no capture is running. `start(seconds)`
+    launches a sampler thread that reads every thread's stack at `interval`
+    and, when done, writes collapsed stacks ("stage;segment 12;f1;f2 count",
+    the input format of flamegraph.pl / speedscope) per stage under out_dir.
+    """
+
+    def __init__(self, interval: float = 0.005, out_dir: Optional[Path] = None, max_depth: int = 96) -> None:
+        self.interval = interval
+        self.out_dir = Path(out_dir) if out_dir else settings.profile_dir
+        self.max_depth = max_depth
+        self.last_dump: list[Path] = []
+        self._log = get_logger(__name__)
+        self._stages: dict[int, str] = {}
+        self._phases: dict[int, Optional[str]] = {}
+        self._segments: dict[int, Optional[int]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def register(self, stage: str) -> None:
+        """
+        Name the calling thread's pipeline stage (capture, vad, stt, mt, tts...).
+        """
+        self._stages[threading.get_ident()] = stage
+
+    def annotate(self, stage: Optional[str] = None, segment: Optional[int] = None) -> None:
+        """
+        Label what the calling thread works on now; None falls back to its registered stage.
+        """
+        ident = threading.get_ident()
+        self._phases[ident] = stage
+        self._segments[ident] = segment
+
+    def unregister(self) -> None:
+        """
+        Forget the calling thread; short-lived helper threads call this on exit so the
+        maps stay bounded and a recycled thread ident does not inherit their labels.
+        """
+        ident = threading.get_ident()
+        self._stages.pop(ident, None)
+        self._phases.pop(ident, None)
+        self._segments.pop(ident, None)
+
+    def current_segment(self) -> Optional[int]:
+        """
+        Segment the calling thread is annotated with (to hand over to helper threads).
+        """
+        return self._segments.get(threading.get_ident())
+
+    def start(self, seconds: float = 10.0) -> bool:
+        """
+        Profile for `seconds` in the background; False if a capture is already running.
+        """
+        if self.active:
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(seconds,), name="stage-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+    def capture(self, seconds: float) -> Counter[str]:
+        """
+        Sample for `seconds` on the calling thread and return the collapsed stacks.
+        """
+        own = threading.get_ident()
+        counts: Counter[str] = collections.Counter()
+        deadline = time.monotonic() + seconds
+        names: dict[int, str] = {}
+        next_names = 0.0
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            now = time.monotonic()
+            if now >= next_names:
+                names = {t.ident: t.name for t in threading.enumerate() if t.ident is not None}
+                next_names = now + 1.0
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stage = self._phases.get(ident) or self._stages.get(ident) or names.get(ident, f"thread-{ident}")
+                prefix = stage
+                segment = self._segments.get(ident)
+                if segment is not None:
+                    prefix += f";segment {segment}"
+                counts[prefix + ";" + self._collapse(frame)] += 1
+            self._stop.wait(self.interval)
+        return counts
+
+    def dump(self, counts: Counter[str], tag: Optional[str] = None) -> list[Path]:
+        """
+        Write one collapsed-stack file per stage plus an all-stages file.
+        """
+        tag = tag or time.strftime("%Y%m%d-%H%M%S")
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        by_stage: dict[str, list[str]] = collections.defaultdict(list)
+        for stack, count in counts.most_common():
+            line = f"{stack} {count}"
+            by_stage[stack.split(";", 1)[0]].append(line)
+            by_stage["all"].append(line)
+        paths = []
+        for stage, lines in by_stage.items():
+            safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in stage)
+            path = self.out_dir / f"{tag}-{safe}.collapsed"
+            path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            paths.append(path)
+        return paths
+
+    def install_signal(self, signum: int = signal.SIGPROF, seconds: float = 10.0) -> None:
+        """
+        Start a capture whenever the process receives `signum` (e.g. kill -PROF <pid>).
+        """
+        signal.signal(signum, lambda _signum, _frame: self.start(seconds))
+
+    def _run(self, seconds: float) -> None:
+        self._log.info("Profiling pipeline threads for %.1fs", seconds)
+        started = time.perf_counter()
+        counts = self.capture(seconds)
+        self.last_dump = self.dump(counts)
+        self._log.info(
+            "Profile: %d samples in %.1fs written to %s",
+            sum(counts.values()),
+            time.perf_counter() - started,
+            self.out_dir,
+        )
+
+    def _collapse(self, frame) -> str:  # type: ignore[no-untyped-def]
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+
+# Process-wide instance the pipeline modules annotate.
+profiler = StageProfiler()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import math
+import re
+from typing import Hashable, Sequence
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def find_loop(
+    tokens: Sequence[Hashable], max_ngram: int = 4, min_repeats: int = 4, min_span: int = 0
+) -> tuple[int, int]:
+    """
+    Detect a decoding loop at the end of a token sequence.
+    Returns (n, repeats) if the sequence ends with an n-gram (n <= max_ngram)
+    repeated back-to-back at least min_repeats times, and over at least
+    min_span tokens (so short n-grams need more repeats), else (0, 0).
+    """
+    total = len(tokens)
+    for n in range(1, max_ngram + 1):
+        needed = max(min_repeats, math.ceil(min_span / n))
+        # n * needed never shrinks as n grows, so nothing longer fits either.
+        if total < n * needed:
+            break
+        unit = list(tokens[total - n :])
+        repeats = 1
+        while total >= n * (repeats + 1) and list(tokens[total - n * (repeats + 1) : total - n * repeats]) == unit:
+            repeats += 1
+        if repeats >= needed:
+            return n, repeats
+    return 0, 0
+
+
+def trim_loop(tokens: Sequence[Hashable], max_ngram: int = 4, min_repeats: int = 4) -> list:
+    """
+    Drop the looping tail, keeping a single copy of the repeated n-gram.
+    """
+    n, repeats = find_loop(tokens, max_ngram, min_repeats)
+    return list(tokens[: len(tokens) - n * (repeats - 1)]) if n else list(tokens)
+
+
+def trim_looping_text(text: str, max_ngram: int = 8, min_repeats: int = 4, min_span: int = 10) -> tuple[str, bool]:
+    """
+    Word-level version for decoded text ("ya se ve, ya se ve, ..."). Punctuation
+    and case are ignored for matching. The loop must cover min_span words, so
+    emphatic speech ("No, no, no, eso...", "ja ja ja") is left alone while
+    Whisper's runaway loops, which go on until the token cap, are cut.
+    Returns (text, trimmed).
+    """
+    matches = list(_WORD.finditer(text))
+    words = [m.group(0).lower() for m in matches]
+    n, repeats = find_loop(words, max_ngram, min_repeats, min_span)
+    if not n:
+        return text, False
+    last_kept = matches[len(words) - n * (repeats - 1) - 1]
+    return text[: last_kept.end()].rstrip(" ,;:"), True
+
+
+def token_budget(units: float, per_unit: float, margin: int, ceiling: int) -> int:
+    """
+    Generation cap proportional to the input size (seconds of audio, source tokens).
+    """
+    return max(1, min(ceiling, int(math.ceil(units * per_unit)) + margin))
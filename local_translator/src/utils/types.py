@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
 
 
 @dataclass
@@ -8,5 +11,39 @@ class TranscriptionResult:
     text: str
     language: str
     duration: float
+    truncated: bool = False  # decoding hit its token cap or was cut at a repetition loop
+    language_probability: float = 1.0  # detection confidence; 1.0 when the language was given
+    avg_logprob: float = 0.0  # token-weighted mean log-probability of the decode
+    no_speech_prob: float = 0.0  # highest no-speech probability among the decoded windows
+
 
+@dataclass
+class Segment:
+    id: int
+    audio: np.ndarray
+    duration: float  # seconds of audio
+    closed_at: float  # time.monotonic() when the segmenter closed it
+    deadline: float  # closed_at + latency budget
+    parts: int = 1  # >1 when several short segments were merged into one
+    features: Optional[np.ndarray] = None  # log-mel computed during capture (unmerged segments only)
 
+
+@dataclass
+class PipelineStats:
+    frames: int = 0
+    segments: int = 0
+    failed_segments: int = 0
+    segment_audio_seconds: float = 0.0
+    processing_seconds: float = 0.0
+    latency_seconds: float = 0.0  # summed time from segment close to its result (queueing + processing)
+    max_queue_depth: int = 0
+    backlog_seconds: float = 0.0  # audio waiting in the queue after the last segment
+    gate_skipped_fraction: float = 0.0  # frames the energy pre-gate kept away from the VAD
+    merged_segments: int = 0  # segments folded into a neighbour's STT call
+    dropped_segments: int = 0  # segments discarded unprocessed for being too old
+    tts_skipped: int = 0  # segments translated but not spoken because they were stale
+    max_lag_seconds: float = 0.0  # worst segment age when its processing started
+    stt_truncated: int = 0  # transcriptions cut at their token cap or a repetition loop
+    mt_aborts: int = 0  # translations stopped early by the repetition criterion
+    language_detections: int = 0  # segments whose language Whisper had to detect
+    mt_skipped: int = 0  # segments already in the target language (not translated)
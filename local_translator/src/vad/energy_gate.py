@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class EnergyGate:
+    """
+    Cheap pre-gate in front of the neural VAD.
+
+    Tracks the background noise floor continuously (fast to fall, slow to rise)
+    and marks frames whose RMS is clearly below floor + margin as silence, so the
+    VAD model never runs on them. Frames that are only slightly above the floor
+    but have a noise-like zero-crossing rate are skipped as well.
+    """
+
+    def __init__(
+        self,
+        margin_db: float = 6.0,
+        zcr_margin_db: float = 6.0,
+        max_zcr: float = 0.35,
+        rise: float = 0.005,
+        fall: float = 0.2,
+        initial_floor_db: float = -60.0,
+        min_floor_db: float = -90.0,
+    ) -> None:
+        self.margin_db = margin_db
+        self.zcr_margin_db = zcr_margin_db
+        self.max_zcr = max_zcr
+        self.rise = rise
+        self.fall = fall
+        self.min_floor_db = min_floor_db
+        self.floor_db = initial_floor_db
+        self.frames_total = 0
+        self.frames_skipped = 0
+
+    @property
+    def skipped_fraction(self) -> float:
+        return self.frames_skipped / self.frames_total if self.frames_total else 0.0
+
+    @staticmethod
+    def analyze(frames: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Per-frame RMS level (dBFS) and zero-crossing rate for a (n_frames, block) array.
+        """
+        frames = np.asarray(frames, dtype=np.float32)
+        rms = np.sqrt(np.mean(np.square(frames), axis=1))
+        level_db = 20.0 * np.log10(np.maximum(rms, 1e-9))
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+        return level_db, zcr
+
+    def process_block(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Return a boolean mask of frames that should go to the neural VAD,
+        updating the noise floor frame by frame.
+        """
+        level_db, zcr = self.analyze(frames)
+        mask = np.empty(len(level_db), dtype=bool)
+        floor = self.floor_db
+        for i, level in enumerate(level_db):
+            above = level - floor
+            mask[i] = above >= self.margin_db and not (
+                zcr[i] > self.max_zcr and above < self.margin_db + self.zcr_margin_db
+            )
+            # Asymmetric tracking: follow drops quickly, creep up slowly under speech.
+            rate = self.fall if level < floor else self.rise
+            floor = max(self.min_floor_db, floor + rate * (level - floor))
+        self.floor_db = float(floor)
+        self.frames_total += len(mask)
+        self.frames_skipped += int(len(mask) - mask.sum())
+        return mask
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import collections
+from typing import TYPE_CHECKING, Deque, Optional, Sequence
+
+import numpy as np
+
+from local_translator.src.audio.duplex import DuplexCoordinator
+from local_translator.src.vad.energy_gate import EnergyGate
+from local_translator.src.vad.silero_vad import SileroVAD
+
+if TYPE_CHECKING:  # the stt package imports faster-whisper; the segmenter only needs the interface
+    from local_translator.src.audio.denoise import SpectralGate
+    from local_translator.src.stt.features import StreamingLogMel
+
+
+class SpeechSegmenter:
+    """
+    Turns a stream of fixed-size frames into speech segments.
+
+    Frames go through the optional duplex coordinator (echo/playback gating),
+    the optional denoiser, the optional energy pre-gate and then the neural
+    VAD. Frames the gate skips are kept in a short look-back so a segment's
+    soft onset is not lost. A segment ends after max_silence seconds without
+    speech.
+
+    The denoiser only serves the gate and the VAD: segments carry the frames
+    as they left the duplex coordinator, delayed by the denoiser's latency so
+    they line up with the decisions, and the denoiser's noise profile is held
+    while a segment is open so it does not learn the speech.
+
+    With a StreamingLogMel, every frame that joins a segment is also fed to it,
+    so the Whisper features are ready when the segment closes (see
+    push_with_features / flush_with_features).
+    """
+
+    def __init__(
+        self,
+        vad: SileroVAD,
+        frame_duration: float,
+        max_silence: float,
+        energy_gate: Optional[EnergyGate] = None,
+        duplex: Optional[DuplexCoordinator] = None,
+        lookback_frames: int = 10,
+        features: Optional[StreamingLogMel] = None,
+        denoiser: Optional[SpectralGate] = None,
+    ) -> None:
+        self.vad = vad
+        self.frame_duration = frame_duration
+        self.max_silence = max_silence
+        self.energy_gate = energy_gate
+        self.duplex = duplex
+        self.features = features
+        self.denoiser = denoiser
+        # (frame kept for the segment, frame the gate and VAD see) pairs.
+        self._lookback: Deque[tuple[np.ndarray, np.ndarray]] = collections.deque(maxlen=lookback_frames)
+        self._delay = np.zeros(denoiser.latency if denoiser is not None else 0, dtype=np.float32)
+        self._buffer: list[np.ndarray] = []
+        self._active = False
+        self._silence = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def current_audio(self) -> Optional[np.ndarray]:
+        """
+        Audio of the segment still open (None between segments), e.g. for partial transcripts.
+        """
+        return np.concatenate(self._buffer) if self._active and self._buffer else None
+
+    def push(self, frames: Sequence[np.ndarray]) -> list[np.ndarray]:
+        """
+        Feed consecutive frames; returns the segments they completed (usually none).
+        """
+        return [audio for audio, _ in self.push_with_features(frames)]
+
+    def push_with_features(self, frames: Sequence[np.ndarray]) -> list[tuple[np.ndarray, Optional[np.ndarray]]]:
+        """
+        Like push(), paired with each segment's log-mel features (None without an extractor).
+        """
+        if self.duplex is not None:
+            frames = [self.duplex.process(frame) for frame in frames]
+        detect = frames
+        if self.denoiser is not None:
+            # Held from the first speech frame; a batch that opens a segment adapts on its
+            # few onset frames, too little to matter at the profile's rise rate.
+            self.denoiser.adapt = not self._active
+            detect = [self.denoiser.process(frame) for frame in frames]
+            frames = [self._delayed(frame) for frame in frames]
+        if self.energy_gate is not None:
+            candidates = self.energy_gate.process_block(np.stack(detect))
+        else:
+            candidates = np.ones(len(frames), dtype=bool)
+
+        segments = []
+        for frame, clean, candidate in zip(frames, detect, candidates):
+            if not candidate:
+                self._lookback.append((frame, clean))
+                speech = False
+            else:
+                onset = list(self._lookback)
+                self._lookback.clear()
+                # Warm the VAD state with the skipped frames before the onset.
+                for _, past in onset:
+                    self.vad.speech_probability(past)
+                speech = self._is_speech(clean)
+                if speech and not self._active:
+                    for past, _ in onset:
+                        self._append(past)
+
+            if speech:
+                self._append(frame)
+                self._active = True
+                self._silence = 0.0
+            elif self._active:
+                self._silence += self.frame_duration
+                if self._silence >= self.max_silence:
+                    segment, features = self.flush_with_features()
+                    if segment is not None:
+                        segments.append((segment, features))
+        return segments
+
+    def flush(self) -> Optional[np.ndarray]:
+        """
+        Close the current segment (if any) and return its audio.
+        """
+        return self.flush_with_features()[0]
+
+    def flush_with_features(self) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        segment = np.concatenate(self._buffer) if self._buffer else None
+        features = None
+        if self.features is not None:
+            features = self.features.finish() if segment is not None else None
+            self.features.reset()
+        self._buffer = []
+        self._active = False
+        self._silence = 0.0
+        return segment, features
+
+    def _delayed(self, frame: np.ndarray) -> np.ndarray:
+        # The frame as it was denoiser.latency samples ago, aligned with the denoised output.
+        joined = np.concatenate([self._delay, frame])
+        self._delay = joined[len(frame) :]
+        return joined[: len(frame)]
+
+    def _append(self, frame: np.ndarray) -> None:
+        self._buffer.append(frame)
+        if self.features is not None:
+            self.features.push(frame)
+
+    def _is_speech(self, frame: np.ndarray) -> bool:
+        prob = self.vad.speech_probability(frame)
+        if self.duplex is not None:
+            prob = self.duplex.weigh(prob)
+        return prob >= self.vad.threshold
@@ -1,57 +1,146 @@
 from __future__ import annotations
 
+import importlib.util
 import threading
+from pathlib import Path
 from typing import Optional
 
 import numpy as np
 
+from local_translator.src.utils.config import settings
 from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.model_store import get_model_store
+
+MODEL_FILENAME = "silero_vad.onnx"
+
+
+def find_silero_model(models_dir: Optional[Path] = None) -> Path:
+    """
+    Locate the Silero VAD ONNX file without importing torch.
+    Prefers the verified copy in the model store, then a vendored copy in
+    models_dir, then the file shipped inside the silero-vad package (found via
+    its spec, so the package itself is not imported).
+    """
+    candidates = []
+    if models_dir is None:
+        try:
+            store_dir = get_model_store().local_path("silero-vad")
+        except FileNotFoundError:
+            store_dir = None
+        if store_dir is not None:
+            candidates.append(store_dir / MODEL_FILENAME)
+    vendored = Path(models_dir or settings.models_dir) / MODEL_FILENAME
+    candidates.append(vendored)
+    spec = importlib.util.find_spec("silero_vad")
+    if spec is not None and spec.submodule_search_locations:
+        for location in spec.submodule_search_locations:
+            candidates.append(Path(location) / "data" / MODEL_FILENAME)
+    for path in candidates:
+        if path.is_file():
+            return path
+    raise FileNotFoundError(
+        "Silero VAD model not found; copy silero_vad.onnx into "
+        f"{vendored.parent} or install the silero-vad package"
+    )
 
 
 class SileroVAD:
     """
-    Thin wrapper around the silero-vad ONNX runtime model.
-    The package provides a callable model that returns speech probabilities.
+    Silero VAD executed directly with onnxruntime (no torch, no hub, fully offline).
+    Manages the recurrent state itself and re-windows arbitrary frame sizes into
+    the fixed window the model expects. Supports the v4 (h/c) and v5 (state) exports.
     """
 
-    def __init__(self, sample_rate: int = 16000, threshold: float = 0.5):
+    WINDOW = {16_000: 512, 8_000: 256}
+    CONTEXT = {16_000: 64, 8_000: 32}
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        threshold: float = 0.5,
+        model_path: Optional[Path] = None,
+        num_threads: int = 1,
+    ):
+        if sample_rate not in self.WINDOW:
+            raise ValueError(f"Silero VAD supports 8 kHz or 16 kHz, got {sample_rate}")
         self.sample_rate = sample_rate
         self.threshold = threshold
+        self.window = self.WINDOW[sample_rate]
+        self.model_path = model_path
+        self.num_threads = num_threads
         self._log = get_logger(__name__)
-        self._model = None
+        self._session = None
+        self._stateful_v5 = False
+        self._sr = np.array(sample_rate, dtype=np.int64)
         self._lock = threading.Lock()
         self._load_model()
+        self.reset()
 
     def _load_model(self) -> None:
         try:
-            # The silero-vad package may export either SileroVad or SileroVAD.
-            try:
-                from silero_vad import SileroVad  # type: ignore
-            except ImportError:  # pragma: no cover - depends on package version
-                from silero_vad import SileroVAD as SileroVad  # type: ignore
+            import onnxruntime as ort
 
-            self._model = SileroVad()
-            self._log.info("Silero VAD model loaded (onnx)")
+            path = self.model_path or find_silero_model()
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = self.num_threads
+            options.inter_op_num_threads = 1
+            self._session = ort.InferenceSession(
+                str(path), sess_options=options, providers=["CPUExecutionProvider"]
+            )
+            inputs = {i.name for i in self._session.get_inputs()}
+            self._stateful_v5 = "state" in inputs
+            self._log.info("Silero VAD model loaded (onnx, %s)", "v5" if self._stateful_v5 else "v4")
         except Exception as exc:  # pragma: no cover - defensive
             self._log.error("Failed to load Silero VAD: %s", exc)
             raise
 
+    def reset(self) -> None:
+        """
+        Clear recurrent state and buffered samples (call between independent streams).
+        """
+        with self._lock:
+            self._state = np.zeros((2, 1, 128), dtype=np.float32)
+            self._h = np.zeros((2, 1, 64), dtype=np.float32)
+            self._c = np.zeros((2, 1, 64), dtype=np.float32)
+            self._context = np.zeros(self.CONTEXT[self.sample_rate], dtype=np.float32)
+            self._pending = np.zeros(0, dtype=np.float32)
+            self._last_prob = 0.0
+
     def is_speech(self, audio: np.ndarray) -> bool:
         """
         Returns True if the audio frame contains speech with probability > threshold.
         """
-        if self._model is None:
+        return self.speech_probability(audio) >= self.threshold
+
+    def speech_probability(self, audio: np.ndarray) -> float:
+        """
+        Returns the speech probability of the latest full model window.
+        Frames shorter than the model window are buffered until one is complete.
+        """
+        if self._session is None:
             raise RuntimeError("Silero VAD model not initialized")
         with self._lock:
+            samples = np.asarray(audio, dtype=np.float32).reshape(-1)
+            pending = np.concatenate((self._pending, samples)) if self._pending.size else samples
+            offset = 0
             try:
-                # Common interfaces: callable or .predict
-                if hasattr(self._model, "predict"):
-                    prob = float(self._model.predict(audio, self.sample_rate))
-                else:
-                    prob = float(self._model(audio, self.sample_rate))
+                while len(pending) - offset >= self.window:
+                    self._last_prob = self._infer(pending[offset : offset + self.window])
+                    offset += self.window
             except Exception as exc:  # pragma: no cover - defensive
                 self._log.error("VAD inference failed: %s", exc)
-                prob = 0.0
-        return prob >= self.threshold
-
+                self._last_prob = 0.0
+            self._pending = pending[offset:].copy()
+            return self._last_prob
 
+    def _infer(self, window: np.ndarray) -> float:
+        # Caller holds self._lock.
+        if self._stateful_v5:
+            x = np.concatenate((self._context, window))[None, :]
+            out, self._state = self._session.run(None, {"input": x, "state": self._state, "sr": self._sr})
+            self._context = window[-len(self._context) :].copy()
+        else:
+            out, self._h, self._c = self._session.run(
+                None, {"input": window[None, :], "sr": self._sr, "h": self._h, "c": self._c}
+            )
+        return float(np.asarray(out).reshape(-1)[0])
@@ -1,19 +1,43 @@
 from __future__ import annotations
 
+import copy
 import queue
 import signal
 import sys
 import threading
 import time
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 
+from local_translator.src.audio.denoise import denoiser_from_settings
+from local_translator.src.audio.duplex import DuplexCoordinator, NLMSEchoCanceller
 from local_translator.src.audio.microphone_stream import MicrophoneStream
+from local_translator.src.audio.output_stream import AudioOutputStream
+from local_translator.src.audio.source import AudioSource
+from local_translator.src.pipeline.calibration import Profile, default_profile, select_profile
+from local_translator.src.pipeline.language import LanguageTracker
+from local_translator.src.pipeline.model_manager import ModelManager, ModelSet, build_ladder
+from local_translator.src.pipeline.remote import RemoteDispatcher
+from local_translator.src.pipeline.scheduler import SegmentScheduler
+from local_translator.src.pipeline.workers import ModelWorker
 from local_translator.src.stt.faster_whisper_stt import FasterWhisperSTT
+from local_translator.src.stt.features import StreamingLogMel
 from local_translator.src.translation.helsinki_translator import HelsinkiTranslator
+from local_translator.src.translation.hub import FanOut, TargetText, TranslationHub
+from local_translator.src.translation.streaming import iter_clauses
+from local_translator.src.tts.cache import cache_from_settings
+from local_translator.src.tts.piper_tts import PiperTTS
+from local_translator.src.utils.archive import ArchiveWriter
 from local_translator.src.utils.config import settings
+from local_translator.src.utils.disfluency import DisfluencyFilter
 from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.memory import MemoryMonitor
+from local_translator.src.utils.profiler import profiler
+from local_translator.src.utils.types import PipelineStats, Segment, TranscriptionResult
+from local_translator.src.vad.energy_gate import EnergyGate
+from local_translator.src.vad.segmenter import SpeechSegmenter
 from local_translator.src.vad.silero_vad import SileroVAD
 
 log = get_logger("main")
@@ -21,93 +45,515 @@ log = get_logger("main")
 
 class InputPipeline:
     """
-    Microphone -> VAD -> STT -> Translation pipeline.
+    Audio source -> VAD -> scheduler -> STT -> Translation (-> TTS) pipeline.
+    Uses the microphone unless another AudioSource (e.g. a file replay) is given.
+    Capture/VAD and STT/MT run on separate threads so a slow segment never
+    stalls the audio queue; the scheduler decides what to do when behind.
     """
 
-    def __init__(self) -> None:
-        self.audio_queue: queue.Queue[np.ndarray] = queue.Queue(maxsize=200)
+    def __init__(
+        self,
+        speak: bool = settings.pipeline_tts,
+        source: AudioSource | None = None,
+        memory_monitor: MemoryMonitor | None = None,
+    ) -> None:
         models_dir = settings.models_dir
         models_dir.mkdir(parents=True, exist_ok=True)
 
-        self.microphone = MicrophoneStream(
-            sample_rate=settings.sample_rate,
-            block_size=settings.block_size,
-            channels=settings.channels,
-            audio_queue=self.audio_queue,
-        )
+        if source is None:
+            source = MicrophoneStream(
+                sample_rate=settings.sample_rate,
+                block_size=settings.block_size,
+                channels=settings.channels,
+                audio_queue=queue.Queue(maxsize=200),
+                native_rate=settings.capture_native_rate,
+            )
+        self.source = source
+        self.audio_queue: queue.Queue[np.ndarray] = source.audio_queue
+        self.stats = PipelineStats()
+        if memory_monitor is None and settings.memory_profile_interval > 0:
+            memory_monitor = MemoryMonitor(interval=settings.memory_profile_interval)
+        self.memory_monitor = memory_monitor
         self.vad = SileroVAD(
             sample_rate=settings.sample_rate,
             threshold=settings.vad_threshold,
         )
-        self.stt = FasterWhisperSTT(model_dir=models_dir)
-        self.translator = HelsinkiTranslator(
-            model_dir=str(models_dir),
-            device=settings.translation_device,
+        self.models_dir = models_dir
+        # Remote worker nodes pick their own models, so there is no local ladder to walk
+        # and nothing local to calibrate (that would load every candidate model here).
+        remote = bool(settings.remote_workers)
+        profile = default_profile() if remote else select_profile()
+        self.models = ModelManager(
+            [profile] if remote else build_ladder(profile),
+            self._build_models,
+            window_seconds=settings.rtf_window_seconds,
+            downgrade_rtf=settings.downgrade_rtf,
+            upgrade_rtf=settings.upgrade_rtf,
+            cooldown=settings.model_switch_cooldown,
+            auto=settings.auto_downgrade and not remote,
+        )
+
+        self.output: AudioOutputStream | None = None
+        self.tts: PiperTTS | None = None
+        self.duplex: DuplexCoordinator | None = None
+        if speak:
+            self.output = AudioOutputStream(
+                sample_rate=settings.tts_sample_rate,
+                block_size=settings.output_block_size,
+            )
+            self.tts = PiperTTS(output=self.output, cache=cache_from_settings())
+            self.tts.preload(settings.tts_preload)
+            self.duplex = DuplexCoordinator(
+                self.output,
+                sample_rate=settings.sample_rate,
+                mode=settings.duplex_mode,
+                echo_canceller=NLMSEchoCanceller() if settings.echo_cancellation else None,
+                source=self.source,
+            )
+
+        # Per-turn language detection (settings.language_mode other than "fixed").
+        self.languages: LanguageTracker | None = None
+        if settings.language_mode in ("detect", "bidirectional"):
+            self.languages = LanguageTracker()
+            if settings.language_mode == "bidirectional" and len(self.languages.languages) != 2:
+                raise ValueError("Bidirectional mode needs exactly two conversation_languages")
+        elif settings.language_mode != "fixed":
+            raise ValueError(f"Unknown language_mode '{settings.language_mode}'")
+
+        # Session record, written by its own thread (see utils/archive.py).
+        self.archive: ArchiveWriter | None = None
+        if settings.archive:
+            self.archive = ArchiveWriter(
+                info={
+                    "whisper": profile.whisper_model_size,
+                    "translation": profile.translation_model_name,
+                    "language_mode": settings.language_mode,
+                }
+            )
+
+        # Extra target languages: translated off the segment path, one voice each.
+        # With language detection the hub also serves other directions (en-es).
+        self.hub: TranslationHub | None = None
+        self.fanout: FanOut | None = None
+        self._voice_outputs: list[AudioOutputStream] = []
+        self._voices: dict[str, PiperTTS] = {}
+        targets = settings.translation_targets
+        if len(targets) > 1 or self.languages is not None:
+            self.hub = TranslationHub()
+            primary_pair = f"{settings.source_language}-{targets[0]}"
+            self._adopt_primary(self.models.current(), primary_pair)
+            self.models.listeners.append(lambda models: self._adopt_primary(models, primary_pair))
+        if self.languages is not None:
+            # Other conversation directions (en-es) are on the segment path: load them now,
+            # not on the scheduler thread when the first turn in that language arrives.
+            primary = (settings.source_language, targets[0])
+            pairs = [
+                pair
+                for language in self.languages.languages
+                if language != self._target(language) and (language, self._target(language)) != primary
+                for pair in self.hub.route(language, self._target(language))
+            ]
+            self.hub.preload(dict.fromkeys(pairs))
+        if len(targets) > 1:
+            speakers = {target: self._voice(target).speak for target in targets[1:]} if speak else None
+            on_result = self._archive_translation if self.archive is not None else None
+            self.fanout = FanOut(self.hub, targets[1:], speakers, on_result=on_result)
+        if speak and settings.language_mode == "bidirectional":
+            # The reverse direction speaks through the same output (and duplex gate).
+            for language in self.languages.languages:
+                if language != targets[0]:
+                    self._voices[language] = self._voice(language, self.output)
+
+        # Fillers and stutters are dropped before MT so they cost no beam search or TTS.
+        self.disfluency = DisfluencyFilter() if settings.strip_disfluencies else None
+        self._frame_duration = settings.block_size / settings.sample_rate
+        self.energy_gate = EnergyGate(margin_db=settings.energy_gate_margin_db) if settings.energy_gate else None
+        self.segmenter = SpeechSegmenter(
+            self.vad,
+            frame_duration=self._frame_duration,
+            max_silence=settings.max_silence_after_speech,
+            energy_gate=self.energy_gate,
+            duplex=self.duplex,
+            lookback_frames=settings.gate_lookback_frames,
+            features=self._feature_extractor(),
+            denoiser=denoiser_from_settings(),
+        )
+        self.scheduler = SegmentScheduler(
+            self._flush_segment,
+            sample_rate=settings.sample_rate,
+            latency_budget=settings.latency_budget,
+            merge_short_seconds=settings.merge_short_seconds,
+            merge_max_seconds=settings.merge_max_seconds,
+            max_lag=settings.max_segment_lag,
+            on_drop=lambda segment: self._archive(segment, status="dropped"),
         )
 
         self._processing_thread: threading.Thread | None = None
         self._running = threading.Event()
-        self._frame_duration = settings.block_size / settings.sample_rate
 
     def start(self) -> None:
         if self._running.is_set():
             return
         self._running.set()
-        self.microphone.start()
+        if self.memory_monitor is not None:
+            self.memory_monitor.start()
+        if self.output is not None:
+            self.output.start()
+        for output in self._voice_outputs:
+            output.start()
+        self.scheduler.start()
+        self.source.start()
         self._processing_thread = threading.Thread(target=self._process_loop, daemon=True)
         self._processing_thread.start()
         log.info("Pipeline started")
 
     def stop(self) -> None:
         self._running.clear()
-        self.microphone.stop()
+        self.source.stop()
         if self._processing_thread and self._processing_thread.is_alive():
             self._processing_thread.join(timeout=2)
+        self.scheduler.stop(drain=True)
+        if self.fanout is not None:
+            self.fanout.stop()
+            if self.fanout.dropped:
+                log.info("Fan-out: %d jobs or translations dropped for falling behind", self.fanout.dropped)
+        if self.hub is not None:
+            self.hub.close()
+        if self.archive is not None:
+            self.archive.close()
+            log.info(
+                "Archive %s: %d segments and %d extra translations in %d batches, %.1f MB of audio, "
+                "%.2fs writing, %d without audio",
+                self.archive.session,
+                self.archive.records,
+                self.archive.translations,
+                self.archive.batches,
+                self.archive.bytes_written / 1e6,
+                self.archive.write_seconds,
+                self.archive.audio_dropped,
+            )
+        self.models.close()
+        if self.output is not None:
+            self.output.stop()
+        for output in self._voice_outputs:
+            output.stop()
+        if self.memory_monitor is not None:
+            self.memory_monitor.stop()
+            self.memory_monitor.report()
+        if self.energy_gate is not None:
+            log.info(
+                "Energy gate skipped %.1f%% of %d frames (floor %.1f dBFS)",
+                100.0 * self.energy_gate.skipped_fraction,
+                self.energy_gate.frames_total,
+                self.energy_gate.floor_db,
+            )
+        denoiser = self.segmenter.denoiser
+        if denoiser is not None and denoiser.blocks:
+            log.info(
+                "Denoiser: %.2f ms per block on average, worst %.2f ms",
+                1000.0 * denoiser.seconds / denoiser.blocks,
+                1000.0 * denoiser.worst,
+            )
+        log.info(
+            "Scheduler: %d merged, %d dropped, %d spoken-late skipped, max lag %.2fs",
+            self.stats.merged_segments,
+            self.stats.dropped_segments,
+            self.stats.tts_skipped,
+            self.stats.max_lag_seconds,
+        )
+        log.info(
+            "Decode caps: %d transcriptions cut, %d translations stopped on repetition",
+            self.stats.stt_truncated,
+            self.stats.mt_aborts,
+        )
+        if self.disfluency is not None and self.disfluency.segments:
+            log.info(
+                "Disfluency filter: %d of %d tokens removed (%.1f%%), %.0f us per segment",
+                self.disfluency.tokens_saved,
+                self.disfluency.tokens_in,
+                100.0 * self.disfluency.saved_fraction,
+                1e6 * self.disfluency.seconds / self.disfluency.segments,
+            )
+        if self.languages is not None:
+            log.info(
+                "Language: detected on %d segments (%d after a poor cached decode), reused for %d; "
+                "%d already in the target language",
+                self.stats.language_detections,
+                self.languages.rechecks,
+                self.languages.cache_hits,
+                self.stats.mt_skipped,
+            )
         log.info("Pipeline stopped")
 
-    def _process_loop(self) -> None:
-        speech_buffer: list[np.ndarray] = []
-        speech_active = False
-        silence_accum = 0.0
+    def _archive(
+        self,
+        segment: Segment,
+        transcript: str = "",
+        translation: str = "",
+        source: str = settings.source_language,
+        target: str = settings.translation_targets[0],
+        status: str = "ok",
+    ) -> None:
+        if self.archive is None:
+            return
+        # Segment times are monotonic and the audio ends where the closing silence began.
+        spoken_at = time.time() - (time.monotonic() - segment.closed_at)
+        spoken_at -= settings.max_silence_after_speech + segment.duration
+        self.archive.record(
+            segment.id,
+            segment.audio,
+            transcript,
+            translation,
+            spoken_at,
+            segment.duration,
+            source,
+            target,
+            status,
+        )
+
+    def _archive_translation(self, item: TargetText) -> None:
+        self.archive.record_translation(item.segment_id, item.target, item.text)
+
+    def _adopt_primary(self, models: ModelSet, pair: str) -> None:
+        # The hub reuses the pipeline's own translator for the primary pair (and as pivot).
+        if isinstance(models.translator, HelsinkiTranslator):
+            self.hub.adopt(pair, models.translator)
 
+    def _voice(self, target: str, output: AudioOutputStream | None = None) -> PiperTTS:
+        """
+        Piper voice for a target language; fan-out voices get their own output
+        stream, watched by the duplex coordinator like the main one.
+        """
+        voices = dict(settings.tts_voices)
+        if target not in voices:
+            raise KeyError(f"No Piper voice configured for '{target}' (settings.tts_voices)")
+        if output is None:
+            output = AudioOutputStream(sample_rate=settings.tts_sample_rate, block_size=settings.output_block_size)
+            self._voice_outputs.append(output)
+            if self.duplex is not None:
+                self.duplex.watch(output)
+        return PiperTTS(model_name=voices[target], output=output, cache=cache_from_settings())
+
+    def _directions(self, segment: Segment) -> tuple[str | None, tuple[str, ...]]:
+        """
+        Language to decode `segment` with (None: detect) and the detection candidates.
+        """
+        if self.languages is None:
+            return settings.source_language, ()
+        language = self.languages.language_for(segment.closed_at - segment.duration)
+        if language is None:
+            self.stats.language_detections += 1
+        return language, self.languages.languages
+
+    @staticmethod
+    def _transcribe(
+        stt: Any, segment: Segment, language: str | None, candidates: tuple[str, ...]
+    ) -> TranscriptionResult:
+        if segment.features is not None and hasattr(stt, "transcribe_features"):
+            return stt.transcribe_features(segment.audio, segment.features, language, candidates)
+        return stt.transcribe(segment.audio, language, candidates)
+
+    def _target(self, source: str) -> str:
+        if settings.language_mode == "bidirectional":
+            return self.languages.other(source)
+        return settings.translation_targets[0]
+
+    def _feature_extractor(self) -> StreamingLogMel | None:
+        """
+        Log-mel extractor for the segmenter when the STT engine can take
+        precomputed features (in-process faster-whisper only).
+        """
+        stt = self.models.current().stt
+        if not settings.streaming_features or not getattr(stt, "accepts_features", False):
+            return None
+        return StreamingLogMel(n_mels=stt.n_mels)
+
+    def _build_models(self, profile: Profile, current: ModelSet | None) -> ModelSet:
+        """
+        Build the engines for a profile, reusing whatever the current set already
+        has loaded with the same configuration.
+        """
+        if settings.remote_workers:
+            if current is not None and isinstance(current.stt, RemoteDispatcher):
+                return ModelSet(profile, current.stt, current.translator)
+            dispatcher = RemoteDispatcher(settings.remote_workers)
+            return ModelSet(profile, dispatcher, dispatcher)
+
+        stt_kwargs = dict(
+            model_size=profile.whisper_model_size,
+            device=profile.whisper_device,
+            compute_type=profile.whisper_compute_type,
+            model_dir=self.models_dir,
+        )
+        translator_kwargs = dict(
+            model_name=profile.translation_model_name,
+            model_dir=str(self.models_dir),
+            device=settings.translation_device,
+            num_beams=profile.translation_num_beams,
+        )
+        old = current.profile if current is not None else None
+        same_stt = old is not None and (old.whisper_model_size, old.whisper_compute_type, old.whisper_device) == (
+            profile.whisper_model_size,
+            profile.whisper_compute_type,
+            profile.whisper_device,
+        )
+        same_mt = old is not None and old.translation_model_name == profile.translation_model_name
+
+        if settings.stt_worker_process:
+            # Optionally keep the models out of this interpreter so their Python work
+            # never holds the GIL the capture callback and VAD need.
+            hosted_mt = translator_kwargs if settings.mt_worker_process else None
+            same_hosted_mt = same_mt and old.translation_num_beams == profile.translation_num_beams
+            if same_stt and (hosted_mt is None or same_hosted_mt):
+                stt = current.stt
+            else:
+                stt = ModelWorker(
+                    stt_kwargs,
+                    hosted_mt,
+                    sample_rate=settings.sample_rate,
+                    ring_seconds=2 * settings.merge_max_seconds + settings.max_segment_lag,
+                )
+                stt.start()
+            if hosted_mt is not None:
+                return ModelSet(profile, stt, stt)
+        else:
+            stt = current.stt if same_stt else FasterWhisperSTT(**stt_kwargs)
+
+        if same_mt and isinstance(current.translator, HelsinkiTranslator):
+            # Same weights, different decoding: a shallow copy shares the loaded model.
+            translator = copy.copy(current.translator)
+            translator.num_beams = profile.translation_num_beams
+        else:
+            translator = HelsinkiTranslator(**translator_kwargs)
+        return ModelSet(profile, stt, translator)
+
+    def _speak(self, voice: PiperTTS, text: str, interrupt: bool, segment_id: int) -> float:
+        """
+        Speak through a voice and return the seconds it blocked (Piper synthesis).
+        """
+        profiler.annotate("tts", segment_id)
+        started = time.perf_counter()
+        voice.speak(text, interrupt=interrupt)
+        return time.perf_counter() - started
+
+    def _process_loop(self) -> None:
+        profiler.register("vad")
         while self._running.is_set():
             try:
-                frame = self.audio_queue.get(timeout=0.5)
+                frames = [self.audio_queue.get(timeout=0.5)]
             except queue.Empty:
                 continue
+            # Drain what is already queued so the pre-gate works on whole blocks.
+            while len(frames) < 32:
+                try:
+                    frames.append(self.audio_queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.stats.frames += len(frames)
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.audio_queue.qsize() + len(frames))
 
-            speech_detected = self.vad.is_speech(frame)
-            if speech_detected:
-                speech_buffer.append(frame)
-                speech_active = True
-                silence_accum = 0.0
-            else:
-                if speech_active:
-                    silence_accum += self._frame_duration
-                    if silence_accum >= settings.max_silence_after_speech:
-                        self._flush_segment(speech_buffer)
-                        speech_buffer = []
-                        speech_active = False
-                        silence_accum = 0.0
+            for segment, features in self.segmenter.push_with_features(frames):
+                self.scheduler.submit(segment, features)
+            if self.energy_gate is not None:
+                self.stats.gate_skipped_fraction = self.energy_gate.skipped_fraction
 
         # Flush remaining buffered speech when stopping.
-        if speech_buffer:
-            self._flush_segment(speech_buffer)
+        segment, features = self.segmenter.flush_with_features()
+        if segment is not None:
+            self.scheduler.submit(segment, features)
 
-    def _flush_segment(self, speech_buffer: list[np.ndarray]) -> None:
-        if not speech_buffer:
-            return
-        audio = np.concatenate(speech_buffer)
+    def _flush_segment(self, segment: Segment, speak: bool = True) -> None:
+        started = time.perf_counter()
+        tts_seconds = 0.0  # blocking synthesis, kept out of the RTF the model manager sees
+        # Whatever exists when processing ends (or fails) is archived.
+        transcript = translation = ""
+        source, target = settings.source_language, settings.translation_targets[0]
+        status = "ok"
         try:
-            transcription = self.stt.transcribe(audio)
-            translation = self.translator.translate(transcription.text)
+            # One model set per segment; a background swap lands between segments.
+            models = self.models.current()
+            stt, translator = models.stt, models.translator
+            aborts = translator.repetition_aborts
+            profiler.annotate("stt", segment.id)
+            language, candidates = self._directions(segment)
+            transcription = self._transcribe(stt, segment, language, candidates)
+            if language is not None and self.languages is not None and not self.languages.confirm(transcription):
+                # The turn's language no longer fits: decode this segment again with detection.
+                self.stats.language_detections += 1
+                transcription = self._transcribe(stt, segment, None, candidates)
+            self.stats.stt_truncated += transcription.truncated
+            transcript = transcription.text
+            if self.languages is not None:
+                source = transcription.language
+                if transcription.text:
+                    self.languages.observe(source, transcription.language_probability, segment.closed_at)
+            target = self._target(source)
+            text = transcription.text
+            if self.disfluency is not None:
+                text = self.disfluency.clean(text, source)
+                if text != transcription.text:
+                    log.debug("[%d] Cleaned: %s", segment.id, text)
+            profiler.annotate("mt", segment.id)
+            if not text:
+                # Silence or nothing but fillers.
+                translation = ""
+            elif source == target:
+                # Already in the listener's language: nothing to translate or speak.
+                translation = text
+                self.stats.mt_skipped += 1
+            elif (source, target) != (settings.source_language, settings.translation_targets[0]):
+                translation = self.hub.translate(text, target, source)
+                voice = self._voices.get(target)
+                if voice is not None and translation and speak:
+                    tts_seconds += self._speak(voice, translation, True, segment.id)
+            elif self.tts is not None and speak and hasattr(translator, "translate_stream"):
+                # Speak clause by clause while the rest is still being generated.
+                clauses = []
+                for clause in iter_clauses(translator.translate_stream(text)):
+                    tts_seconds += self._speak(self.tts, clause, not clauses, segment.id)
+                    profiler.annotate("mt", segment.id)
+                    clauses.append(clause)
+                    translation = " ".join(clauses)
+            else:
+                translation = translator.translate(text)
+                if self.tts is not None and translation and speak:
+                    tts_seconds += self._speak(self.tts, translation, True, segment.id)
             log.info(
-                "ES: %s | EN: %s",
+                "[%d] %s: %s | %s: %s",
+                segment.id,
+                source.upper(),
                 transcription.text,
+                target.upper(),
                 translation,
             )
+            if self.fanout is not None and source == settings.source_language:
+                self.fanout.submit(
+                    segment.id,
+                    text,
+                    known={settings.translation_targets[0]: translation},
+                    closed_at=segment.closed_at,
+                )
+            self.stats.mt_aborts += translator.repetition_aborts - aborts
         except Exception as exc:  # pragma: no cover - defensive
+            status = "failed"
+            self.stats.failed_segments += 1
             log.error("Failed to process segment: %s", exc)
+        finally:
+            profiler.annotate()
+            self._archive(segment, transcript, translation, source, target, status)
+            self.stats.segments += 1
+            self.stats.segment_audio_seconds += segment.duration
+            elapsed = time.perf_counter() - started
+            self.stats.processing_seconds += elapsed
+            self.stats.latency_seconds += time.monotonic() - segment.closed_at
+            self.models.observe(segment.duration, elapsed - tts_seconds)
+            self.stats.backlog_seconds = (
+                self.audio_queue.qsize() * self._frame_duration + self.scheduler.backlog_seconds()
+            )
+            self.stats.merged_segments = self.scheduler.merged
+            self.stats.dropped_segments = self.scheduler.dropped
+            self.stats.tts_skipped = self.scheduler.tts_skipped
+            self.stats.max_lag_seconds = self.scheduler.max_lag_seen
 
 
 def main(run_seconds: int = 60) -> None:
@@ -120,6 +566,11 @@ def main(run_seconds: int = 60) -> None:
 
     signal.signal(signal.SIGINT, _handle_sigint)
     signal.signal(signal.SIGTERM, _handle_sigint)
+    # Manual model control: `kill -USR1 <pid>` steps down a quality level, USR2 steps up.
+    signal.signal(signal.SIGUSR1, lambda signum, frame: pipeline.models.downgrade())
+    signal.signal(signal.SIGUSR2, lambda signum, frame: pipeline.models.upgrade())
+    # `kill -PROF <pid>` samples every pipeline thread for a while and writes collapsed stacks.
+    profiler.install_signal(getattr(signal, settings.profile_signal), settings.profile_seconds)
 
     pipeline.start()
     start_time = time.time()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from local_translator.src.audio.output_stream import AudioOutputStream, NullSink, RenderCallback, WavFileSink
+
+SAMPLE_RATE = 22_050
+BLOCK = 1024
+
+
+def tone(seconds: float, freq: float, amplitude: float = 0.5) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def read_wav(path: Path) -> tuple[np.ndarray, int, int]:
+    with wave.open(str(path), "rb") as wav:
+        pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+        return pcm, wav.getframerate(), wav.getnchannels()
+
+
+def render(chunks: list[np.ndarray], sink: NullSink) -> None:
+    output = AudioOutputStream(sample_rate=SAMPLE_RATE, block_size=BLOCK, sink=sink)
+    # Queued before start so the chunks play back-to-back from the first block.
+    for chunk in chunks:
+        output.enqueue(chunk)
+    output.start()
+    if not output.wait_until_idle(timeout=5.0):
+        raise RuntimeError("Output never went idle")
+    output.stop()
+
+
+class ManualSink(NullSink):
+    """
+    Sink driven block by block from the test, so interrupts land at a known sample.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(realtime=False)
+        self.blocks: list[np.ndarray] = []
+
+    def start(self, render: RenderCallback, sample_rate: int, block_size: int, channels: int) -> None:
+        self._render = render
+        self._block = np.zeros((block_size, channels), dtype=np.float32)
+
+    def stop(self) -> None:
+        pass
+
+    def pull(self, blocks: int = 1) -> None:
+        for _ in range(blocks):
+            if self._render(self._block):
+                self.blocks.append(self._block[:, 0].copy())
+
+    def pull_until_idle(self, output: AudioOutputStream, limit: int = 1_000) -> None:
+        while output.is_playing and limit:
+            self.pull()
+            limit -= 1
+
+    @property
+    def played(self) -> np.ndarray:
+        return np.concatenate(self.blocks) if self.blocks else np.zeros(0, dtype=np.float32)
+
+
+def max_step(audio: np.ndarray) -> float:
+    return float(np.abs(np.diff(audio)).max())
+
+
+def interrupt_checks() -> list[tuple[str, bool, str]]:
+    """
+    Interrupting (or flushing) mid-phrase drops the queued audio and crossfades
+    the cut over fade_ms instead of jumping between waveforms.
+    """
+    checks = []
+    speaking = tone(1.0, 440.0)
+    queued = tone(0.5, 330.0)
+    # Starts at its peak, so a hard cut would jump by up to a full swing.
+    barge_in = np.roll(tone(0.4, 660.0), int(SAMPLE_RATE / 660 / 4))
+    sink = ManualSink()
+    output = AudioOutputStream(sample_rate=SAMPLE_RATE, block_size=BLOCK, sink=sink)
+    fade = output._fade_len
+    output.start()
+    output.enqueue(speaking)
+    output.enqueue(queued)
+    sink.pull(3)
+    cut = 3 * BLOCK
+    output.enqueue(barge_in, interrupt=True)
+    sink.pull_until_idle(output)
+    output.stop()
+    played = sink.played
+
+    expected = barge_in.copy()
+    expected[:fade] *= np.linspace(0.0, 1.0, fade, endpoint=False)
+    expected[:fade] += speaking[cut : cut + fade] * np.linspace(1.0, 0.0, fade)
+    after = played[cut:]
+    checks.append(
+        ("interrupt drops queue", len(after) == -(-len(barge_in) // BLOCK) * BLOCK, f"{len(after)} frames after the cut")
+    )
+    diff = np.abs(after[: len(expected)] - expected).max() if len(after) >= len(expected) else np.inf
+    checks.append(("crossfade", diff < 1e-6, f"max|diff|={diff:.1e} against fade-out + fade-in"))
+    limit = 1.5 * (max_step(speaking) + max_step(barge_in))
+    hard_cut = abs(float(speaking[cut - 1]) - float(barge_in[0]))
+    smooth = max_step(played[cut - BLOCK : cut + 2 * fade])
+    checks.append(
+        ("no discontinuity", smooth <= limit, f"max step {smooth:.3f} (limit {limit:.3f}, hard cut {hard_cut:.3f})")
+    )
+
+    # flush() fades out what is playing and forgets the rest.
+    sink = ManualSink()
+    output = AudioOutputStream(sample_rate=SAMPLE_RATE, block_size=BLOCK, sink=sink)
+    output.start()
+    output.enqueue(speaking)
+    output.enqueue(queued)
+    sink.pull(2)
+    output.flush()
+    sink.pull_until_idle(output)
+    output.stop()
+    tail = sink.played[2 * BLOCK :]
+    faded = speaking[2 * BLOCK : 2 * BLOCK + fade] * np.linspace(1.0, 0.0, fade)
+    ok = len(tail) == BLOCK and np.allclose(tail[:fade], faded)
+    checks.append(("flush", ok and not tail[fade:].any(), f"{len(tail)} frames after flush, {fade}-sample fade"))
+    smooth = max_step(sink.played)
+    checks.append(("flush fade", smooth <= 1.5 * max_step(speaking), f"max step {smooth:.3f}"))
+    return checks
+
+
+def main() -> None:
+    failures = 0
+    # A float chunk, an int16 chunk and an out-of-range float chunk that must be clipped.
+    first = tone(0.3, 440.0)
+    second = (tone(0.25, 660.0) * 32767).astype(np.int16)
+    third = tone(0.1, 220.0, amplitude=1.5)
+    played = np.concatenate([first, second.astype(np.float32) / 32768.0, third])
+    expected = (np.clip(played, -1.0, 1.0) * 32767.0).astype("<i2")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "out.wav"
+        sink = WavFileSink(path)
+        render([first, second, third], sink)
+        pcm, rate, channels = read_wav(path)
+
+    blocks = -(-len(expected) // BLOCK)
+    diff = np.abs(pcm[: len(expected)].astype(np.int32) - expected).max()
+    checks = [
+        ("format", rate == SAMPLE_RATE and channels == 1, f"{rate} Hz, {channels} ch"),
+        ("length", len(pcm) == blocks * BLOCK, f"{len(pcm)} frames for {len(expected)} queued"),
+        ("frames counted", sink.frames_written == len(pcm), f"{sink.frames_written}"),
+        ("pcm", np.array_equal(pcm[: len(expected)], expected), f"max|diff|={diff}"),
+        ("padding", not pcm[len(expected) :].any(), "last block zero-padded"),
+    ]
+
+    null = NullSink(realtime=False)
+    render([first, third], null)
+    queued = len(first) + len(third)
+    checks.append(("null sink", null.frames_written == -(-queued // BLOCK) * BLOCK, f"{null.frames_written} frames"))
+    checks += interrupt_checks()
+
+    for name, ok, detail in checks:
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    if failures:
+        print(f"❌ {failures} output sink check(s) failed")
+        sys.exit(1)
+    print("✅ Output sink test passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from local_translator.src.pipeline.remote import MAX_PAYLOAD_BYTES, RemoteDispatcher, WorkerServer
+from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.types import TranscriptionResult
+
+log = get_logger("remote-test")
+
+
+class FakeSTT:
+    """
+    Stands in for FasterWhisperSTT: sleeps in proportion to the audio, echoes its size.
+    """
+
+    def __init__(self, name: str, rtf: float) -> None:
+        self.name = name
+        self.rtf = rtf
+
+    def transcribe(self, audio: np.ndarray, language: str = "es", candidates: tuple = ()) -> TranscriptionResult:
+        duration = len(audio) / 16_000
+        time.sleep(duration * self.rtf)
+        return TranscriptionResult(text=f"{self.name}:{len(audio)}", language="es", duration=duration)
+
+
+class FakeTranslator:
+    def __init__(self) -> None:
+        self.repetition_aborts = 0
+
+    def translate(self, text: str) -> str:
+        if "loop" in text:
+            self.repetition_aborts += 1
+        return text.upper()
+
+
+class DroppableServer(WorkerServer):
+    """
+    Worker that can be made to drop connections mid-job, like a crashed node.
+    """
+
+    dead = False
+
+    def run_job(self, header: dict, payload: bytes) -> dict:
+        if self.dead:
+            raise SystemExit  # ends the handler thread; the socket is closed under the client
+        return super().run_job(header, payload)
+
+
+def start_worker(name: str, rtf: float) -> DroppableServer:
+    server = DroppableServer(("127.0.0.1", 0), FakeSTT(name, rtf), FakeTranslator())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    failures: list[str] = []
+    workers = {"fast": start_worker("fast", 0.05), "mid": start_worker("mid", 0.1), "slow": start_worker("slow", 0.3)}
+    addresses = [f"127.0.0.1:{server.server_address[1]}" for server in workers.values()]
+    dispatcher = RemoteDispatcher(addresses, timeout=5.0, health_interval=0.5)
+
+    if not all(node.healthy for node in dispatcher.nodes):
+        failures.append("not every worker was healthy at start")
+
+    served: Counter[str] = Counter()
+    errors: list[Exception] = []
+
+    def client(jobs: int) -> None:
+        for _ in range(jobs):
+            try:
+                result = dispatcher.transcribe(np.zeros(16_000, dtype=np.float32))
+                served[result.text.split(":")[0]] += 1
+            except Exception as exc:
+                errors.append(exc)
+
+    threads = [threading.Thread(target=client, args=(10,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"Balanced run: {dict(served)}")
+    if errors:
+        failures.append(f"{len(errors)} jobs failed with every worker up: {errors[0]}")
+    if sum(served.values()) != 60 or len(served) != 3:
+        failures.append("jobs were not spread over all three workers")
+    elif not served["fast"] > served["slow"]:
+        failures.append("the fastest worker did not take more jobs than the slowest")
+
+    # Kill the fast node: jobs must move to the others without surfacing errors.
+    workers["fast"].dead = True
+    served.clear()
+    errors.clear()
+    client(10)
+    print(f"With 'fast' down: {dict(served)}, retried={dispatcher.retried}")
+    if errors:
+        failures.append(f"{len(errors)} jobs failed after a node went down: {errors[0]}")
+    if served["fast"] or dispatcher.retried < 1:
+        failures.append("a dead node kept receiving work or no retry happened")
+
+    # Bring it back: the health check should return it to rotation.
+    workers["fast"].dead = False
+    deadline = time.time() + 5.0
+    while time.time() < deadline and not dispatcher.nodes[0].healthy:
+        time.sleep(0.1)
+    if not dispatcher.nodes[0].healthy:
+        failures.append("revived node was not marked healthy again")
+
+    if dispatcher.translate("hola") != "HOLA":
+        failures.append("translation round trip failed")
+    dispatcher.translate("loop loop loop")
+    if dispatcher.repetition_aborts != 1:
+        failures.append("remote repetition aborts were not reported")
+
+    # A frame announcing more payload than allowed is refused before it is read.
+    with socket.create_connection(("127.0.0.1", workers["mid"].server_address[1]), timeout=5.0) as sock:
+        header = json.dumps({"op": "stt", "id": 0, "payload_bytes": MAX_PAYLOAD_BYTES + 1}).encode()
+        sock.sendall(len(header).to_bytes(4, "big") + header)
+        if sock.recv(1):
+            failures.append("an oversized frame was answered instead of refused")
+
+    dispatcher.stop()
+    for server in workers.values():
+        server.shutdown()
+        server.server_close()
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Remote workers test passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+from local_translator.src.audio.resampler import PolyphaseResampler
+
+RATES = ((48_000, 16_000), (44_100, 16_000), (22_050, 16_000), (16_000, 22_050), (8_000, 16_000))
+BLOCK_SIZES = (1, 2, 3, 7, 480)
+
+
+def stream(resampler: PolyphaseResampler, audio: np.ndarray, sizes: list[int]) -> np.ndarray:
+    out = []
+    start = 0
+    for size in sizes:
+        out.append(resampler.process(audio[start : start + size]))
+        start += size
+    return np.concatenate(out)
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    failures = 0
+    for in_rate, out_rate in RATES:
+        audio = (0.1 * rng.standard_normal(in_rate // 10)).astype(np.float32)  # 100 ms
+        whole = PolyphaseResampler(in_rate, out_rate).process(audio)
+        cases = {f"{size}-sample blocks": [size] * -(-len(audio) // size) for size in BLOCK_SIZES}
+        cases["mixed blocks"] = list(rng.integers(0, 9, size=len(audio)))  # includes empty blocks
+        for name, sizes in cases.items():
+            try:
+                streamed = stream(PolyphaseResampler(in_rate, out_rate), audio, sizes)
+                ok = len(streamed) == len(whole) and np.allclose(streamed, whole, atol=1e-6)
+                detail = f"{len(streamed)} vs {len(whole)} samples"
+                if len(streamed) == len(whole):
+                    detail += f", max|diff|={np.abs(streamed - whole).max():.1e}"
+            except Exception as exc:
+                ok, detail = False, f"{type(exc).__name__}: {exc}"
+            failures += not ok
+            print(f"{'✅' if ok else '❌'} {in_rate} -> {out_rate} Hz, {name}: {detail}")
+
+    # Stereo is mixed down first, so it matches resampling the mono mix.
+    stereo = (0.1 * rng.standard_normal((4_800, 2))).astype(np.float32)
+    mono = PolyphaseResampler(48_000, 16_000).process(stereo.mean(axis=1))
+    streamed = stream(PolyphaseResampler(48_000, 16_000, channels=2), stereo, [3] * 1_600)
+    ok = len(streamed) == len(mono) and np.allclose(streamed, mono, atol=1e-6)
+    failures += not ok
+    print(f"{'✅' if ok else '❌'} stereo 48000 -> 16000 Hz, 3-sample blocks: {len(streamed)} vs {len(mono)} samples")
+
+    if failures:
+        print(f"❌ {failures} resampler check(s) failed")
+        sys.exit(1)
+    print("✅ Resampler test passed")
+
+
+if __name__ == "__main__":
+    main()
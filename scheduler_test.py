@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import sys
+import threading
+
+import numpy as np
+
+from local_translator.src.pipeline import scheduler as scheduler_module
+from local_translator.src.pipeline.scheduler import SegmentScheduler
+from local_translator.src.utils.types import Segment
+
+SAMPLE_RATE = 100  # one sample per 10 ms is enough to tell the segments apart
+WORDS = ("uno", "dos", "tres", "cuatro")
+
+
+class FakeClock:
+    """
+    Stands in for the time module inside the scheduler; only moves when told to.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self.now
+
+    perf_counter = monotonic
+
+    def advance(self, seconds: float) -> None:
+        with self._lock:
+            self.now += seconds
+
+
+class FakePipeline:
+    """
+    "Transcribes" a segment by reading back the word index stored in its
+    samples (zeros are merge gaps) and costs rtf seconds per audio second.
+    """
+
+    def __init__(self, clock: FakeClock, rtf: float) -> None:
+        self.clock = clock
+        self.rtf = rtf
+        self.done: list[tuple[str, bool, int]] = []
+
+    def process(self, segment: Segment, speak: bool) -> None:
+        changes = np.flatnonzero(np.diff(segment.audio, prepend=0.0))
+        words = [WORDS[int(segment.audio[i]) - 1] for i in changes if segment.audio[i]]
+        self.done.append((" ".join(words), speak, segment.parts))
+        self.clock.advance(segment.duration * self.rtf)
+
+
+def utterance(word: str, seconds: float) -> np.ndarray:
+    return np.full(int(seconds * SAMPLE_RATE), WORDS.index(word) + 1, dtype=np.float32)
+
+
+def main() -> None:
+    clock = FakeClock()
+    scheduler_module.time = clock
+    checks = []
+
+    # On time: each segment is processed alone and spoken.
+    pipeline = FakePipeline(clock, rtf=0.3)
+    scheduler = SegmentScheduler(pipeline.process, SAMPLE_RATE, latency_budget=3.0, initial_rtf=0.3)
+    scheduler.submit(utterance("uno", 1.0))
+    scheduler.submit(utterance("dos", 1.0))
+    scheduler.start()
+    scheduler.stop(drain=True)
+    expected = [("uno", True, 1), ("dos", True, 1)]
+    checks.append(("on time", pipeline.done == expected, f"{pipeline.done}"))
+    counters = (scheduler.merged, scheduler.tts_skipped, scheduler.dropped)
+    checks.append(("no counters", counters == (0, 0, 0), f"merged/skipped/dropped {counters}"))
+
+    # Behind: the two short segments are merged into one STT call that still
+    # makes the budget; the long one after them can only be shown, not spoken.
+    clock.now = 0.0
+    pipeline = FakePipeline(clock, rtf=0.5)
+    scheduler = SegmentScheduler(pipeline.process, SAMPLE_RATE, latency_budget=2.0, initial_rtf=0.5)
+    scheduler.submit(utterance("uno", 1.0))
+    scheduler.submit(utterance("dos", 1.0))
+    scheduler.submit(utterance("tres", 3.0))
+    scheduler.start()
+    scheduler.stop(drain=True)
+    expected = [("uno dos", True, 2), ("tres", False, 1)]
+    checks.append(("merged text", pipeline.done == expected, f"{pipeline.done}"))
+    checks.append(("merge count", scheduler.merged == 1, f"{scheduler.merged} merged"))
+    checks.append(("tts skipped", scheduler.tts_skipped == 1, f"{scheduler.tts_skipped} spoken late"))
+    checks.append(("rtf estimate", abs(scheduler.rtf - 0.5) < 1e-9, f"rtf {scheduler.rtf:.3f}"))
+    checks.append(("lag seen", abs(scheduler.max_lag_seen - 1.1) < 1e-9, f"{scheduler.max_lag_seen:.2f}s"))
+
+    # Far behind: segments older than max_lag are dropped unprocessed and handed to on_drop.
+    clock.now = 0.0
+    pipeline = FakePipeline(clock, rtf=0.1)
+    dropped: list[int] = []
+    scheduler = SegmentScheduler(
+        pipeline.process, SAMPLE_RATE, max_lag=10.0, initial_rtf=0.1, on_drop=lambda s: dropped.append(s.id)
+    )
+    scheduler.submit(utterance("uno", 1.0))
+    scheduler.submit(utterance("dos", 1.0))
+    clock.advance(11.0)
+    scheduler.submit(utterance("tres", 1.0))
+    scheduler.start()
+    scheduler.stop(drain=True)
+    checks.append(("drop", [text for text, _, _ in pipeline.done] == ["tres"], f"{pipeline.done}"))
+    checks.append(("on_drop", dropped == [0, 1], f"on_drop got {dropped}"))
+    checks.append(("drop count", scheduler.dropped == 2, f"{scheduler.dropped} dropped"))
+    checks.append(("queue empty", scheduler.pending == 0, f"{scheduler.pending} pending"))
+
+    failures = 0
+    for name, ok, detail in checks:
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    if failures:
+        print(f"❌ {failures} scheduler check(s) failed")
+        sys.exit(1)
+    print("✅ Scheduler test passed")
+
+
+if __name__ == "__main__":
+    main()
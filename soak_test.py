@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import mean
+from typing import Optional
+
+from local_translator.src.audio.source import FileAudioSource
+from local_translator.src.utils.config import settings
+from local_translator.src.utils.logger import get_logger
+from local_translator.src.utils.memory import MemoryMonitor, current_rss_mb
+from main_input_test import InputPipeline
+
+log = get_logger("soak")
+
+
+@dataclass
+class Sample:
+    elapsed: float
+    rss_mb: float
+    processing: Optional[float]  # mean STT/MT(/TTS) time per segment in the interval
+    latency: Optional[float]  # mean time from segment close to its result, queueing included
+    backlog: float
+    dropped: int
+
+
+def quarter_mean(values: list[float], last: bool) -> float:
+    size = max(1, len(values) // 4)
+    return mean(values[-size:] if last else values[:size])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive InputPipeline from WAV files for a long soak run.")
+    parser.add_argument("wavs", nargs="+", type=Path, help="WAV files to replay (looped)")
+    parser.add_argument("--speed", type=float, default=4.0, help="Replay speed (0 = as fast as possible)")
+    parser.add_argument("--duration", type=float, default=600.0, help="Wall-clock seconds to run")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between samples")
+    parser.add_argument("--warmup", type=float, default=60.0, help="Seconds ignored before measuring")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=150.0)
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Only sample RSS/GPU memory")
+    parser.add_argument(
+        "--max-processing-drift", type=float, default=0.5, help="Allowed relative growth of per-segment processing time"
+    )
+    parser.add_argument("--max-backlog", type=float, default=5.0, help="Seconds of queued audio allowed at the end")
+    args = parser.parse_args()
+
+    source = FileAudioSource(
+        args.wavs,
+        sample_rate=settings.sample_rate,
+        block_size=settings.block_size,
+        speed=args.speed,
+        loop=True,
+    )
+    monitor = MemoryMonitor(interval=args.interval, trace=not args.no_tracemalloc)
+    pipeline = InputPipeline(source=source, memory_monitor=monitor)
+    samples: list[Sample] = []
+
+    pipeline.start()
+    start = time.perf_counter()
+    measure_from = time.time() + args.warmup
+    last_segments = 0
+    last_processing = 0.0
+    last_latency = 0.0
+    try:
+        while time.perf_counter() - start < args.duration:
+            time.sleep(args.interval)
+            stats = pipeline.stats
+            new_segments = stats.segments - last_segments
+            processing = latency = None
+            if new_segments:
+                processing = (stats.processing_seconds - last_processing) / new_segments
+                latency = (stats.latency_seconds - last_latency) / new_segments
+            last_segments = stats.segments
+            last_processing, last_latency = stats.processing_seconds, stats.latency_seconds
+            sample = Sample(
+                elapsed=time.perf_counter() - start,
+                rss_mb=current_rss_mb(),
+                processing=processing,
+                latency=latency,
+                backlog=stats.backlog_seconds,
+                dropped=source.dropped_frames,
+            )
+            samples.append(sample)
+            log.info(
+                "t=%.0fs rss=%.1fMB processing=%s latency=%s backlog=%.2fs dropped=%d segments=%d",
+                sample.elapsed,
+                sample.rss_mb,
+                f"{processing:.3f}s" if processing is not None else "-",
+                f"{latency:.3f}s" if latency is not None else "-",
+                sample.backlog,
+                sample.dropped,
+                stats.segments,
+            )
+    except KeyboardInterrupt:
+        log.info("Interrupted; evaluating what we have")
+    finally:
+        pipeline.stop()
+
+    measured = [s for s in samples if s.elapsed >= args.warmup]
+    failures: list[str] = []
+    if len(measured) < 4:
+        failures.append("not enough samples after warmup; run longer")
+    else:
+        failures.extend(
+            f"memory leak suspected: {problem}"
+            for problem in monitor.check_growth(args.max_rss_growth_mb, since=measure_from)
+        )
+
+        processing = [s.processing for s in measured if s.processing is not None]
+        if len(processing) >= 4:
+            early, late = quarter_mean(processing, last=False), quarter_mean(processing, last=True)
+            if late > early * (1.0 + args.max_processing_drift):
+                failures.append(f"per-segment processing time drifted {early:.3f}s -> {late:.3f}s")
+
+        if measured[-1].backlog > args.max_backlog:
+            failures.append(f"backlog of {measured[-1].backlog:.1f}s audio at the end")
+
+    if source.dropped_frames:
+        failures.append(f"{source.dropped_frames} frames dropped on a full queue")
+
+    stats = pipeline.stats
+    print(f"\nReplayed {source.audio_seconds:.0f}s of audio, {stats.segments} segments")
+    if stats.segments:
+        print(
+            f"Per segment: {stats.processing_seconds / stats.segments:.3f}s processing, "
+            f"{stats.latency_seconds / stats.segments:.3f}s from segment close to result"
+        )
+    print(f"Scheduler: {stats.merged_segments} merged, {stats.dropped_segments} dropped, {stats.tts_skipped} not spoken")
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Soak test passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import collections
+import sys
+import time
+
+from local_translator.src.translation.hub import FanOut, TranslationHub
+
+MODELS = (
+    ("es-en", "fake/es-en"),
+    ("en-fr", "fake/en-fr"),
+    ("en-pt", "fake/en-pt >>por<<"),
+)
+
+
+class FakeTranslator:
+    """
+    Tags the text with its pair, so chained hops are visible in the result.
+    """
+
+    def __init__(self, spec: str, calls: collections.Counter) -> None:
+        self.pair = spec.split("/")[1].split()[0]
+        self.calls = calls
+        self.repetition_aborts = 0
+
+    def translate(self, text: str) -> str:
+        self.calls[self.pair] += 1
+        return f"{self.pair}({text})"
+
+
+def make_hub(idle_unload: float = 60.0) -> tuple[TranslationHub, collections.Counter, list[str]]:
+    calls: collections.Counter = collections.Counter()
+    loads: list[str] = []
+
+    def factory(spec: str, num_beams: int) -> FakeTranslator:
+        loads.append(spec)
+        return FakeTranslator(spec, calls)
+
+    return TranslationHub(MODELS, num_beams=1, idle_unload=idle_unload, factory=factory), calls, loads
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def main() -> None:
+    checks = []
+
+    hub, calls, loads = make_hub()
+    checks.append(("pivot route", hub.route("es", "pt") == ["es-en", "en-pt"], f"{hub.route('es', 'pt')}"))
+    try:
+        hub.route("fr", "pt")
+        checks.append(("no route", False, "fr->pt did not raise"))
+    except KeyError:
+        checks.append(("no route", True, "fr->pt raises KeyError"))
+    result = hub.translate("hola", "pt", "es")
+    checks.append(("pivot translate", result == "en-pt(es-en(hola))", result))
+    checks.append(("lazy load", sorted(hub.loaded) == ["en-pt", "es-en"], f"loaded {hub.loaded}"))
+
+    calls.clear()
+    many = hub.translate_many("hola", ["en", "fr", "pt"], "es")
+    expected = {"en": "es-en(hola)", "fr": "en-fr(es-en(hola))", "pt": "en-pt(es-en(hola))"}
+    checks.append(("translate_many", many == expected, f"{many}"))
+    checks.append(("shared pivot", calls["es-en"] == 1, f"es-en ran {calls['es-en']}x for three targets"))
+    calls.clear()
+    many = hub.translate_many("hola", ["fr"], "es", known={"en": "hello"})
+    checks.append(
+        ("known pivot", many == {"fr": "en-fr(hello)"} and not calls["es-en"], f"{many}, es-en ran {calls['es-en']}x")
+    )
+
+    # Adopted translators are served without loading and never unloaded.
+    adopted = FakeTranslator("own/es-en", calls)
+    hub.adopt("es-en", adopted)
+    loads.clear()
+    hub.translate("hola", "en", "es")
+    checks.append(("adopt", not loads and hub._slots["es-en"].translator is adopted, f"loads {loads}"))
+    freed = hub.unload_idle(now=time.monotonic() + 61.0)
+    checks.append(("idle unload", sorted(freed) == ["en-fr", "en-pt"], f"freed {freed}"))
+    checks.append(("adopted kept", hub.loaded == ["es-en"], f"loaded {hub.loaded}"))
+    checks.append(("not idle yet", hub.unload_idle() == [], "recently used models stay"))
+    hub.translate("hola", "pt", "es")
+    checks.append(("reload", "fake/en-pt >>por<<" in loads, f"loads {loads}"))
+    hub.close()
+
+    # Preloaded pairs load up front and are never idle-unloaded.
+    hub, _, loads = make_hub()
+    hub.preload(["en-fr"])
+    freed = hub.unload_idle(now=time.monotonic() + 61.0)
+    checks.append(("preload", loads == ["fake/en-fr"] and not freed, f"loads {loads}, freed {freed}"))
+    hub.close()
+
+    # Fan-out: speakers get each target, stale segments are dropped unspoken.
+    hub, _, _ = make_hub()
+    spoken: list[str] = []
+    fanout = FanOut(hub, ["fr", "pt"], {"fr": spoken.append}, source="es", max_lag=5.0)
+    fanout.submit(0, "hola", known={"en": "hello"})
+    fanout.submit(1, "adios", closed_at=time.monotonic() - 10.0)
+    ok = wait_for(lambda: len(spoken) == 1 and fanout.queues["pt"].qsize() == 1)
+    checks.append(("fan-out speech", ok and spoken == ["en-fr(hello)"], f"{spoken}"))
+    checks.append(("stale dropped", fanout.dropped == 1, f"{fanout.dropped} dropped"))
+    fanout.stop()
+    hub.close()
+
+    # A target queue nobody drains keeps only the newest max_pending translations.
+    hub, _, _ = make_hub()
+    fanout = FanOut(hub, ["fr"], source="es", max_pending=2)
+    for segment_id in range(3):
+        fanout.submit(segment_id, f"frase {segment_id}")
+        wait_for(lambda: fanout.queues["fr"].qsize() == min(segment_id + 1, 2) and not fanout._jobs.qsize())
+    ok = wait_for(lambda: fanout.dropped == 1)
+    kept = [fanout.queues["fr"].get_nowait().segment_id for _ in range(fanout.queues["fr"].qsize())]
+    checks.append(("bounded queue", ok and kept == [1, 2], f"kept {kept}, {fanout.dropped} dropped"))
+    fanout.stop()
+    hub.close()
+
+    failures = 0
+    for name, ok, detail in checks:
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    if failures:
+        print(f"❌ {failures} translation hub check(s) failed")
+        sys.exit(1)
+    print("✅ Translation hub test passed")
+
+
+if __name__ == "__main__":
+    main()
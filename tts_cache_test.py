@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import stat
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from local_translator.src.tts.cache import PCMCache, cache_key
+from local_translator.src.tts.piper_tts import PiperTTS
+
+# Stand-in for the Piper binary: 100 samples per character of input, and a
+# non-zero exit (after the audio) when the text asks for it.
+FAKE_PIPER = f"""#!{sys.executable}
+import sys
+text = sys.stdin.read()
+sys.stdout.buffer.write(bytes(range(200)) * len(text))
+sys.stdout.flush()
+sys.exit(1 if "falla" in text else 0)
+"""
+
+
+def pcm(samples: int, value: int = 1) -> np.ndarray:
+    return np.full(samples, value, dtype=np.int16)
+
+
+def fake_piper(root: Path, cache: PCMCache) -> PiperTTS:
+    binary = root / "piper"
+    binary.write_text(FAKE_PIPER)
+    binary.chmod(binary.stat().st_mode | stat.S_IXUSR)
+    (root / "voice.onnx").write_bytes(b"not a model")
+    return PiperTTS(models_root=root, model_name="voice.onnx", cache=cache, chunk_seconds=0.01)
+
+
+def main() -> None:
+    checks = []
+
+    # Memory tier: LRU bounded by bytes (each entry is 2 kB, the budget fits two).
+    cache = PCMCache(max_bytes=4_096)
+    cache.put("a", pcm(1_024))
+    cache.put("b", pcm(1_024))
+    cache.get("a")  # "a" is now the most recent
+    cache.put("c", pcm(1_024))
+    kept = sorted(key for key in "abc" if cache.get(key) is not None)
+    checks.append(("lru eviction", kept == ["a", "c"], f"kept {kept}, {cache.size_bytes} bytes"))
+    checks.append(("byte bound", cache.size_bytes <= cache.max_bytes and len(cache) == 2, f"{len(cache)} entries"))
+    cache.put("huge", pcm(4_096))
+    checks.append(("oversized skipped", cache.get("huge") is None and len(cache) == 2, "entry above max_bytes"))
+    checks.append(("counters", (cache.hits, cache.misses) == (3, 2), f"{cache.hits} hits, {cache.misses} misses"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        # Disk tier: zlib files that survive a restart and come back bit-exact.
+        audio = (np.sin(np.arange(8_000) / 10.0) * 20_000).astype(np.int16)
+        PCMCache(disk_dir=root / "disk").put("frase", audio)
+        path = root / "disk" / "frase.pcm.z"
+        on_disk = zlib.decompress(path.read_bytes()) if path.is_file() else b""
+        size = path.stat().st_size if path.is_file() else 0
+        checks.append(("zlib file", on_disk == audio.astype("<i2").tobytes(), f"{path.name}, {size} bytes"))
+        restarted = PCMCache(disk_dir=root / "disk")
+        restored = restarted.get("frase")
+        ok = restored is not None and np.array_equal(restored, audio) and restarted.disk_hits == 1
+        checks.append(("disk round-trip", ok, f"{restarted.disk_hits} disk hits"))
+        ok = restarted.get("frase") is not None and (restarted.hits, restarted.disk_hits) == (1, 1)
+        checks.append(("promoted to memory", ok, f"{restarted.hits} memory hits"))
+        path.write_bytes(b"corrupt")
+        checks.append(
+            ("corrupt file dropped", PCMCache(disk_dir=root / "disk").get("frase") is None and not path.exists(), path.name)
+        )
+
+        # Piper: only phrases whose run exited cleanly and was read to the end are cached.
+        (root / "piper_dir").mkdir()
+        cache = PCMCache()
+        tts = fake_piper(root / "piper_dir", cache)
+        first = tts.synthesize("hola")
+        key = cache_key(tts._voice_id, "hola", {"sample_rate": tts.sample_rate})
+        cached = cache.get(key, count=False)
+        ok = cached is not None and np.array_equal(cached, first)
+        checks.append(("clean exit cached", ok, f"{first.size} samples"))
+        chunks = list(tts.synthesize_stream("hola"))
+        checks.append(("cache hit", len(chunks) == 1 and cache.hits == 1, f"{len(chunks)} chunk(s), {cache.hits} hits"))
+
+        failed = tts.synthesize("esto falla")
+        checks.append(("failed run not cached", failed.size > 0 and len(cache) == 1, f"{len(cache)} entries"))
+        stream = tts.synthesize_stream("se corta a medias")
+        next(stream)
+        stream.close()  # e.g. the speaker was interrupted
+        checks.append(("abandoned run not cached", len(cache) == 1, f"{len(cache)} entries"))
+
+        # Preloading fills the cache without counting its lookups as misses.
+        misses = cache.misses
+        added = tts.preload(["hola", "buenos días", "esto falla"])
+        ok = added == 1 and len(cache) == 2 and cache.misses == misses
+        checks.append(("preload", ok, f"{added} added, misses {misses} -> {cache.misses}"))
+
+    failures = 0
+    for name, ok, detail in checks:
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    if failures:
+        print(f"❌ {failures} TTS cache check(s) failed")
+        sys.exit(1)
+    print("✅ TTS cache test passed")
+
+
+if __name__ == "__main__":
+    main()